@@ -0,0 +1,79 @@
+"""Benchmark searching a module with thousands of attributes for data model classes, like a
+generated protobuf or OpenAPI model module, with find_models and with the previous implementation
+based on inspect.getmembers.
+
+Usage:
+    python benchmarks/find_models.py [--attributes N] [--repeat R]
+"""
+
+import argparse
+import dataclasses
+import enum
+import inspect
+import time
+from types import ModuleType
+from typing import Callable, Iterator
+
+from erdantic.convenience import find_models
+from erdantic.plugins import get_predicate_fn, list_plugins
+
+MODULE_NAME = "_erdantic_benchmark_generated"
+
+
+def make_module(n: int) -> ModuleType:
+    """Create a module with n attributes: a quarter are dataclasses, a quarter are other classes,
+    and the rest are constants, like the descriptors and enum values of generated code."""
+    module = ModuleType(MODULE_NAME)
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            value: object = dataclasses.make_dataclass(f"Message{i}", [("id", int), ("name", str)])
+            value.__module__ = MODULE_NAME  # type: ignore [attr-defined]
+        elif kind == 1:
+            value = enum.Enum(f"Enum{i}", ["A", "B"], module=MODULE_NAME)
+        else:
+            value = f"constant_{i}"
+        setattr(module, f"attr_{i}", value)
+    return module
+
+
+def find_models_getmembers(module: ModuleType) -> Iterator[type]:
+    """Previous implementation of find_models: sorted members, every predicate for every class."""
+    predicate_fns = [get_predicate_fn(key) for key in list_plugins()]
+    for _, member in inspect.getmembers(module, inspect.isclass):
+        if member.__module__ == module.__name__:
+            for predicate_fn in predicate_fns:
+                if predicate_fn(member):
+                    yield member
+
+
+def best_time(fn: Callable[[ModuleType], object], modules: list[ModuleType]) -> float:
+    """Time fn on each module, which are all equal but have distinct classes, so that no results
+    are cached between repetitions."""
+    times = []
+    for module in modules:
+        start = time.perf_counter()
+        fn(module)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attributes", type=int, default=20000, help="Number of attributes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions.")
+    args = parser.parse_args()
+
+    list_plugins()  # Load all plugins
+    modules = [make_module(args.attributes) for _ in range(args.repeat)]
+    assert set(find_models(modules[0])) == set(find_models_getmembers(modules[0]))
+    print(f"Module with {args.attributes} attributes (best of {args.repeat})")
+    getmembers_time = best_time(lambda module: list(find_models_getmembers(module)), modules)
+    namespace_time = best_time(lambda module: list(find_models(module)), modules)
+    print(f"  inspect.getmembers: {getmembers_time:.3f} s")
+    print(f"  find_models       : {namespace_time:.3f} s")
+    print(f"  speedup: {getmembers_time / namespace_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark the time to import erdantic, as measured by `python -X importtime`, and check which
+optional data modeling frameworks and rendering dependencies are imported with it.
+
+Usage:
+    python benchmarks/import_time.py [--repeat R] [--module MODULE]
+"""
+
+import argparse
+import subprocess
+import sys
+
+DEFERRED_MODULES = ("attr", "msgspec", "pydantic.v1", "pygraphviz", "multiprocessing")
+"""Modules that should not be imported by importing erdantic."""
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """Import a module in a fresh interpreter. Returns the cumulative import time in seconds and
+    the names of all modules imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        imported.add(name.strip())
+        if name.strip() == module:
+            total = int(cumulative) / 1e6
+    return total, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions.")
+    parser.add_argument("--module", default="erdantic", help="Module to import.")
+    args = parser.parse_args()
+
+    results = [import_time(args.module) for _ in range(args.repeat)]
+    best = min(total for total, _ in results)
+    print(f"Importing {args.module} (best of {args.repeat}): {best * 1000:.1f} ms")
+    imported = results[0][1]
+    deferred = [module for module in DEFERRED_MODULES if module in imported]
+    if deferred:
+        print(f"  unexpectedly imported: {', '.join(deferred)}")
+        sys.exit(1)
+    print(f"  not imported: {', '.join(DEFERRED_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
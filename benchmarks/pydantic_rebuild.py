@@ -0,0 +1,53 @@
+"""Benchmark extracting fields from many Pydantic models, with and without forcing a model rebuild.
+
+Usage:
+    python benchmarks/pydantic_rebuild.py [--models N] [--repeat R]
+"""
+
+import argparse
+import time
+from typing import Optional
+
+import pydantic
+
+from erdantic.plugins.pydantic import get_fields_from_pydantic_model
+
+
+def make_models(n: int, chain_length: int = 10) -> list[type[pydantic.BaseModel]]:
+    """Create n Pydantic models in chains of chain_length models, where each model in a chain
+    references the previous one."""
+    models: list[type[pydantic.BaseModel]] = []
+    for i in range(n):
+        fields: dict = {"name": (str, ...), "count": (int, 0), "tags": (list[str], [])}
+        if i % chain_length:
+            fields["parent"] = (Optional[models[-1]], None)
+            fields["siblings"] = (list[models[-1]], [])
+        models.append(pydantic.create_model(f"Model{i}", **fields))
+    return models
+
+
+def run(models: list[type[pydantic.BaseModel]], force_rebuild: bool) -> float:
+    start = time.perf_counter()
+    for model in models:
+        get_fields_from_pydantic_model(model, force_rebuild=force_rebuild)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=3000, help="Number of models.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions.")
+    args = parser.parse_args()
+
+    models = make_models(args.models)
+    print(f"Extracting fields from {args.models} Pydantic models (best of {args.repeat})")
+    results = {}
+    for force_rebuild in (True, False):
+        results[force_rebuild] = min(run(models, force_rebuild) for _ in range(args.repeat))
+        label = "force_rebuild=True " if force_rebuild else "force_rebuild=False"
+        print(f"  {label}: {results[force_rebuild]:.3f} s")
+    print(f"  speedup: {results[True] / results[False]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark serializing and loading a large diagram with Pydantic's JSON methods and with the
+compact format from erdantic.serialization.
+
+Usage:
+    python benchmarks/serialization.py [--models N] [--repeat R]
+"""
+
+import argparse
+import dataclasses
+import sys
+import time
+from types import ModuleType
+from typing import Callable, Optional
+
+from erdantic.core import EntityRelationshipDiagram
+from erdantic.serialization import dumps, loads
+
+MODULE_NAME = "_erdantic_benchmark_models"
+
+
+def make_diagram(n: int, chain_length: int = 10) -> EntityRelationshipDiagram:
+    """Create a diagram of n dataclasses in chains of chain_length classes, where each class in a
+    chain references the previous one."""
+    module = ModuleType(MODULE_NAME)
+    sys.modules[MODULE_NAME] = module
+    models: list[type] = []
+    for i in range(n):
+        fields: list = [("name", str), ("count", int), ("tags", list[str])]
+        if i % chain_length:
+            fields.append(("parent", Optional[models[-1]]))
+            fields.append(("siblings", list[models[-1]]))
+        model = dataclasses.make_dataclass(f"Model{i}", fields)
+        model.__module__ = MODULE_NAME
+        setattr(module, model.__name__, model)
+        models.append(model)
+    diagram = EntityRelationshipDiagram()
+    for model in models:
+        diagram.add_model(model)
+    return diagram
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=10000, help="Number of models.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions.")
+    args = parser.parse_args()
+
+    diagram = make_diagram(args.models)
+    print(
+        f"Diagram with {len(diagram.models)} models and {len(diagram.edges)} edges "
+        f"(best of {args.repeat})"
+    )
+    pydantic_json = diagram.model_dump_json()
+    compact_json = dumps(diagram)
+    assert loads(compact_json) == diagram
+    rows = [
+        (
+            "pydantic",
+            len(pydantic_json),
+            best_time(diagram.model_dump_json, args.repeat),
+            best_time(
+                lambda: EntityRelationshipDiagram.model_validate_json(pydantic_json), args.repeat
+            ),
+        ),
+        (
+            "compact",
+            len(compact_json),
+            best_time(lambda: dumps(diagram), args.repeat),
+            best_time(lambda: loads(compact_json), args.repeat),
+        ),
+        (
+            "compact, GC paused",
+            len(compact_json),
+            best_time(lambda: dumps(diagram), args.repeat),
+            best_time(lambda: loads(compact_json, pause_gc=True), args.repeat),
+        ),
+    ]
+    for label, size, dump_time, load_time in rows:
+        print(
+            f"  {label:<18}: {size / 1e6:6.2f} MB, dump {dump_time:.3f} s, load {load_time:.3f} s"
+        )
+    print(f"  load speedup: {rows[0][3] / rows[1][3]:.1f}x, {rows[0][3] / rows[2][3]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,18 @@ __all__ = [
     "EntityRelationshipDiagram",
     "create",
     "draw",
+    "draw_batch",
     "list_plugins",
     "to_dot",
 ]
 
-_load_plugins()
+_load_plugins(lazy=True)
+
+
+def __getattr__(name: str):
+    # Lazy import of the batch module, which defines Pydantic models that take time to build
+    if name == "draw_batch":
+        from erdantic.batch import draw_batch
+
+        return draw_batch
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,248 @@
+import json
+import logging
+from pathlib import Path
+import time
+import traceback
+from types import ModuleType
+from typing import Any, Iterable, Mapping, Optional, Union
+
+import pydantic
+
+from erdantic.caching import model_info_cache
+from erdantic.convenience import create, import_object_from_name
+from erdantic.core import FullyQualifiedName
+
+logger = logging.getLogger(__name__)
+
+
+class DrawJob(pydantic.BaseModel):
+    """Specification of one diagram to render with [`draw_batch`][erdantic.batch.draw_batch].
+    Data model classes and modules are specified by their fully qualified names so that jobs can
+    be sent to worker processes; classes and modules are also accepted and are converted to their
+    names.
+
+    Attributes:
+        models_or_modules (list[str]): Fully qualified names of data model classes to add to
+            diagram, or modules to search for data model classes.
+        out (list[Path]): Output file paths for rendered diagram. If there is more than one, the
+            diagram is laid out once and rendered to each file. A single path is also accepted.
+        terminal_models (list[str]): Fully qualified names of data model classes to set as
+            terminal nodes.
+        limit_search_models_to (list[str] | None): Plugin identifiers to limit to when searching
+            modules for data model classes.
+        max_depth (int | None): Maximum number of relationships to follow from each given data
+            model class.
+        graph_attr (dict[str, Any] | None): Override any graph attributes.
+        node_attr (dict[str, Any] | None): Override any node attributes for all nodes.
+        edge_attr (dict[str, Any] | None): Override any edge attributes for all edges.
+    """
+
+    models_or_modules: list[str]
+    out: list[Path]
+    terminal_models: list[str] = []
+    limit_search_models_to: Optional[list[str]] = None
+    max_depth: Optional[int] = None
+    graph_attr: Optional[dict[str, Any]] = None
+    node_attr: Optional[dict[str, Any]] = None
+    edge_attr: Optional[dict[str, Any]] = None
+
+    model_config = pydantic.ConfigDict(extra="forbid")
+
+    @pydantic.field_validator("models_or_modules", "terminal_models", mode="before")
+    @classmethod
+    def _names_from_objects(cls, value: Any) -> Any:
+        if isinstance(value, (str, ModuleType, type)):
+            value = [value]
+        return [_name_of(item) for item in value]
+
+    @pydantic.field_validator("out", mode="before")
+    @classmethod
+    def _wrap_single_out(cls, value: Any) -> Any:
+        if isinstance(value, (str, Path)):
+            return [value]
+        return value
+
+
+class DrawResult(pydantic.BaseModel):
+    """Result of one job run by [`draw_batch`][erdantic.batch.draw_batch].
+
+    Attributes:
+        job (DrawJob): The job.
+        success (bool): Whether the diagram was rendered successfully.
+        duration (float): Time taken to run the job, in seconds.
+        error (str | None): Description of the exception if the job failed.
+        traceback (str | None): Formatted traceback of the exception if the job failed.
+    """
+
+    job: DrawJob
+    success: bool
+    duration: float
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+
+
+def draw_batch(
+    jobs: Iterable[Union[DrawJob, Mapping[str, Any]]], max_workers: Optional[int] = None
+) -> list[DrawResult]:
+    """Render many entity relationship diagrams in parallel using a pool of processes. Creating
+    each diagram and running its Graphviz layout are independent of other jobs, so this scales
+    with the number of CPU cores. A failing job does not stop the other jobs.
+
+    Worker processes import data model classes by name. With the "spawn" multiprocessing start
+    method, plugins that are registered at runtime rather than on import are not available in
+    worker processes; use `max_workers=1` to run jobs in the current process instead.
+
+    The [model info cache][erdantic.caching.model_info_cache] is enabled while jobs run, in the
+    current process and in each worker process, so that data model classes shared between jobs
+    run by the same process are analyzed only once. If it was not already enabled, it is disabled
+    and cleared again afterwards.
+
+    Args:
+        jobs (Iterable[DrawJob | Mapping[str, Any]]): Diagrams to render. Mappings are validated
+            into [`DrawJob`][erdantic.batch.DrawJob] instances.
+        max_workers (int | None, optional): Maximum number of worker processes. If 1, jobs are
+            run in the current process. Defaults to None, which uses the number of processors.
+
+    Returns:
+        list[DrawResult]: Result for each job, in the same order as the jobs.
+    """
+    jobs = [job if isinstance(job, DrawJob) else DrawJob.model_validate(job) for job in jobs]
+    logger.info("Rendering %d diagrams...", len(jobs))
+    if max_workers == 1 or len(jobs) <= 1:
+        cache_was_enabled = model_info_cache.enabled
+        if not cache_was_enabled:
+            model_info_cache.enable()
+        try:
+            results = [_run_job(job) for job in jobs]
+        finally:
+            if not cache_was_enabled:
+                model_info_cache.disable()
+    else:
+        # Lazy import so that multiprocessing is only imported when it is used
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_run_job, job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as e:
+                    results.append(_failed_result(job, e, duration=0.0))
+    for result in results:
+        _log_result(result)
+    return results
+
+
+def load_manifest(path: Union[str, Path]) -> list[DrawJob]:
+    """Load a manifest file listing diagrams to render with
+    [`draw_batch`][erdantic.batch.draw_batch]. The manifest is a TOML or JSON file, determined by
+    the file extension, with a `diagrams` array where each entry has the fields of a
+    [`DrawJob`][erdantic.batch.DrawJob]. For example, in TOML:
+
+    ```toml
+    [[diagrams]]
+    models_or_modules = ["erdantic.examples.pydantic.Party"]
+    out = ["party.png", "party.svg"]
+    terminal_models = ["erdantic.examples.pydantic.Quest"]
+    graph_attr = { rankdir = "TB" }
+
+    [[diagrams]]
+    models_or_modules = ["erdantic.examples.dataclasses"]
+    out = "dataclasses.png"
+    ```
+
+    Relative output paths are resolved relative to the directory containing the manifest.
+
+    Args:
+        path (str | Path): Path to manifest file, with a `.toml` or `.json` extension.
+
+    Raises:
+        ValueError: If the file extension is not supported or the manifest has no `diagrams`
+            array.
+
+    Returns:
+        list[DrawJob]: Jobs for the diagrams listed in the manifest.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ModuleNotFoundError:  # Python < 3.11
+            import tomli as tomllib
+        with path.open("rb") as fp:
+            manifest = tomllib.load(fp)
+    elif suffix == ".json":
+        with path.open("r", encoding="utf-8") as fp:
+            manifest = json.load(fp)
+    else:
+        raise ValueError(
+            f"Unsupported manifest file extension '{path.suffix}'. Use '.toml' or '.json'."
+        )
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("diagrams"), list):
+        raise ValueError(f"Manifest {path} must contain a 'diagrams' array.")
+    jobs = [DrawJob.model_validate(entry) for entry in manifest["diagrams"]]
+    for job in jobs:
+        job.out = [path.parent / out for out in job.out]
+    return jobs
+
+
+def _name_of(obj: Any) -> Any:
+    """Return the fully qualified name of a module or class. Other values are returned as-is."""
+    if isinstance(obj, ModuleType):
+        return obj.__name__
+    if isinstance(obj, type):
+        return str(FullyQualifiedName.from_object(obj))
+    return obj
+
+
+def _init_worker() -> None:
+    """Enable the model info cache in a worker process so that jobs run by the same worker
+    share analyzed data model classes."""
+    model_info_cache.enable()
+
+
+def _run_job(job: DrawJob) -> DrawResult:
+    """Run one job. Exceptions are caught and reported in the result."""
+    start = time.perf_counter()
+    try:
+        models_or_modules = [import_object_from_name(name) for name in job.models_or_modules]
+        terminal_models = [import_object_from_name(name) for name in job.terminal_models]
+        diagram = create(
+            *models_or_modules,  # type: ignore [arg-type]
+            terminal_models=terminal_models,  # type: ignore [arg-type]
+            limit_search_models_to=job.limit_search_models_to,
+            max_depth=job.max_depth,
+        )
+        attrs = {
+            "graph_attr": job.graph_attr,
+            "node_attr": job.node_attr,
+            "edge_attr": job.edge_attr,
+        }
+        if len(job.out) == 1:
+            diagram.draw(job.out[0], **attrs)
+        else:
+            diagram.draw_many(job.out, **attrs)
+    except Exception as e:
+        return _failed_result(job, e, duration=time.perf_counter() - start)
+    return DrawResult(job=job, success=True, duration=time.perf_counter() - start)
+
+
+def _failed_result(job: DrawJob, e: BaseException, duration: float) -> DrawResult:
+    return DrawResult(
+        job=job,
+        success=False,
+        duration=duration,
+        error="".join(traceback.format_exception_only(type(e), e)).strip(),
+        traceback="".join(traceback.format_exception(type(e), e, e.__traceback__)),
+    )
+
+
+def _log_result(result: DrawResult) -> None:
+    outputs = ", ".join(str(out) for out in result.job.out)
+    if result.success:
+        logger.info("Rendered diagram to %s in %.2f s", outputs, result.duration)
+    else:
+        logger.error("Failed to render diagram to %s: %s", outputs, result.error)
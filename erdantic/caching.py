@@ -0,0 +1,991 @@
+from collections import OrderedDict
+import functools
+import hashlib
+import logging
+import operator
+import os
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import types
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Generic,
+    Hashable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+import weakref
+
+from typenames import typenames
+
+import erdantic.plugins
+from erdantic.typing_utils import TypeArg
+
+if TYPE_CHECKING:
+    from erdantic.core import EntityRelationshipDiagram, ModelInfo
+
+logger = logging.getLogger(__name__)
+
+_V = TypeVar("_V")
+
+
+class CacheInfo(NamedTuple):
+    """Statistics about a cache, in the style of [`functools.lru_cache`][functools.lru_cache].
+
+    Attributes:
+        hits (int): Number of lookups that found a cached value.
+        misses (int): Number of lookups that did not find a cached value.
+        maxsize (int | None): Maximum number of cached entries, or None if unbounded.
+        currsize (int): Current number of cached entries.
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found a cached value. 0.0 if there have been no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _WeakKeyLRUCache(Generic[_V]):
+    """Least-recently-used cache keyed on an object held by a weak reference together with
+    hashable extra key parts. Entries are removed when their object is garbage collected. Objects
+    that cannot be weakly referenced or hashed are never cached.
+    """
+
+    def __init__(self, maxsize: Optional[int]):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple, _V] = OrderedDict()
+        self._pending_removals: list[tuple] = []
+        self._lock = threading.RLock()
+
+    def _make_callback(self, extra: Hashable):
+        # Reference self weakly so that the cache itself can be garbage collected. The removal is
+        # deferred because garbage collection can happen in the middle of other operations.
+        self_ref = weakref.ref(self)
+
+        def remove(obj_ref: weakref.ref) -> None:
+            cache = self_ref()
+            if cache is not None:
+                cache._pending_removals.append((obj_ref, extra))
+
+        return remove
+
+    def _purge(self) -> None:
+        while self._pending_removals:
+            self._data.pop(self._pending_removals.pop(), None)
+
+    def get(self, obj: Any, extra: Hashable = ()) -> Optional[_V]:
+        with self._lock:
+            self._purge()
+            try:
+                key = (weakref.ref(obj), extra)
+                value = self._data[key]
+            except (KeyError, TypeError):
+                # TypeError if obj is unhashable or does not support weak references
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, obj: Any, value: _V, extra: Hashable = ()) -> None:
+        with self._lock:
+            self._purge()
+            try:
+                key = (weakref.ref(obj, self._make_callback(extra)), extra)
+                self._data[key] = value
+            except TypeError:
+                return
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def pop(self, obj: Any, extra: Hashable = ()) -> Optional[_V]:
+        with self._lock:
+            self._purge()
+            try:
+                return self._data.pop((weakref.ref(obj), extra), None)
+            except TypeError:
+                return None
+
+    def keys(self) -> list[tuple[Any, Hashable]]:
+        with self._lock:
+            self._purge()
+            return [(obj_ref(), extra) for obj_ref, extra in self._data.keys()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._pending_removals.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            self._purge()
+            return CacheInfo(
+                hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._data)
+            )
+
+
+class ModelInfoCache:
+    """Process-wide cache of analyzed data model classes. When enabled,
+    [`EntityRelationshipDiagram.add_model`][erdantic.core.EntityRelationshipDiagram.add_model]
+    reuses cached [`ModelInfo`][erdantic.core.ModelInfo] instances for models that have already
+    been analyzed, including by other diagrams, instead of running the plugin field extractor
+    again. This cache is disabled by default. Use the instance `erdantic.caching.model_info_cache`
+    rather than instantiating this class.
+
+    Entries are keyed weakly on the model class, so they are removed when the class is garbage
+    collected. Cached fields only hold weak references to their type annotations, so that they do
+    not keep the model class or the classes it references alive. Models with a field whose type
+    annotation cannot be weakly referenced are not cached, and an entry whose type annotations
+    were garbage collected is treated as a miss. Caching a class replaces any cached entry for a
+    different class with the same fully qualified name, e.g., after its module is reloaded. All
+    entries are invalidated when a plugin is registered. When the cache is full, the least
+    recently used entry is evicted.
+
+    Attributes:
+        enabled (bool): Whether the cache is enabled.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.enabled = False
+        self._cache: _WeakKeyLRUCache[_ModelInfoCacheEntry] = _WeakKeyLRUCache(maxsize=maxsize)
+        self._names: dict[tuple[str, type], weakref.ref] = {}
+        self._pending_name_removals: list[tuple[tuple[str, type], weakref.ref]] = []
+        self._registry_version = erdantic.plugins._registry_version
+
+    def _make_name_callback(self, name_key: tuple[str, type]):
+        # Same deferred removal as _WeakKeyLRUCache, so that names of garbage collected models
+        # don't accumulate
+        self_ref = weakref.ref(self)
+
+        def remove(model_ref: weakref.ref) -> None:
+            cache = self_ref()
+            if cache is not None:
+                cache._pending_name_removals.append((name_key, model_ref))
+
+        return remove
+
+    def _purge_names(self) -> None:
+        while self._pending_name_removals:
+            name_key, model_ref = self._pending_name_removals.pop()
+            # Only remove the name if it wasn't since cached for a different class
+            if self._names.get(name_key) is model_ref:
+                del self._names[name_key]
+
+    def enable(self, maxsize: Optional[int] = 1024) -> None:
+        """Enable the cache.
+
+        Args:
+            maxsize (int | None, optional): Maximum number of cached models. If None, the cache is
+                unbounded. Defaults to 1024.
+        """
+        with self._cache._lock:
+            self.enabled = True
+            self._cache.maxsize = maxsize
+            if maxsize is not None:
+                while len(self._cache._data) > maxsize:
+                    self._cache._data.popitem(last=False)
+        logger.debug("Enabled model info cache with maxsize %s.", maxsize)
+
+    def disable(self) -> None:
+        """Disable and clear the cache."""
+        self.enabled = False
+        self.clear()
+        logger.debug("Disabled model info cache.")
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset its statistics."""
+        with self._cache._lock:
+            self._cache.clear()
+            self._names.clear()
+            self._pending_name_removals.clear()
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics about the cache."""
+        self._check_registry_version()
+        with self._cache._lock:
+            self._purge_names()
+            return self._cache.cache_info()
+
+    def cached_models(self) -> list[type]:
+        """Return the model classes that currently have cached entries, from least recently used
+        to most recently used."""
+        self._check_registry_version()
+        return [model for model, _ in self._cache.keys() if model is not None]
+
+    def _check_registry_version(self) -> None:
+        if self._registry_version != erdantic.plugins._registry_version:
+            self.clear()
+            self._registry_version = erdantic.plugins._registry_version
+
+    def get(self, model: type, model_info_cls: Type["ModelInfo"]) -> Optional["ModelInfo"]:
+        """Return a copy of the cached ModelInfo instance for a model class, or None if there
+        isn't one or the cache is disabled.
+
+        Args:
+            model (type): Data model class.
+            model_info_cls (Type[ModelInfo]): ModelInfo class (or subclass) of the entry.
+
+        Returns:
+            ModelInfo | None: Copy of the cached ModelInfo instance.
+        """
+        if not self.enabled:
+            return None
+        self._check_registry_version()
+        with self._cache._lock:
+            entry = self._cache.get(model, extra=model_info_cls)
+            if entry is None:
+                return None
+            model_info = _copy_model_info(entry.model_info)
+            for name, field_info in model_info.fields.items():
+                raw_type = entry.raw_types[name]()
+                if raw_type is _COLLECTED:
+                    # Annotation was not held by the model class, e.g., evaluated from a string.
+                    # Count this as a miss so that the model is analyzed and cached again.
+                    logger.debug(
+                        "Type annotations of cached model '%s' were garbage collected.",
+                        model_info.key,
+                    )
+                    self._cache.pop(model, extra=model_info_cls)
+                    self._cache.hits -= 1
+                    self._cache.misses += 1
+                    return None
+                field_info._raw_type = raw_type
+                type_args = entry.type_args.get(name)
+                if type_args is not None:
+                    restored = [(tp(), is_collection) for tp, is_collection in type_args]
+                    if all(tp is not _COLLECTED for tp, _ in restored):
+                        field_info._type_args = [TypeArg(*type_arg) for type_arg in restored]
+        model_info._raw_model = model
+        return model_info
+
+    def set(self, model: type, model_info: "ModelInfo") -> None:
+        """Cache a copy of a ModelInfo instance for a model class. Does nothing if the cache is
+        disabled.
+
+        Args:
+            model (type): Data model class.
+            model_info (ModelInfo): ModelInfo instance for the model class.
+        """
+        if not self.enabled:
+            return
+        self._check_registry_version()
+        model_info_cls = type(model_info)
+        name_key = (model_info.key, model_info_cls)
+        raw_types: dict[str, Callable[[], Any]] = {}
+        type_args: dict[str, list[tuple[Callable[[], Any], bool]]] = {}
+        for name, field_info in model_info.fields.items():
+            raw_type_ref = _weak_type_ref(field_info._raw_type)
+            if raw_type_ref is None:
+                logger.debug(
+                    "Field '%s' of model '%s' has a type annotation that cannot be weakly "
+                    "referenced. Not caching model.",
+                    name,
+                    model_info.key,
+                )
+                return
+            raw_types[name] = raw_type_ref
+            if field_info._type_args is not None:
+                type_arg_refs = [
+                    (_weak_type_ref(type_arg.tp), type_arg.is_collection)
+                    for type_arg in field_info._type_args
+                ]
+                if all(tp_ref is not None for tp_ref, _ in type_arg_refs):
+                    type_args[name] = type_arg_refs  # type: ignore [assignment]
+        with self._cache._lock:
+            self._purge_names()
+            previous_ref = self._names.get(name_key)
+            previous = previous_ref() if previous_ref is not None else None
+            if previous is not None and previous is not model:
+                logger.debug("Model '%s' was redefined. Evicting cached entry.", model_info.key)
+                self._cache.pop(previous, extra=model_info_cls)
+            try:
+                self._names[name_key] = weakref.ref(model, self._make_name_callback(name_key))
+            except TypeError:
+                return
+            cached = _copy_model_info(model_info)
+            # Don't hold references to the model class or the classes in its fields' type
+            # annotations in the cache
+            cached._raw_model = None
+            for field_info in cached.fields.values():
+                field_info._raw_type = None
+                field_info._type_args = None
+            entry = _ModelInfoCacheEntry(cached, raw_types, type_args)
+            self._cache.set(model, entry, extra=model_info_cls)
+
+
+class TypeNameCache:
+    """Process-wide cache of rendered type names for type annotations. Used by
+    [`FieldInfo.from_raw_type`][erdantic.core.FieldInfo.from_raw_type] so that common annotations
+    like `Optional[str]` are only formatted once. This cache is enabled by default. Use the
+    instance `erdantic.caching.type_name_cache` rather than instantiating this class.
+
+    Entries are keyed on the structure of the annotation, i.e., its type, origin, and arguments in
+    order, together with the formatting options. Classes and other objects in the annotation that
+    support weak references are held weakly, so cached entries do not keep them alive; entries for
+    objects that have been garbage collected can no longer be hit and are evicted as the least
+    recently used. Annotations that cannot be hashed are rendered without caching.
+
+    Attributes:
+        enabled (bool): Whether the cache is enabled.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 4096):
+        self.enabled = True
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def enable(self, maxsize: Optional[int] = 4096) -> None:
+        """Enable the cache.
+
+        Args:
+            maxsize (int | None, optional): Maximum number of cached type names. If None, the cache
+                is unbounded. Defaults to 4096.
+        """
+        with self._lock:
+            self.enabled = True
+            self.maxsize = maxsize
+            self._evict()
+        logger.debug("Enabled type name cache with maxsize %s.", maxsize)
+
+    def disable(self) -> None:
+        """Disable and clear the cache."""
+        self.enabled = False
+        self.clear()
+        logger.debug("Disabled type name cache.")
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset its statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics about the cache."""
+        with self._lock:
+            return CacheInfo(
+                hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._data)
+            )
+
+    def typenames(self, tp: Any, **kwargs: Any) -> str:
+        """Render the type name of a type annotation with
+        [`typenames`](https://github.com/jayqi/typenames), using the cached value if there is one.
+
+        Args:
+            tp (Any): Type annotation.
+            **kwargs: Formatting options passed to `typenames`.
+
+        Returns:
+            str: Rendered type name.
+        """
+        if not self.enabled:
+            return typenames(tp, **kwargs)
+        try:
+            key = (_annotation_key(tp), _options_key(kwargs))
+            hash(key)
+        except TypeError:
+            # Annotation or options are unhashable
+            return typenames(tp, **kwargs)
+        with self._lock:
+            type_name = self._data.get(key)
+            if type_name is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return type_name
+            self.misses += 1
+        type_name = typenames(tp, **kwargs)
+        with self._lock:
+            self._data[key] = type_name
+            self._evict()
+        return type_name
+
+    def _evict(self) -> None:
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _annotation_key(tp: Any) -> Hashable:
+    """Return a hashable key for a type annotation that distinguishes the order of arguments, e.g.,
+    `Union[int, str]` and `Union[str, int]`, which compare equal but render differently. Leaf
+    objects are held by weak reference where possible. Raises TypeError if the annotation contains
+    unhashable objects."""
+    if isinstance(tp, (list, tuple)):
+        # e.g., the parameter list of Callable[[int], str]
+        return (type(tp), tuple(_annotation_key(arg) for arg in tp))
+    origin = get_origin(tp)
+    if origin is not None:
+        return (
+            type(tp),
+            _annotation_key(origin),
+            tuple(_annotation_key(arg) for arg in get_args(tp)),
+        )
+    try:
+        ref = weakref.ref(tp)
+    except TypeError:
+        # Include type to distinguish values like Literal[1] and Literal[True]
+        return (type(tp), tp)
+    hash(ref)
+    return ref
+
+
+def _options_key(options: dict[str, Any]) -> Hashable:
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(options.items())
+    )
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory for erdantic's on-disk caches. This is the value of the
+    `ERDANTIC_CACHE_DIR` environment variable if set, otherwise `erdantic` in the user cache
+    directory (`$XDG_CACHE_HOME` or `~/.cache`)."""
+    if os.environ.get("ERDANTIC_CACHE_DIR"):
+        return Path(os.environ["ERDANTIC_CACHE_DIR"])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "erdantic"
+
+
+class _DiskCache:
+    """Base class for on-disk caches that store one file per entry in a directory, and delete the
+    least recently used files when the total size of the files exceeds a maximum size."""
+
+    _subdirectory = ""
+    """Subdirectory of [`default_cache_dir()`][erdantic.caching.default_cache_dir] used by
+    default."""
+
+    _description = ""
+    """Description of the cache for log messages."""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory: Optional[Path] = None
+        self.max_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def enable(
+        self,
+        directory: Union[str, os.PathLike, None] = None,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+    ) -> None:
+        """Enable the cache.
+
+        Args:
+            directory (str | os.PathLike | None, optional): Directory to store cached files in. If
+                None, uses a subdirectory of
+                [`default_cache_dir()`][erdantic.caching.default_cache_dir]. Defaults to None.
+            max_bytes (int | None, optional): Maximum total size of cached files in bytes. If
+                None, the cache is unbounded. Defaults to 256 MiB.
+        """
+        with self._lock:
+            self.directory = (
+                Path(directory)
+                if directory is not None
+                else default_cache_dir() / self._subdirectory
+            )
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.max_bytes = max_bytes
+            self.enabled = True
+            self._evict()
+        logger.debug(
+            "Enabled %s cache in %s with max_bytes %s.",
+            self._description,
+            self.directory,
+            max_bytes,
+        )
+
+    def disable(self) -> None:
+        """Disable the cache. Cached files are kept on disk."""
+        self.enabled = False
+        logger.debug("Disabled %s cache.", self._description)
+
+    def clear(self) -> None:
+        """Delete all cached files and reset the cache's statistics."""
+        with self._lock:
+            for path in self._files():
+                path.unlink(missing_ok=True)
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics about the cache. Sizes are in bytes."""
+        with self._lock:
+            currsize = sum(_file_size(path) for path in self._files())
+            return CacheInfo(
+                hits=self.hits, misses=self.misses, maxsize=self.max_bytes, currsize=currsize
+            )
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        """Read a cached file and mark it as recently used, or return None if it doesn't exist."""
+        with self._lock:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            # Update modification time to track least recently used files
+            path.touch()
+        return data
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write a cached file, then delete least recently used files if needed."""
+        with self._lock:
+            # Write to a temporary file and rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    fp.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._evict()
+
+    def _files(self) -> list[Path]:
+        if self.directory is None or not self.directory.exists():
+            return []
+        return [path for path in self.directory.iterdir() if not path.name.startswith(".")]
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        files = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[:2]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug("Evicted cached %s %s.", self._description, path.name)
+
+
+class RenderCache(_DiskCache):
+    """On-disk cache of rendered diagrams. When enabled,
+    [`EntityRelationshipDiagram.draw`][erdantic.core.EntityRelationshipDiagram.draw] and the
+    IPython PNG and SVG display methods reuse previously rendered output for an unchanged diagram
+    instead of running the Graphviz layout again. This cache is disabled by default. Use the
+    instance `erdantic.caching.render_cache` rather than instantiating this class.
+
+    Entries are keyed on a hash of the DOT source of the graph, the output format, the layout
+    program, extra Graphviz arguments, and the pygraphviz version. The Graphviz version is not part
+    of the key, so clear the cache after upgrading Graphviz. When the total size of the cached
+    files exceeds the maximum size, the least recently used files are deleted. In
+    [`cache_info`][erdantic.caching.RenderCache.cache_info], `maxsize` and `currsize` are in
+    bytes. By default, files are stored in the `render` subdirectory of
+    [`default_cache_dir()`][erdantic.caching.default_cache_dir].
+
+    Attributes:
+        enabled (bool): Whether the cache is enabled.
+        directory (Path | None): Directory that cached files are stored in. None until enabled.
+        max_bytes (int | None): Maximum total size of cached files in bytes, or None if unbounded.
+    """
+
+    _subdirectory = "render"
+    _description = "render"
+
+    def get(self, source: str, format: str, prog: str, args: str = "") -> Optional[bytes]:
+        """Return the cached rendered output for a graph, or None if there isn't one or the cache
+        is disabled.
+
+        Args:
+            source (str): DOT source of the graph.
+            format (str): Output format, e.g., "png".
+            prog (str): Graphviz layout program, e.g., "dot".
+            args (str, optional): Extra arguments to Graphviz. Defaults to "".
+
+        Returns:
+            bytes | None: Rendered output.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(source, format, prog, args)
+        data = self._read(path)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        logger.debug("Using cached render %s.", path.name)
+        return data
+
+    def set(self, source: str, format: str, prog: str, data: bytes, args: str = "") -> None:
+        """Cache the rendered output for a graph. Does nothing if the cache is disabled.
+
+        Args:
+            source (str): DOT source of the graph.
+            format (str): Output format, e.g., "png".
+            prog (str): Graphviz layout program, e.g., "dot".
+            data (bytes): Rendered output.
+            args (str, optional): Extra arguments to Graphviz. Defaults to "".
+        """
+        if not self.enabled:
+            return
+        self._write(self._path(source, format, prog, args), data)
+
+    def _path(self, source: str, format: str, prog: str, args: str) -> Path:
+        # Lazy import so that pygraphviz is only needed for layout and rendering
+        import pygraphviz as pgv  # type: ignore [import-untyped, import-not-found]
+
+        assert self.directory is not None
+        digest = hashlib.sha256()
+        for part in (pgv.__version__, prog, format, args, source):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return self.directory / f"{digest.hexdigest()}.{format}"
+
+
+class AnalysisCache(_DiskCache):
+    """On-disk cache of analyzed diagrams that persists between runs. When enabled,
+    [`create`][erdantic.convenience.create] and the CLI reuse a previously created diagram for the
+    same arguments if none of the source files of its modules have changed, instead of analyzing
+    the data model classes again. The CLI can then also skip importing the modules entirely. This
+    cache is disabled by default. Use the instance `erdantic.caching.analysis_cache` rather than
+    instantiating this class.
+
+    Entries are keyed on the fully qualified names of the data model classes and modules that the
+    diagram was created from, the other arguments that affect the analysis, and the versions of
+    erdantic, Python, the supported data modeling frameworks, and the registered plugins. Each
+    entry records fingerprints of the source files of the modules of the diagram's models, of the
+    modules of their base classes, and of the modules that were searched. A fingerprint is a
+    file's modification time and size, and a hash of its contents that is only checked if the
+    modification time changed. Base classes without a source file, e.g., classes of compiled
+    frameworks, are not fingerprinted. Changes to other modules, e.g., ones that define type
+    aliases used in annotations, are not detected, so clear the cache if needed. Diagrams are
+    stored in the [compact serialization format][erdantic.serialization]. By default, files are
+    stored in the `analysis` subdirectory of
+    [`default_cache_dir()`][erdantic.caching.default_cache_dir].
+
+    Attributes:
+        enabled (bool): Whether the cache is enabled.
+        directory (Path | None): Directory that cached files are stored in. None until enabled.
+        max_bytes (int | None): Maximum total size of cached files in bytes, or None if unbounded.
+    """
+
+    _subdirectory = "analysis"
+    _description = "analysis"
+
+    def get(self, request: Mapping[str, Any]) -> Optional["EntityRelationshipDiagram"]:
+        """Return the cached diagram for a request, or None if there isn't one, the source files
+        of its modules have changed, or the cache is disabled.
+
+        Args:
+            request (Mapping[str, Any]): JSON-compatible arguments that the diagram is created
+                from, e.g., from [`analysis_request`][erdantic.caching.analysis_request].
+
+        Returns:
+            EntityRelationshipDiagram | None: Cached diagram.
+        """
+        if not self.enabled:
+            return None
+        # Lazy imports to avoid a circular import, since the core module uses this module
+        import json
+
+        from erdantic.serialization import from_compact
+
+        path = self._path(request)
+        data = self._read(path)
+        diagram = None
+        if data is not None:
+            try:
+                entry = json.loads(data)
+                changed = _changed_sources(entry["sources"])
+                if changed:
+                    logger.debug(
+                        "Cached analysis %s is stale. Changed modules: %s",
+                        path.name,
+                        ", ".join(changed),
+                    )
+                else:
+                    diagram = from_compact(entry["diagram"])
+            except Exception:
+                logger.debug("Failed to read cached analysis %s.", path.name, exc_info=True)
+        with self._lock:
+            if diagram is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        logger.debug("Using cached analysis %s.", path.name)
+        return diagram
+
+    def set(
+        self,
+        request: Mapping[str, Any],
+        diagram: "EntityRelationshipDiagram",
+        modules: Collection[str] = (),
+    ) -> None:
+        """Cache the diagram for a request. Does nothing if the cache is disabled, or if any of
+        the modules, or the module of any of the diagram's models, do not have a source file,
+        since changes to them could not be detected. The modules of the models' base classes are
+        also fingerprinted if they have a source file.
+
+        Args:
+            request (Mapping[str, Any]): JSON-compatible arguments that the diagram was created
+                from, e.g., from [`analysis_request`][erdantic.caching.analysis_request].
+            diagram (EntityRelationshipDiagram): Diagram to cache.
+            modules (Collection[str], optional): Names of modules to fingerprint in addition to
+                the modules of the diagram's models, e.g., modules that were searched for data
+                model classes. Defaults to no additional modules.
+        """
+        if not self.enabled:
+            return
+        # Lazy imports to avoid a circular import, since the core module uses this module
+        import json
+
+        from erdantic.serialization import to_compact
+
+        all_modules = set(modules)
+        all_modules.update(model_info.full_name.module for model_info in diagram.models.values())
+        # Base classes, e.g., in other modules, contribute fields to the diagram's models
+        base_modules = {
+            base.__module__
+            for model_info in diagram.models.values()
+            for base in model_info.raw_model.__mro__[1:]
+        }
+        base_modules.difference_update(all_modules)
+        sources = []
+        for module in sorted(all_modules | base_modules):
+            fingerprint = _fingerprint_module(module)
+            if fingerprint is None:
+                if module in base_modules:
+                    continue
+                logger.debug("Module '%s' has no source file. Not caching analysis.", module)
+                return
+            sources.append([module, *fingerprint])
+        try:
+            entry = {"sources": sources, "diagram": to_compact(diagram)}
+        except ValueError:
+            logger.debug("Diagram cannot be serialized. Not caching analysis.", exc_info=True)
+            return
+        self._write(self._path(request), json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+
+    def _path(self, request: Mapping[str, Any]) -> Path:
+        import json
+
+        assert self.directory is not None
+        key = {"request": request, "environment": _analysis_environment()}
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8"))
+        return self.directory / f"{digest.hexdigest()}.json"
+
+
+def analysis_request(
+    models_or_modules: Collection[str],
+    terminal_models: Collection[str] = (),
+    limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+) -> dict[str, Any]:
+    """Return the request for [`AnalysisCache`][erdantic.caching.AnalysisCache] entries for a
+    diagram created from data model classes and modules with the given fully qualified names and
+    options, as with [`create`][erdantic.convenience.create].
+
+    Args:
+        models_or_modules (Collection[str]): Fully qualified names of data model classes or
+            modules, in order.
+        terminal_models (Collection[str], optional): Fully qualified names of terminal models.
+            Defaults to no terminal models.
+        limit_search_models_to (Collection[str] | None, optional): Plugin identifiers to limit
+            to when searching modules. Defaults to None.
+        max_depth (int | None, optional): Maximum depth of relationships to follow. Defaults to
+            None.
+
+    Returns:
+        dict[str, Any]: JSON-compatible request.
+    """
+    return {
+        "models_or_modules": list(models_or_modules),
+        "terminal_models": list(terminal_models),
+        "limit_search_models_to": (
+            sorted(limit_search_models_to) if limit_search_models_to is not None else None
+        ),
+        "max_depth": max_depth,
+    }
+
+
+_FRAMEWORK_DISTRIBUTIONS = ("attrs", "msgspec", "pydantic", "typenames")
+"""Distributions whose versions can affect analysis results."""
+
+
+def _analysis_environment() -> dict[str, Any]:
+    """Return the versions and plugins that analysis results depend on, without importing the
+    data modeling frameworks."""
+    import importlib.metadata
+
+    from erdantic._version import __version__
+
+    versions = {}
+    for distribution in _FRAMEWORK_DISTRIBUTIONS:
+        try:
+            versions[distribution] = importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            versions[distribution] = None
+    core_plugin_modules = dict(erdantic.plugins.CORE_PLUGINS)
+    plugins = {key: module for key, module in erdantic.plugins._pending_plugins.items()}
+    for key, (predicate_fn, get_fields_fn) in erdantic.plugins._dict.items():
+        module = getattr(get_fields_fn, "__module__", None)
+        if module is not None and module == core_plugin_modules.get(key):
+            # Same as while pending, so entries don't depend on which plugins are loaded yet
+            plugins[key] = module
+        else:
+            plugins[key] = [_qualified_name(predicate_fn), _qualified_name(get_fields_fn)]
+    return {
+        "erdantic": __version__,
+        "python": list(sys.version_info[:2]),
+        "versions": versions,
+        "plugins": plugins,
+    }
+
+
+def _qualified_name(obj: Any) -> str:
+    return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+
+
+def _source_file(module: str) -> Optional[str]:
+    obj = sys.modules.get(module)
+    path = getattr(obj, "__file__", None)
+    if path is None or not path.endswith(".py"):
+        return None
+    return path
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def _fingerprint_module(module: str) -> Optional[tuple[str, int, int, str]]:
+    """Return the source file path, modification time, size, and content hash of an imported
+    module, or None if it doesn't have a Python source file."""
+    path = _source_file(module)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size, _hash_file(path))
+    except OSError:
+        return None
+
+
+def _changed_sources(sources: list) -> list[str]:
+    """Return the names of modules whose source files changed since they were fingerprinted."""
+    changed = []
+    for module, path, mtime_ns, size, digest in sources:
+        try:
+            stat = os.stat(path)
+            if stat.st_size != size:
+                changed.append(module)
+            elif stat.st_mtime_ns != mtime_ns and _hash_file(path) != digest:
+                changed.append(module)
+        except OSError:
+            changed.append(module)
+    return changed
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+class _ModelInfoCacheEntry(NamedTuple):
+    """Entry of the [`ModelInfoCache`][erdantic.caching.ModelInfoCache]. The cached ModelInfo's
+    fields do not hold their type annotations, which are stored as references that return
+    `_COLLECTED` once the annotation has been garbage collected."""
+
+    model_info: "ModelInfo"
+    raw_types: dict[str, Callable[[], Any]]
+    type_args: dict[str, list[tuple[Callable[[], Any], bool]]]
+
+
+_COLLECTED = object()
+"""Sentinel returned by the references from `_weak_type_ref` when the referent has been garbage
+collected."""
+
+
+def _weak_type_ref(tp: Any) -> Optional[Callable[[], Any]]:
+    """Return a function that returns a type annotation without holding a strong reference to it
+    or to any class it refers to, or that returns `_COLLECTED` if the annotation has been garbage
+    collected. Returns None if the annotation cannot be referenced this way."""
+    if tp is None or isinstance(tp, (str, bytes, int, float, bool)):
+        # Can't refer to a class, e.g., a forward reference string or a Literal value
+        return lambda: tp
+    if sys.version_info >= (3, 10) and isinstance(tp, types.UnionType):
+        # X | Y unions can't be weakly referenced, so reconstruct them from their members
+        arg_refs = [_weak_type_ref(arg) for arg in get_args(tp)]
+        if any(arg_ref is None for arg_ref in arg_refs):
+            return None
+
+        def union() -> Any:
+            args = [arg_ref() for arg_ref in arg_refs]  # type: ignore [misc]
+            if any(arg is _COLLECTED for arg in args):
+                return _COLLECTED
+            return functools.reduce(operator.or_, args)
+
+        return union
+    try:
+        ref = weakref.ref(tp)
+    except TypeError:
+        return None
+
+    def deref() -> Any:
+        obj = ref()
+        return _COLLECTED if obj is None else obj
+
+    return deref
+
+
+def _copy_model_info(model_info: "ModelInfo") -> "ModelInfo":
+    """Copy a ModelInfo instance and its FieldInfo instances."""
+    model_info = model_info.model_copy(
+        update={"fields": {key: fi.model_copy() for key, fi in model_info.fields.items()}}
+    )
+    model_info._link_fields()
+    return model_info
+
+
+model_info_cache = ModelInfoCache()
+"""Process-wide [`ModelInfoCache`][erdantic.caching.ModelInfoCache] instance. Call
+`model_info_cache.enable()` to turn it on."""
+
+type_name_cache = TypeNameCache()
+"""Process-wide [`TypeNameCache`][erdantic.caching.TypeNameCache] instance."""
+
+render_cache = RenderCache()
+"""Process-wide [`RenderCache`][erdantic.caching.RenderCache] instance. Call
+`render_cache.enable()` to turn it on."""
+
+analysis_cache = AnalysisCache()
+"""Process-wide [`AnalysisCache`][erdantic.caching.AnalysisCache] instance. Call
+`analysis_cache.enable()` to turn it on."""
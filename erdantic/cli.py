@@ -1,16 +1,19 @@
+import difflib
 from enum import Enum
-from importlib import import_module
 import logging
 from pathlib import Path
+import sys
 from types import ModuleType
-from typing import TYPE_CHECKING, Annotated, Optional, Union
+from typing import TYPE_CHECKING, Annotated, Optional
 
 import typer
 
 from erdantic._logging import package_logger
 from erdantic._version import __version__
-from erdantic.convenience import create
-from erdantic.exceptions import ModelOrModuleNotFoundError
+from erdantic.caching import analysis_cache
+from erdantic.convenience import _create_by_name, _resolve_termini, import_object_from_name
+from erdantic.core import EntityRelationshipDiagram
+from erdantic.exceptions import ModelNotInDiagramError
 import erdantic.plugins
 
 app = typer.Typer()
@@ -22,6 +25,17 @@ class StrEnum(str, Enum):
     pass
 
 
+class FocusDirection(StrEnum):
+    out = "out"
+    in_ = "in"
+    both = "both"
+
+
+class SplitBy(StrEnum):
+    component = "component"
+    module = "module"
+
+
 if TYPE_CHECKING:
     # mypy typechecking doesn't support enums created with functional API
     # https://github.com/python/mypy/issues/6037
@@ -29,8 +43,10 @@ if TYPE_CHECKING:
     class AvailablePluginKeys(StrEnum): ...
 
 else:
+    # Include pending core plugins without loading them, so that building the command does not
+    # import every supported data modeling framework
     AvailablePluginKeys = StrEnum(
-        "AvailablePluginKeys", {key: key for key in erdantic.plugins.list_plugins()}
+        "AvailablePluginKeys", {key: key for key in erdantic.plugins._list_plugin_keys()}
     )
 
 
@@ -59,6 +75,15 @@ def d2_callback(ctx: typer.Context, d2: bool):
     return d2
 
 
+def manifest_callback(ctx: typer.Context, manifest: Optional[Path]):
+    """Set models and --out to not be required since diagrams are listed in the manifest."""
+    if manifest is not None:
+        for param in ctx.command.params:
+            if param.name in ("models_or_modules", "out"):
+                param.required = False
+    return manifest
+
+
 def list_plugins_callback(list_plugins: bool):
     if list_plugins:
         active_plugins = erdantic.plugins.list_plugins()
@@ -94,8 +119,15 @@ def main(
         ),
     ],
     out: Annotated[
-        Path,
-        typer.Option("--out", "-o", help="Output filename."),
+        list[Path],
+        typer.Option(
+            "--out",
+            "-o",
+            help=(
+                "Output filename. Repeat this option to render more than one file, e.g., in "
+                "different formats. The diagram is laid out only once for all files."
+            ),
+        ),
     ],
     terminal_models: Annotated[
         list[str],
@@ -129,6 +161,59 @@ def main(
             ),
         ),
     ] = [],
+    focus: Annotated[
+        list[str],
+        typer.Option(
+            "--focus",
+            "-f",
+            help=(
+                "Full dotted paths for data model classes to focus on. If specified, the diagram "
+                "only includes models within --depth relationships of these models. Repeat this "
+                "option if more than one."
+            ),
+        ),
+    ] = [],
+    depth: Annotated[
+        Optional[int],
+        typer.Option(
+            "--depth",
+            min=0,
+            help=(
+                "Maximum number of relationships from the --focus models to include. Defaults to "
+                "no limit."
+            ),
+        ),
+    ] = None,
+    focus_direction: Annotated[
+        FocusDirection,
+        typer.Option(
+            "--focus-direction",
+            help=(
+                "Which relationships to follow from the --focus models: 'out' for models that "
+                "they reference, 'in' for models that reference them, or 'both'."
+            ),
+        ),
+    ] = FocusDirection.out,
+    split: Annotated[
+        Optional[SplitBy],
+        typer.Option(
+            "--split",
+            help=(
+                "Split the diagram into smaller diagrams and render each one to its own file in "
+                "the --out directory, together with an index.html page linking to them. "
+                "'component' gives one diagram per group of related models, and 'module' gives "
+                "one diagram per module, including referenced models from other modules. Use "
+                "--jobs to render the diagrams in parallel."
+            ),
+        ),
+    ] = None,
+    split_format: Annotated[
+        str,
+        typer.Option(
+            "--split-format",
+            help="Output file format for diagrams rendered with --split, e.g., 'svg' or 'png'.",
+        ),
+    ] = "svg",
     dot: Annotated[
         bool,
         typer.Option(
@@ -137,7 +222,8 @@ def main(
             callback=dot_callback,
             help=(
                 "Print out Graphviz DOT language representation for generated graph to console "
-                "instead of rendering an image. The --out option will be ignored."
+                "instead of rendering an image. The --out option will be ignored. Use --text-out "
+                "to write to a file instead."
             ),
         ),
     ] = False,
@@ -148,7 +234,112 @@ def main(
             callback=d2_callback,
             help=(
                 "Print out D2 language representation for a class diagram to console "
-                "instead of rendering an image. The --out option will be ignored."
+                "instead of rendering an image. The --out option will be ignored. Use --text-out "
+                "to write to a file instead."
+            ),
+        ),
+    ] = False,
+    text_out: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--text-out",
+            help=(
+                "Output filename for the --dot or --d2 representation. If specified, the "
+                "representation is written to this file instead of printed to the console."
+            ),
+        ),
+    ] = None,
+    manifest: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--manifest",
+            callback=manifest_callback,
+            help=(
+                "TOML or JSON manifest file listing many diagrams to render in one process. "
+                "Each entry of its 'diagrams' array specifies 'models_or_modules', 'out', and "
+                "optionally 'terminal_models', 'limit_search_models_to', 'max_depth', "
+                "'graph_attr', 'node_attr', and 'edge_attr'. Relative output paths are resolved "
+                "relative to the manifest's directory. Models and other options for a single "
+                "diagram are ignored."
+            ),
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=0,
+            help=(
+                "Number of worker processes for rendering the diagrams in --manifest or from "
+                "--split in parallel, or for parsing modules with --static. "
+                "Use 0 for the number of processors. Defaults to 1, which renders all diagrams "
+                "in this process so that imports and analyzed models are shared between them."
+            ),
+        ),
+    ] = 1,
+    watch: Annotated[
+        bool,
+        typer.Option(
+            "--watch",
+            "-w",
+            help=(
+                "Keep running and re-render the diagram when the source files of its data model "
+                "classes change. Only changed modules and modules that depend on them are "
+                "reloaded and analyzed again, and the diagram is only re-rendered if its output "
+                "changed. Press Ctrl+C to stop."
+            ),
+        ),
+    ] = False,
+    watch_interval: Annotated[
+        float,
+        typer.Option(
+            "--watch-interval",
+            min=0,
+            help="Time in seconds between checks for changes in --watch mode.",
+        ),
+    ] = 1.0,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache",
+            help=(
+                "Cache the analyzed diagram on disk. If the source files of its data model "
+                "classes and searched modules have not changed since, later runs with the same "
+                "models and options reuse it without importing the modules."
+            ),
+        ),
+    ] = False,
+    cache_dir: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--cache-dir",
+            help=(
+                "Directory for --cache. Defaults to the 'analysis' subdirectory of "
+                "$ERDANTIC_CACHE_DIR, or of ~/.cache/erdantic."
+            ),
+        ),
+    ] = None,
+    recursive: Annotated[
+        bool,
+        typer.Option(
+            "--recursive",
+            "-r",
+            help=(
+                "Also search all subpackages and submodules of given packages for data model "
+                "classes. Modules are imported with a pool of threads, and modules that fail to "
+                "import are reported without stopping the search."
+            ),
+        ),
+    ] = False,
+    static: Annotated[
+        bool,
+        typer.Option(
+            "--static",
+            help=(
+                "Find data model classes by parsing the source code of modules instead of "
+                "importing them, so that module side effects and dependencies are not run. Only "
+                "classes and fields that are declared in the source code are recognized."
             ),
         ),
     ] = False,
@@ -200,9 +391,33 @@ def main(
     attrs, and standard library dataclasses.
     """
 
+    if manifest is not None and (dot or d2 or watch):
+        logger.error("The --manifest option cannot be used with --dot, --d2, or --watch.")
+        raise typer.Exit(code=1)
     if dot and d2:
         logger.error("The --dot and --d2 options are mutually exclusive.")
         raise typer.Exit(code=1)
+    if split is not None and (dot or d2 or manifest is not None):
+        logger.error("The --split option cannot be used with --dot, --d2, or --manifest.")
+        raise typer.Exit(code=1)
+    if split is not None and len(out) != 1:
+        logger.error("The --split option requires a single --out directory.")
+        raise typer.Exit(code=1)
+    if depth is not None and not focus:
+        logger.error("The --depth option requires --focus.")
+        raise typer.Exit(code=1)
+    if cache and (watch or manifest is not None):
+        logger.error("The --cache option cannot be used with --watch or --manifest.")
+        raise typer.Exit(code=1)
+    if recursive and (static or cache):
+        logger.error("The --recursive option cannot be used with --static or --cache.")
+        raise typer.Exit(code=1)
+    if static and (watch or cache or manifest is not None):
+        logger.error("The --static option cannot be used with --watch, --cache, or --manifest.")
+        raise typer.Exit(code=1)
+    if text_out is not None and not (dot or d2):
+        logger.error("The --text-out option requires --dot or --d2.")
+        raise typer.Exit(code=1)
     # Set up logger
     log_level = logging.INFO + 10 * quiet - 10 * verbose
     package_logger.setLevel(log_level)
@@ -211,63 +426,174 @@ def main(
     log_formatter = logging.Formatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s")
     log_handler.setFormatter(log_formatter)
 
-    logger.debug("Registered plugins: %s", ", ".join(erdantic.plugins.list_plugins()))
+    logger.debug("Registered plugins: %s", ", ".join(erdantic.plugins._list_plugin_keys()))
 
     logger.debug("models_or_modules: %s", models_or_modules)
     logger.debug("out: %s", out)
     logger.debug("terminal_models: %s", terminal_models)
     logger.debug("termini: %s", termini)
     logger.debug("limit_search_models_to: %s", limit_search_models_to)
+    logger.debug("focus: %s", focus)
+    logger.debug("depth: %s", depth)
+    logger.debug("focus_direction: %s", focus_direction)
+    logger.debug("split: %s", split)
+    logger.debug("split_format: %s", split_format)
     logger.debug("dot: %s", dot)
+    logger.debug("d2: %s", d2)
+    logger.debug("text_out: %s", text_out)
+    logger.debug("manifest: %s", manifest)
+    logger.debug("jobs: %s", jobs)
+    logger.debug("watch: %s", watch)
+    logger.debug("watch_interval: %s", watch_interval)
+    logger.debug("cache: %s", cache)
+    logger.debug("cache_dir: %s", cache_dir)
+    logger.debug("recursive: %s", recursive)
+    logger.debug("static: %s", static)
     logger.debug("no_overwrite: %s", no_overwrite)
 
-    model_or_module_objs = [import_object_from_name(mm) for mm in models_or_modules]
-    terminal_model_classes = [import_object_from_name(mm) for mm in terminal_models]
-    termini_classes = [import_object_from_name(mm) for mm in termini]
+    if manifest is not None:
+        draw_manifest(manifest, jobs=jobs, no_overwrite=no_overwrite)
+        return
+
+    if dot or d2:
+        if text_out is not None and text_out.exists() and no_overwrite:
+            logger.error(f"{text_out} already exists, and you specified --no-overwrite.")
+            raise typer.Exit(code=1)
+    elif split is not None:
+        # Lazy import so that only split mode imports the partition module
+        from erdantic.partition import INDEX_FILENAME
+
+        index_path = out[0] / INDEX_FILENAME
+        if index_path.exists() and no_overwrite:
+            logger.error(f"{index_path} already exists, and you specified --no-overwrite.")
+            raise typer.Exit(code=1)
+    else:
+        for path in out:
+            if path.exists() and no_overwrite:
+                logger.error(f"{path} already exists, and you specified --no-overwrite.")
+                raise typer.Exit(code=1)
+
     limit_search_models_to_str = [
         m.value for m in limit_search_models_to
     ] or None  # Don't want empty list
-    diagram = create(
-        *model_or_module_objs,  # type: ignore [arg-type]
-        terminal_models=terminal_model_classes,  # type: ignore [arg-type]
-        termini=termini_classes,  # type: ignore [arg-type]
-        limit_search_models_to=limit_search_models_to_str,
-    )
-    if dot:
-        typer.echo(diagram.to_dot())
-    elif d2:
-        typer.echo(diagram.to_d2())
+
+    if cache:
+        analysis_cache.enable(directory=cache_dir)
+
+    def create_diagram() -> EntityRelationshipDiagram:
+        if static:
+            # Lazy import so that only static analysis imports the static module
+            from erdantic.static import create_static
+
+            diagram = create_static(
+                *models_or_modules,
+                terminal_models=_resolve_termini(terminal_models, termini),
+                limit_search_models_to=limit_search_models_to_str,
+                max_workers=jobs or None,
+            )
+        else:
+            # Import by name so that watch mode gets the classes from reloaded modules, and so
+            # that nothing is imported if there is a cached diagram
+            diagram = _create_by_name(
+                models_or_modules,
+                terminal_models=terminal_models,
+                termini=termini,
+                limit_search_models_to=limit_search_models_to_str,
+                recursive=recursive,
+            )
+        if focus:
+            try:
+                diagram = diagram.subgraph(focus, depth=depth, direction=focus_direction.value)
+            except ModelNotInDiagramError as e:
+                logger.error(_focus_error_message(e.key, diagram))
+                raise typer.Exit(code=1)
+        return diagram
+
+    def render_diagram(diagram: EntityRelationshipDiagram):
+        if dot or d2:
+            # Write output incrementally rather than building it as one string
+            write = diagram.write_dot if dot else diagram.write_d2
+            if text_out is not None:
+                with text_out.open("w", encoding="utf-8") as fp:
+                    write(fp)
+                logger.info(f"Wrote diagram to {text_out}")
+            else:
+                write(sys.stdout)
+                sys.stdout.write("\n")
+        elif split is not None:
+            from erdantic.partition import draw_partitioned
+
+            paths = draw_partitioned(
+                diagram,
+                out[0],
+                by=split.value,
+                format=split_format,
+                max_workers=jobs or None,
+            )
+            logger.info(f"Rendered {len(paths)} diagrams and index to {out[0]}")
+        else:
+            if len(out) == 1:
+                diagram.draw(out[0])
+            else:
+                diagram.draw_many(out)
+            logger.info(f"Rendered diagram to {', '.join(str(path) for path in out)}")
+
+    if watch:
+        # Lazy import so that only watch mode imports the watch module
+        from erdantic.watch import watch as watch_fn
+
+        # Also watch modules that are searched for models and modules of the given models
+        modules = {
+            obj.__name__ if isinstance(obj, ModuleType) else obj.__module__
+            for obj in map(import_object_from_name, models_or_modules)
+        }
+        watch_fn(
+            create_diagram,
+            render_diagram,
+            output_fn=EntityRelationshipDiagram.to_d2 if d2 else EntityRelationshipDiagram.to_dot,
+            modules=modules,
+            interval=watch_interval,
+        )
     else:
-        if out.exists() and no_overwrite:
-            logger.error(f"{out} already exists, and you specified --no-overwrite.")
-            raise typer.Exit(code=1)
-        diagram.draw(out)
-        logger.info(f"Rendered diagram to {out}")
+        render_diagram(create_diagram())
+
 
+def draw_manifest(manifest: Path, jobs: int, no_overwrite: bool):
+    """Render all diagrams listed in a manifest file."""
+    # Lazy import so that only manifest mode imports the batch module
+    from erdantic.batch import draw_batch, load_manifest
 
-def import_object_from_name(full_obj_name: str) -> Union[ModuleType, object]:
-    """Import an object from a fully qualified name."""
     try:
-        # Try to import as a module
-        return import_module(full_obj_name)
-    except ModuleNotFoundError:
-        # Try to import as an object in a module
-        try:
-            module_name, obj_name = full_obj_name.rsplit(".", 1)
-            module = import_module(module_name)
-            return getattr(module, obj_name)
-        except (ImportError, AttributeError) as e:
-            raise ModelOrModuleNotFoundError(
-                f"Unable to import '{full_obj_name}'.", name=full_obj_name, path=__file__
-            ) from e
-        except ValueError as e:
-            # This can happen if there are no dots in the name
-            if "not enough values to unpack (expected 2, got 1)" in str(e):
-                raise ModelOrModuleNotFoundError(
-                    f"Unable to import '{full_obj_name}'. "
-                    "It should be a fully qualified name for a model class or module.",
-                    name=full_obj_name,
-                    path=__file__,
-                )
-            else:
-                raise e
+        draw_jobs = load_manifest(manifest)
+    except Exception as e:
+        logger.error(f"Failed to load manifest {manifest}: {e}")
+        raise typer.Exit(code=1)
+    if no_overwrite:
+        for draw_job in draw_jobs:
+            for path in draw_job.out:
+                if path.exists():
+                    logger.error(f"{path} already exists, and you specified --no-overwrite.")
+                    raise typer.Exit(code=1)
+    results = draw_batch(draw_jobs, max_workers=jobs or None)
+    num_failed = sum(not result.success for result in results)
+    if num_failed:
+        logger.error(f"Failed to render {num_failed} of {len(results)} diagrams.")
+        raise typer.Exit(code=1)
+
+
+def _focus_error_message(key: str, diagram: EntityRelationshipDiagram) -> str:
+    """Error message for a --focus model that is not in the diagram, with the models in the
+    diagram that it may have meant."""
+    message = f"--focus model '{key}' is not in the diagram."
+    name = key.rpartition(".")[2]
+    candidates = [
+        model_key for model_key, model_info in diagram.models.items() if model_info.name == name
+    ]
+    candidates += [
+        match
+        for match in difflib.get_close_matches(key, list(diagram.models), n=3)
+        if match not in candidates
+    ]
+    if candidates:
+        return f"{message} Did you mean: {', '.join(candidates)}?"
+    return f"{message} Specify models by their fully qualified names, e.g., 'module.Model'."
@@ -1,27 +1,35 @@
 from collections.abc import Mapping
-import inspect
+from importlib import import_module
 import logging
 import os
+import sys
 from types import ModuleType
-from typing import Any, Collection, Iterator, Optional, Union
+from typing import Any, Collection, Iterable, Iterator, Optional, Sequence, TypeVar, Union
 import warnings
 
 from typenames import REMOVE_ALL_MODULES, typenames
 
-from erdantic.core import EntityRelationshipDiagram
-from erdantic.plugins import get_predicate_fn, list_plugins
+from erdantic.caching import analysis_cache, analysis_request
+from erdantic.core import EntityRelationshipDiagram, FullyQualifiedName
+from erdantic.exceptions import ModelOrModuleNotFoundError
+from erdantic.plugins import _identify_plugin_key, _list_active_plugins, get_predicate_fn
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 def create(
     *models_or_modules: Union[type, ModuleType],
     terminal_models: Collection[type] = tuple(),
     termini: Collection[type] = tuple(),
     limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+    recursive: bool = False,
 ) -> EntityRelationshipDiagram:
     """Construct [`EntityRelationshipDiagram`][erdantic.core.EntityRelationshipDiagram] from given
-    data model classes or modules.
+    data model classes or modules. If the [analysis cache][erdantic.caching.AnalysisCache] is
+    enabled, a cached diagram is returned if none of the source files of its modules have changed.
 
     Args:
         *models_or_modules (type | ModuleType): Data model classes to add to diagram, or modules
@@ -32,6 +40,13 @@ def create(
         limit_search_models_to (Collection[str] | None): Plugin identifiers to limit to when
             searching modules for data model classes. Defaults to None which will not impose any
             limits.
+        max_depth (int | None): Maximum number of relationships to follow from each given data
+            model class when searching for component classes. Defaults to None which will not
+            impose any limits.
+        recursive (bool): Whether to also search all subpackages and submodules of given
+            packages, using [`scan_package`][erdantic.scan.scan_package]. Modules that fail to
+            import are logged and skipped. The analysis cache is not used, since it cannot detect
+            added submodules. Defaults to False.
 
     Returns:
         EntityRelationshipDiagram: diagram object for given data model.
@@ -41,18 +56,72 @@ def create(
         UnresolvableForwardRefError: if a model contains a forward reference that cannot be
             automatically resolved.
     """
-    if termini:
-        warnings.warn(
-            "The 'termini' argument is deprecated and will be removed in a future release. "
-            "Please use 'terminal_models' instead.",
-            DeprecationWarning,
+    terminal_models = _resolve_termini(terminal_models, termini)
+
+    request = None
+    if analysis_cache.enabled and not recursive:
+        request = _analysis_request_from_objects(
+            models_or_modules, terminal_models, limit_search_models_to, max_depth
         )
-        if terminal_models:
-            raise ValueError(
-                "Cannot specify both 'terminal_models' and 'termini' at the same time."
-            )
-        terminal_models = termini
+        if request is not None:
+            diagram = analysis_cache.get(request)
+            if diagram is not None:
+                return diagram
+
+    diagram = _create(
+        models_or_modules, terminal_models, limit_search_models_to, max_depth, recursive
+    )
+    if request is not None:
+        analysis_cache.set(request, diagram, modules=_object_modules(models_or_modules))
+    return diagram
+
+
+def _create_by_name(
+    models_or_modules: Sequence[str],
+    terminal_models: Sequence[str] = (),
+    termini: Sequence[str] = (),
+    limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+    recursive: bool = False,
+) -> EntityRelationshipDiagram:
+    """Same as [`create`][erdantic.convenience.create], but data model classes and modules are
+    given by their fully qualified names. If the
+    [analysis cache][erdantic.caching.AnalysisCache] is enabled, a cached diagram is looked up by
+    the names before importing anything, so nothing is imported if there is one."""
+    terminal_models = _resolve_termini(terminal_models, termini)
+    request = None
+    if analysis_cache.enabled and not recursive:
+        request = analysis_request(
+            models_or_modules,
+            terminal_models=terminal_models,
+            limit_search_models_to=limit_search_models_to,
+            max_depth=max_depth,
+        )
+        diagram = analysis_cache.get(request)
+        if diagram is not None:
+            return diagram
+
+    model_or_module_objs = [import_object_from_name(name) for name in models_or_modules]
+    terminal_model_classes = [import_object_from_name(name) for name in terminal_models]
+    diagram = _create(
+        model_or_module_objs,  # type: ignore [arg-type]
+        terminal_model_classes,  # type: ignore [arg-type]
+        limit_search_models_to,
+        max_depth,
+        recursive,
+    )
+    if request is not None:
+        analysis_cache.set(request, diagram, modules=_object_modules(model_or_module_objs))
+    return diagram
+
 
+def _create(
+    models_or_modules: Iterable[Union[type, ModuleType]],
+    terminal_models: Iterable[type],
+    limit_search_models_to: Optional[Collection[str]],
+    max_depth: Optional[int],
+    recursive: bool = False,
+) -> EntityRelationshipDiagram:
     diagram = EntityRelationshipDiagram()
 
     # Add terminal models and don't recurse
@@ -60,19 +129,86 @@ def create(
         diagram.add_model(model, recurse=False)
 
     for mm in models_or_modules:
-        if isinstance(mm, ModuleType):
+        if recursive and isinstance(mm, ModuleType) and hasattr(mm, "__path__"):
+            # Lazy import to avoid a circular import
+            from erdantic.scan import scan_package
+
+            for result in scan_package(mm, limit_search_models_to=limit_search_models_to):
+                for member in result.models:
+                    diagram.add_model(member, max_depth=max_depth)
+        elif isinstance(mm, ModuleType):
             logger.debug("Searching input module '%s' for data model classes...", mm.__name__)
             for member in find_models(mm, limit_search_models_to=limit_search_models_to):
-                diagram.add_model(member)
+                diagram.add_model(member, max_depth=max_depth)
         else:
-            diagram.add_model(mm)
+            diagram.add_model(mm, max_depth=max_depth)
     return diagram
 
 
+def _resolve_termini(terminal_models: Collection[_T], termini: Collection[_T]) -> Collection[_T]:
+    """Handle the deprecated 'termini' argument."""
+    if termini:
+        warnings.warn(
+            "The 'termini' argument is deprecated and will be removed in a future release. "
+            "Please use 'terminal_models' instead.",
+            DeprecationWarning,
+        )
+        if terminal_models:
+            raise ValueError(
+                "Cannot specify both 'terminal_models' and 'termini' at the same time."
+            )
+        return termini
+    return terminal_models
+
+
+def _object_name(obj: Any) -> Optional[str]:
+    """Return the fully qualified name of a module or class if the same object is imported by that
+    name, otherwise None."""
+    try:
+        if isinstance(obj, ModuleType):
+            name = obj.__name__
+            return name if sys.modules.get(name) is obj else None
+        full_name = FullyQualifiedName.from_object(obj)
+        return str(full_name) if full_name.import_object() is obj else None
+    except Exception:
+        return None
+
+
+def _analysis_request_from_objects(
+    models_or_modules: Collection[Union[type, ModuleType]],
+    terminal_models: Collection[type],
+    limit_search_models_to: Optional[Collection[str]],
+    max_depth: Optional[int],
+) -> Optional[dict[str, Any]]:
+    """Return the analysis cache request for arguments to create, or None if any of the classes or
+    modules cannot be identified by name, e.g., classes defined in a function."""
+    names = [_object_name(obj) for obj in models_or_modules]
+    terminal_names = [_object_name(obj) for obj in terminal_models]
+    if None in names or None in terminal_names:
+        logger.debug("Not all models or modules can be imported by name. Not using cache.")
+        return None
+    return analysis_request(
+        names,  # type: ignore [arg-type]
+        terminal_models=terminal_names,  # type: ignore [arg-type]
+        limit_search_models_to=limit_search_models_to,
+        max_depth=max_depth,
+    )
+
+
+def _object_modules(models_or_modules: Iterable[Any]) -> set[str]:
+    """Return the names of the given modules and of the modules of the given classes."""
+    return {
+        obj.__name__ if isinstance(obj, ModuleType) else obj.__module__
+        for obj in models_or_modules
+    }
+
+
 def find_models(
     module: ModuleType, limit_search_models_to: Optional[Collection[str]] = None
 ) -> Iterator[type]:
-    """Searches a module and yields all data model classes found.
+    """Searches a module and yields all data model classes found. Only classes defined in the
+    module are yielded, not ones that it imports. Attributes that a module loads lazily, e.g.,
+    with a module-level `__getattr__`, are not searched and are not loaded.
 
     Args:
         module (ModuleType): Module to search for data model classes.
@@ -81,28 +217,39 @@ def find_models(
             limits.
 
     Yields:
-        Iterator[type]: Members of module that are data model classes.
+        Iterator[type]: Members of module that are data model classes, in the order that they
+            were added to the module's namespace.
 
     Raises:
         UnknownModelTypeError: if a given model does not match any model types from loaded plugins.
         UnresolvableForwardRefError: if a model contains a forward reference that cannot be
             automatically resolved.
     """
-    all_plugins = list_plugins()
     if limit_search_models_to is not None:
+        limit_keys = set(limit_search_models_to)
         predicate_fns = [get_predicate_fn(key) for key in limit_search_models_to]
     else:
-        predicate_fns = [get_predicate_fn(key) for key in all_plugins]
-    for _, member in inspect.getmembers(module, inspect.isclass):
-        if member.__module__ == module.__name__:
-            for predicate_fn in predicate_fns:
-                if predicate_fn(member):
-                    logger.debug(
-                        "Found data model class '%s' in module '%s'",
-                        typenames(member, remove_modules=REMOVE_ALL_MODULES),
-                        module.__name__,
-                    )
-                    yield member
+        _list_active_plugins()  # Load pending plugins whose frameworks have been imported
+    module_name = module.__name__
+    # Read the module's namespace directly rather than with inspect.getmembers, which sorts all
+    # members and calls getattr for each name, which can trigger lazily loaded attributes
+    for member in tuple(vars(module).values()):
+        if not isinstance(member, type) or getattr(member, "__module__", None) != module_name:
+            continue
+        key = _identify_plugin_key(member)
+        if key is None:
+            continue
+        if limit_search_models_to is not None and key not in limit_keys:
+            # A class can match more than one plugin, but is identified as the first match
+            if not any(predicate_fn(member) for predicate_fn in predicate_fns):
+                continue
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Found data model class '%s' in module '%s'",
+                typenames(member, remove_modules=REMOVE_ALL_MODULES),
+                module_name,
+            )
+        yield member
 
 
 def draw(
@@ -111,6 +258,7 @@ def draw(
     terminal_models: Collection[type] = tuple(),
     termini: Collection[type] = tuple(),
     limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
     graph_attr: Optional[Mapping[str, Any]] = None,
     node_attr: Optional[Mapping[str, Any]] = None,
     edge_attr: Optional[Mapping[str, Any]] = None,
@@ -127,6 +275,9 @@ def draw(
         limit_search_models_to (Optional[Collection[str]]): Plugin identifiers to limit to when
             searching modules for data model classes. Defaults to None which will not impose any
             limits.
+        max_depth (Optional[int]): Maximum number of relationships to follow from each given data
+            model class when searching for component classes. Defaults to None which will not
+            impose any limits.
         graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes on
             the `pygraphviz.AGraph` instance. Defaults to None.
         node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
@@ -145,6 +296,7 @@ def draw(
         *models_or_modules,
         terminal_models=terminal_models,
         limit_search_models_to=limit_search_models_to,
+        max_depth=max_depth,
     )
     diagram.draw(
         out=out, graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr, **kwargs
@@ -156,6 +308,7 @@ def to_dot(
     terminal_models: Collection[type] = [],
     termini: Collection[type] = tuple(),
     limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
     graph_attr: Optional[Mapping[str, Any]] = None,
     node_attr: Optional[Mapping[str, Any]] = None,
     edge_attr: Optional[Mapping[str, Any]] = None,
@@ -172,6 +325,9 @@ def to_dot(
         limit_search_models_to (Optional[Collection[str]]): Plugin identifiers to limit to when
             searching modules for data model classes. Defaults to None which will not impose any
             limits.
+        max_depth (Optional[int]): Maximum number of relationships to follow from each given data
+            model class when searching for component classes. Defaults to None which will not
+            impose any limits.
         graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes on
             the `pygraphviz.AGraph` instance. Defaults to None.
         node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
@@ -187,5 +343,34 @@ def to_dot(
         terminal_models=terminal_models,
         termini=termini,
         limit_search_models_to=limit_search_models_to,
+        max_depth=max_depth,
     )
     return diagram.to_dot(graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr)
+
+
+def import_object_from_name(full_obj_name: str) -> Union[ModuleType, object]:
+    """Import an object from a fully qualified name."""
+    try:
+        # Try to import as a module
+        return import_module(full_obj_name)
+    except ModuleNotFoundError:
+        # Try to import as an object in a module
+        try:
+            module_name, obj_name = full_obj_name.rsplit(".", 1)
+            module = import_module(module_name)
+            return getattr(module, obj_name)
+        except (ImportError, AttributeError) as e:
+            raise ModelOrModuleNotFoundError(
+                f"Unable to import '{full_obj_name}'.", name=full_obj_name, path=__file__
+            ) from e
+        except ValueError as e:
+            # This can happen if there are no dots in the name
+            if "not enough values to unpack (expected 2, got 1)" in str(e):
+                raise ModelOrModuleNotFoundError(
+                    f"Unable to import '{full_obj_name}'. "
+                    "It should be a fully qualified name for a model class or module.",
+                    name=full_obj_name,
+                    path=__file__,
+                )
+            else:
+                raise e
@@ -1,21 +1,42 @@
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from enum import Enum
 from functools import total_ordering
 from importlib import import_module
 import inspect
+import itertools
 import logging
 import os
 import sys
 import textwrap
-from typing import Any, Dict, Generic, Optional, Type, TypeVar, Union, get_args
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+)
 
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
     from typing_extensions import Self
 
+if TYPE_CHECKING:
+    import pygraphviz as pgv  # type: ignore [import-untyped, import-not-found]
+
 import pydantic
-import pygraphviz as pgv  # type: ignore [import-untyped, import-not-found]
 from sortedcontainers_pydantic import SortedDict
 from typenames import REMOVE_ALL_MODULES, typenames
 
@@ -26,16 +47,18 @@ from erdantic._repr_utils import (
     sorteddict_rich_repr,
 )
 from erdantic._version import __version__
+from erdantic.caching import model_info_cache, render_cache, type_name_cache
 from erdantic.exceptions import (
     FieldNotFoundError,
+    ModelNotInDiagramError,
     UnevaluatedForwardRefError,
     UnknownModelTypeError,
     _UnevaluatedForwardRefError,
 )
 from erdantic.plugins import identify_field_extractor_fn, list_plugins
 from erdantic.typing_utils import (
-    get_recursive_args,
-    is_collection_type_of,
+    TypeArg,
+    analyze_type_args,
     is_nullable_type,
 )
 
@@ -121,6 +144,9 @@ class FieldInfo(pydantic.BaseModel):
     _dot_row_template = """<tr><td>{name}</td><td port="{name}">{type_name}</td></tr>"""
 
     _raw_type: Optional[type] = pydantic.PrivateAttr(None)
+    _type_args: Optional[List[TypeArg]] = pydantic.PrivateAttr(None)
+    # Fields of the same model, set by ModelInfo, used to resolve raw types in batch
+    _siblings: Optional[Mapping[str, "FieldInfo"]] = pydantic.PrivateAttr(None)
 
     @classmethod
     def from_raw_type(cls, model_full_name: FullyQualifiedName, name: str, raw_type: type) -> Self:
@@ -135,7 +161,7 @@ class FieldInfo(pydantic.BaseModel):
         Returns:
             Self: _description_
         """
-        type_name = typenames(raw_type, remove_modules=REMOVE_ALL_MODULES)
+        type_name = type_name_cache.typenames(raw_type, remove_modules=REMOVE_ALL_MODULES)
         field_info = cls(
             model_full_name=model_full_name,
             name=name,
@@ -155,7 +181,9 @@ class FieldInfo(pydantic.BaseModel):
     def raw_type(self) -> type:
         """Returns the raw type annotation of the field. This is a cached property. If the raw
         type is not already known, it will attempt to import the data model class and reextract
-        the field's type annotation.
+        the field's type annotation. If this instance belongs to a ModelInfo instance, the raw
+        types of all of the model's fields that are not already known are set from the same
+        extraction.
 
         Raises:
             FieldNotFoundError: _description_
@@ -167,19 +195,38 @@ class FieldInfo(pydantic.BaseModel):
         if self._raw_type is None:
             model = self.model_full_name.import_object()
             get_fields_fn = identify_field_extractor_fn(model)
-            if get_fields_fn:
-                for field_info in get_fields_fn(model):
-                    if field_info.name == self.name:
-                        self._raw_type = field_info.raw_type
-                        break
-                else:
-                    raise FieldNotFoundError(
-                        name=self.name, obj=model, model_full_name=self.model_full_name
-                    )
-            else:
+            if not get_fields_fn:
                 raise UnknownModelTypeError(model=model, available_plugins=list_plugins())
+            siblings = self._siblings
+            if siblings is None or siblings.get(self.name) is not self:
+                # Not part of a ModelInfo, or a copy that still refers to the original's fields
+                siblings = {self.name: self}
+            for field_info in get_fields_fn(model):
+                sibling = siblings.get(field_info.name)
+                if sibling is not None and sibling._raw_type is None:
+                    sibling._raw_type = field_info.raw_type
+            if self._raw_type is None:
+                raise FieldNotFoundError(
+                    name=self.name, obj=model, model_full_name=self.model_full_name
+                )
         return self._raw_type
 
+    @property
+    def type_args(self) -> List[TypeArg]:
+        """Returns the leaf-node types of the field's type annotation, together with whether each
+        one is contained in a collection. This is a cached property.
+
+        Raises:
+            _UnevaluatedForwardRefError: If the type annotation has an unevaluated forward
+                reference.
+
+        Returns:
+            list[TypeArg]: Leaf-node types of the type annotation.
+        """
+        if self._type_args is None:
+            self._type_args = analyze_type_args(self.raw_type)
+        return self._type_args
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, FieldInfo):
             return NotImplemented
@@ -228,6 +275,15 @@ class ModelInfo(pydantic.BaseModel, Generic[_ModelType]):
 
     _raw_model: Optional[_ModelType] = pydantic.PrivateAttr(None)
 
+    def model_post_init(self, __context: Any) -> None:
+        self._link_fields()
+
+    def _link_fields(self) -> None:
+        """Private method to give each FieldInfo instance a reference to the fields mapping, so
+        that their raw types can be resolved together with one field extraction."""
+        for field_info in self.fields.values():
+            field_info._siblings = self.fields
+
     @classmethod
     def from_raw_model(cls, raw_model: _ModelType) -> Self:
         """Constructor method to create a new instance from a raw data model class.
@@ -408,7 +464,9 @@ class Edge(pydantic.BaseModel):
         Returns:
             Self: New instance of Edge.
         """
-        is_collection = is_collection_type_of(source_field_info.raw_type, target_model)
+        is_collection = any(
+            arg.is_collection for arg in source_field_info.type_args if arg.tp == target_model
+        )
         is_nullable = is_nullable_type(source_field_info.raw_type)
         cardinality = Cardinality.MANY if is_collection else Cardinality.ONE
         if is_nullable:
@@ -448,6 +506,168 @@ class Edge(pydantic.BaseModel):
         return self.source_cardinality.to_dot() + self.source_modality.to_dot()
 
 
+def _render_graph(graph: "pgv.AGraph", format: str, args: str = "") -> bytes:
+    """Lay out and render a graph with the Graphviz dot program, using the render cache."""
+    source = graph.string() if render_cache.enabled else ""
+    data = render_cache.get(source, format=format, prog="dot", args=args)
+    if data is None:
+        data = graph.draw(prog="dot", format=format, args=args)
+        render_cache.set(source, format=format, prog="dot", data=data, args=args)
+    return data
+
+
+def _render_graph_formats(graph: "pgv.AGraph", formats: Sequence[str]) -> Dict[str, bytes]:
+    """Lay out a graph once with the Graphviz dot program and render it in each of the given
+    formats, using the render cache."""
+    # Lazy import so that pygraphviz is only needed for layout and rendering
+    import pygraphviz.graphviz as gv  # type: ignore [import-untyped, import-not-found]
+
+    source = graph.string() if render_cache.enabled else ""
+    rendered: Dict[str, bytes] = {}
+    for format in formats:
+        if format not in rendered:
+            data = render_cache.get(source, format=format, prog="dot")
+            if data is not None:
+                rendered[format] = data
+    missing = [format for format in dict.fromkeys(formats) if format not in rendered]
+    if not missing:
+        return rendered
+
+    # Same calls as pygraphviz.AGraph.draw, but rendering multiple formats from one layout
+    gvc = gv.gvContextWithBuiltins()
+    try:
+        if gv.gvLayout(gvc, graph.handle, b"dot"):
+            raise ValueError("Graphviz raised a layout error.")
+        try:
+            for format in missing:
+                err, data = gv.gvRenderData(gvc, graph.handle, format.encode(graph.encoding))
+                if err:
+                    raise ValueError(f"Graphviz raised a render error for format '{format}'.")
+                rendered[format] = data
+                render_cache.set(source, format=format, prog="dot", data=data)
+        finally:
+            gv.gvFreeLayout(gvc, graph.handle)
+    finally:
+        gv.gvFreeContext(gvc)
+    return rendered
+
+
+def _infer_format(out: Union[str, os.PathLike]) -> str:
+    """Infer output format from file extension the same way as pygraphviz.AGraph.draw."""
+    return os.path.splitext(out)[-1].lower()[1:] or "dot"
+
+
+class _SearchFrame(NamedTuple):
+    """Stack frame for the depth-first search of models in EntityRelationshipDiagram."""
+
+    model_info: ModelInfo
+    field_args: Iterator[Tuple[FieldInfo, Any]]
+    depth: int
+    source: Optional[Tuple[type, FieldInfo]]
+    """Target model and source field of the edge to add once this frame is done."""
+
+
+def _check_direction(direction: str) -> None:
+    if direction not in ("out", "in", "both"):
+        raise ValueError(f"direction must be 'out', 'in', or 'both', not {direction!r}")
+
+
+_edge_dict_versions = itertools.count(1)
+"""Source of version numbers for _EdgeDict. Versions are unique across all instances, so an index
+can never match a different or copied instance's version."""
+
+
+class _EdgeDict(SortedDict):
+    """SortedDict that takes a new version number whenever it is changed, so that the adjacency
+    indexes of an EntityRelationshipDiagram can tell in constant time whether its edges were
+    changed without updating them."""
+
+    _version = 0
+
+    def __setitem__(self, key, value):
+        self._version = next(_edge_dict_versions)
+        super().__setitem__(key, value)
+
+    _setitem = __setitem__
+
+    def __delitem__(self, key):
+        self._version = next(_edge_dict_versions)
+        super().__delitem__(key)
+
+    def clear(self):
+        self._version = next(_edge_dict_versions)
+        super().clear()
+
+    def pop(self, key, *args):
+        self._version = next(_edge_dict_versions)
+        return super().pop(key, *args)
+
+    def popitem(self, index=-1):
+        self._version = next(_edge_dict_versions)
+        return super().popitem(index)
+
+    def setdefault(self, key, default=None):
+        self._version = next(_edge_dict_versions)
+        return super().setdefault(key, default)
+
+    def _update(self, *args, **kwargs):
+        self._version = next(_edge_dict_versions)
+        super()._update(*args, **kwargs)
+
+    update = _update
+
+    def __repr__(self) -> str:
+        # Display like the SortedDict that the edges field is declared as
+        return f"SortedDict({dict(self.items())!r})"
+
+    # IPython uses a class's own __repr__ over inherited pretty printing methods
+    _repr_pretty_ = sorteddict_repr_pretty
+
+
+class _EdgeIndex:
+    """Forward and reverse adjacency indexes for the edges of an EntityRelationshipDiagram, from
+    each model key to the keys of the edges from and to that model."""
+
+    def __init__(self, edges: Mapping[str, Edge]):
+        self.edges = edges
+        self.outgoing: Dict[str, Set[str]] = {}
+        self.incoming: Dict[str, Set[str]] = {}
+        for key, edge in edges.items():
+            self.add(key, edge)
+        self.version = getattr(edges, "_version", 0)
+
+    def __reduce__(self):
+        # Copied and unpickled diagrams rebuild their indexes rather than trusting copied versions
+        return (_EdgeIndex, ({},))
+
+    def is_current(self, edges: Mapping[str, Edge]) -> bool:
+        """Whether this index is for the given edges mapping and the mapping was not changed since
+        the index was last updated. Mappings other than _EdgeDict, e.g., a mapping assigned to a
+        diagram directly, cannot be tracked, so their indexes are never current."""
+        return (
+            self.edges is edges and isinstance(edges, _EdgeDict) and self.version == edges._version
+        )
+
+    def add(self, key: str, edge: Edge) -> None:
+        """Add an edge that was just added to the edges mapping."""
+        self.outgoing.setdefault(str(edge.source_model_full_name), set()).add(key)
+        self.incoming.setdefault(str(edge.target_model_full_name), set()).add(key)
+        self.version = getattr(self.edges, "_version", 0)
+
+    def remove(self, key: str, edge: Edge) -> None:
+        """Remove an edge that was just removed from the edges mapping."""
+        for index, model_key in (
+            (self.outgoing, str(edge.source_model_full_name)),
+            (self.incoming, str(edge.target_model_full_name)),
+        ):
+            edge_keys = index.get(model_key)
+            if edge_keys is not None:
+                edge_keys.discard(key)
+                if not edge_keys:
+                    del index[model_key]
+        self.version = getattr(self.edges, "_version", 0)
+
+
 DEFAULT_GRAPH_ATTR = (
     ("nodesep", "0.5"),
     ("ranksep", "1.5"),
@@ -488,6 +708,26 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
         validate_default=True,
     )
 
+    _edge_index: Optional[_EdgeIndex] = pydantic.PrivateAttr(None)
+    """Adjacency indexes of edges by model. Built on first use by the edge query and incremental
+    update methods, and kept up to date as edges are added or removed by diagram methods. It is
+    rebuilt if `edges` is replaced or changed otherwise, e.g., when it is modified directly."""
+
+    @pydantic.field_validator("edges")
+    @classmethod
+    def _track_edge_changes(cls, edges: SortedDict) -> SortedDict:
+        """Store edges in an _EdgeDict, which lets the adjacency indexes detect changes."""
+        return edges if isinstance(edges, _EdgeDict) else _EdgeDict(edges)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, EntityRelationshipDiagram):
+            return NotImplemented
+        # Don't compare private attributes, which only hold indexes
+        return type(self) is type(other) and (self.models, self.edges) == (
+            other.models,
+            other.edges,
+        )
+
     @property
     def _model_info_cls(self) -> Type[ModelInfo]:
         """Returns the model info class used by this diagram class. For the normal
@@ -504,65 +744,210 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
         args = get_args(annotation)
         return args[1]
 
-    def _add_if_model(self, model: type, recurse: bool) -> bool:
-        """Private recursive method to add a model to the diagram."""
+    def _add_if_model(self, model: type, recurse: bool, max_depth: Optional[int] = None) -> bool:
+        """Private method to add a model to the diagram, and to search its fields for other models
+        if recurse is True. The search is a depth-first traversal that uses an explicit stack
+        rather than recursive calls, so it runs in bounded stack space regardless of how deep the
+        composition graph is. Models and edges are added in the same order as a recursive
+        depth-first traversal would add them.
+
+        Returns:
+            bool: Whether the given object is a data model class.
+        """
+        is_model, model_info = self._try_add_model(model)
+        if model_info is None or not recurse or max_depth == 0:
+            return is_model
+
+        # Smallest depth at which each model added by this search was reached. With a depth limit,
+        # a model that is reached again via a shorter path is searched again, since models that
+        # were beyond the limit on the longer path may be within it now.
+        depths: Dict[str, int] = {model_info.key: 0}
+        stack = [_SearchFrame(model_info, self._iter_field_args(model_info), 0, None)]
+        while stack:
+            frame = stack[-1]
+            try:
+                field_info, arg = next(frame.field_args)
+            except StopIteration:
+                # Done searching this model, so add the edge from the field that referenced it
+                stack.pop()
+                if frame.source is not None:
+                    self._add_edge(*frame.source)
+                continue
+
+            is_model, arg_model_info = self._try_add_model(arg)
+            if not is_model:
+                continue
+            depth = frame.depth + 1
+            if arg_model_info is None and max_depth is not None:
+                # Model already exists. Search it again only if this search reached it before via
+                # a longer path.
+                key = str(FullyQualifiedName.from_object(arg))
+                if key in depths and depth < depths[key]:
+                    arg_model_info = self.models[key]
+            if arg_model_info is not None:
+                depths[arg_model_info.key] = depth
+            if arg_model_info is not None and (max_depth is None or depth < max_depth):
+                stack.append(
+                    _SearchFrame(
+                        arg_model_info,
+                        self._iter_field_args(arg_model_info),
+                        depth,
+                        (arg, field_info),
+                    )
+                )
+            else:
+                self._add_edge(arg, field_info)
+        return True
+
+    @staticmethod
+    def _model_key(model: Any) -> Optional[str]:
+        """Private method that returns the key for a model class, or None if the object cannot be
+        a model class."""
         try:
-            key = str(FullyQualifiedName.from_object(model))
+            return str(FullyQualifiedName.from_object(model))
         except AttributeError as e:
             # May get typing special forms that don't have __qualname__ attribute
             # These are not going to be models
             if "__qualname__" in str(e):
-                return False
+                return None
             # ellipsis object (used for example in tuple[int, ...]) don't have __module__ attribute
             # This is also not going to be a model
             elif "__module__" in str(e):
-                return False
+                return None
             raise
-        if key not in self.models:
+
+    def _try_add_model(self, model: type) -> Tuple[bool, Optional[ModelInfo]]:
+        """Private method to add a single model to the diagram without searching its fields.
+
+        Returns:
+            tuple[bool, ModelInfo | None]: Whether the given object is a data model class, and the
+                ModelInfo instance if it was newly added to the diagram.
+        """
+        key = self._model_key(model)
+        if key is None:
+            return False, None
+        if key in self.models:
+            logger.debug("Model '%s' already exists in diagram.", key)
+            return True, None
+        model_info = model_info_cache.get(model, self._model_info_cls)
+        if model_info is None:
             try:
                 model_info = self._model_info_cls.from_raw_model(model)
-                self.models[key] = model_info
-                logger.debug("Successfully added model '%s'.", key)
-                if recurse:
-                    logger.debug("Searching fields of '%s' for other models...", key)
-                    for field_info in model_info.fields.values():
-                        logger.debug(
-                            "Analyzing model '%s' field '%s' of type '%s'...",
-                            key,
-                            field_info.name,
-                            field_info.type_name,
-                        )
-                        try:
-                            for arg in get_recursive_args(field_info.raw_type):
-                                is_model = self._add_if_model(arg, recurse=recurse)
-                                if is_model:
-                                    edge = self._edge_cls.from_field_info(arg, field_info)
-                                    self.edges[edge.key] = edge
-                                    logger.debug(
-                                        "Added edge from model '%s' field '%s' to model '%s'.",
-                                        edge.source_model_full_name,
-                                        edge.source_field_name,
-                                        edge.target_model_full_name,
-                                    )
-                        except _UnevaluatedForwardRefError as e:
-                            raise UnevaluatedForwardRefError(
-                                model_full_name=model_info.full_name,
-                                field_name=field_info.name,
-                                forward_ref=e.forward_ref,
-                            )
             except UnknownModelTypeError:
-                return False
+                return False, None
+            model_info_cache.set(model, model_info)
         else:
-            logger.debug("Model '%s' already exists in diagram.", key)
-        return True
+            logger.debug("Using cached analysis of model '%s'.", key)
+        self.models[key] = model_info
+        logger.debug("Successfully added model '%s'.", key)
+        return True, model_info
+
+    def _iter_field_args(self, model_info: ModelInfo) -> Iterator[Tuple[FieldInfo, Any]]:
+        """Private generator that yields each field of a model together with each leaf type in
+        that field's type annotation."""
+        logger.debug("Searching fields of '%s' for other models...", model_info.key)
+        for field_info in model_info.fields.values():
+            logger.debug(
+                "Analyzing model '%s' field '%s' of type '%s'...",
+                model_info.key,
+                field_info.name,
+                field_info.type_name,
+            )
+            try:
+                type_args = field_info.type_args
+            except _UnevaluatedForwardRefError as e:
+                raise UnevaluatedForwardRefError(
+                    model_full_name=model_info.full_name,
+                    field_name=field_info.name,
+                    forward_ref=e.forward_ref,
+                )
+            for type_arg in type_args:
+                yield field_info, type_arg.tp
+
+    def _add_edge(self, target_model: type, source_field_info: FieldInfo) -> None:
+        """Private method to add an edge from a model's field to a target model."""
+        edge = self._edge_cls.from_field_info(target_model, source_field_info)
+        self._set_edge(edge)
+        logger.debug(
+            "Added edge from model '%s' field '%s' to model '%s'.",
+            edge.source_model_full_name,
+            edge.source_field_name,
+            edge.target_model_full_name,
+        )
+
+    def _set_edge(self, edge: Edge) -> None:
+        """Private method to add an edge to the diagram and to the adjacency indexes."""
+        index = self._current_edge_index()
+        self.edges[edge.key] = edge
+        if index is not None:
+            index.add(edge.key, edge)
+
+    def _remove_edge(self, key: str) -> Edge:
+        """Private method to remove an edge from the diagram and from the adjacency indexes."""
+        index = self._current_edge_index()
+        edge = self.edges.pop(key)
+        if index is not None:
+            index.remove(key, edge)
+        return edge
+
+    def _current_edge_index(self) -> Optional[_EdgeIndex]:
+        """Private method that returns the adjacency indexes if they are up to date, or discards
+        them so that they are rebuilt on next use."""
+        if self._edge_index is not None and not self._edge_index.is_current(self.edges):
+            self._edge_index = None
+        return self._edge_index
+
+    def _get_edge_index(self) -> _EdgeIndex:
+        """Private method that returns the adjacency indexes, rebuilding them if the edges were
+        changed without using diagram methods."""
+        if self._edge_index is None or not self._edge_index.is_current(self.edges):
+            self._edge_index = _EdgeIndex(self.edges)
+        return self._edge_index
+
+    def _incoming_edge_keys(self, key: str) -> List[str]:
+        """Private method that returns the keys of the edges whose target is the given model."""
+        edge_keys = self._get_edge_index().incoming.get(key, ())
+        return [edge_key for edge_key in sorted(edge_keys) if edge_key in self.edges]
+
+    def _outgoing_edge_keys(self, key: str) -> List[str]:
+        """Private method that returns the keys of the edges whose source is the given model."""
+        edge_keys = self._get_edge_index().outgoing.get(key, ())
+        return [edge_key for edge_key in sorted(edge_keys) if edge_key in self.edges]
+
+    def _resolve_model_key(self, model: Union[type, str]) -> str:
+        """Private method that returns the key of a model in the diagram, given the model class or
+        its key."""
+        key = model if isinstance(model, str) else self._model_key(model)
+        if key is None or key not in self.models:
+            raise ModelNotInDiagramError(key=str(key if key is not None else model))
+        return key
+
+    def _add_outgoing_edges(
+        self, model_info: ModelInfo, recurse: bool, max_depth: Optional[int]
+    ) -> None:
+        """Private method to add the edges from a model's fields, adding the models they reference
+        if recurse is True."""
+        for field_info, arg in self._iter_field_args(model_info):
+            if recurse and max_depth != 0:
+                is_model = self._add_if_model(
+                    arg, recurse=True, max_depth=None if max_depth is None else max_depth - 1
+                )
+            else:
+                is_model = self._model_key(arg) in self.models
+            if is_model:
+                self._add_edge(arg, field_info)
 
-    def add_model(self, model: type, recurse=True):
+    def add_model(self, model: type, recurse=True, max_depth: Optional[int] = None):
         """Add a data model class to the diagram.
 
         Args:
             model (type): Data model class to add to the diagram.
             recurse (bool, optional): Whether to recursively add models referenced by fields of
                 the given model. Defaults to True.
+            max_depth (int | None, optional): Maximum number of relationships to follow from the
+                given model when recursively adding models. Models at the maximum depth are added
+                to the diagram, but their fields are not searched. Defaults to None, which does
+                not limit the depth.
 
         Raises:
             UnknownModelTypeError: If the model is not recognized as a data model class type that
@@ -571,9 +956,245 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
                 automatically resolved.
         """
         logger.info("Adding model '%s' to diagram...", typenames(model))
-        is_model = self._add_if_model(model, recurse=recurse)
+        is_model = self._add_if_model(model, recurse=recurse, max_depth=max_depth)
         if not is_model:
             raise UnknownModelTypeError(model=model, available_plugins=list_plugins())
+        cache_info = type_name_cache.cache_info()
+        logger.debug(
+            "Type name cache hit rate: %.1f%% (%s)", 100 * cache_info.hit_rate, cache_info
+        )
+
+    def edges_from(self, model: Union[type, str]) -> List[Edge]:
+        """Return the edges from a model's fields to the models that they reference. Uses an
+        adjacency index, so the cost is proportional to the number of edges returned.
+
+        Args:
+            model (type | str): Data model class, or its fully qualified name.
+
+        Raises:
+            ModelNotInDiagramError: If the model is not in the diagram.
+
+        Returns:
+            list[Edge]: Edges whose source is the model, sorted by key.
+        """
+        key = self._resolve_model_key(model)
+        return [self.edges[edge_key] for edge_key in self._outgoing_edge_keys(key)]
+
+    def edges_to(self, model: Union[type, str]) -> List[Edge]:
+        """Return the edges from other models' fields that reference a model. Uses an adjacency
+        index, so the cost is proportional to the number of edges returned.
+
+        Args:
+            model (type | str): Data model class, or its fully qualified name.
+
+        Raises:
+            ModelNotInDiagramError: If the model is not in the diagram.
+
+        Returns:
+            list[Edge]: Edges whose target is the model, sorted by key.
+        """
+        key = self._resolve_model_key(model)
+        return [self.edges[edge_key] for edge_key in self._incoming_edge_keys(key)]
+
+    def neighbors(
+        self,
+        model: Union[type, str],
+        direction: Literal["out", "in", "both"] = "both",
+    ) -> List[str]:
+        """Return the models that are connected to a model by an edge. A model that references
+        itself is its own neighbor.
+
+        Args:
+            model (type | str): Data model class, or its fully qualified name.
+            direction (Literal["out", "in", "both"], optional): Which edges to follow: "out" for
+                models that this model references, "in" for models that reference this model, or
+                "both". Defaults to "both".
+
+        Raises:
+            ModelNotInDiagramError: If the model is not in the diagram.
+            ValueError: If direction is not a valid value.
+
+        Returns:
+            list[str]: Sorted keys of the neighboring models.
+        """
+        _check_direction(direction)
+        key = self._resolve_model_key(model)
+        neighbor_keys = set()
+        if direction in ("out", "both"):
+            for edge_key in self._outgoing_edge_keys(key):
+                neighbor_keys.add(str(self.edges[edge_key].target_model_full_name))
+        if direction in ("in", "both"):
+            for edge_key in self._incoming_edge_keys(key):
+                neighbor_keys.add(str(self.edges[edge_key].source_model_full_name))
+        return sorted(neighbor_keys)
+
+    def subgraph(
+        self,
+        roots: Union[type, str, Collection[Union[type, str]]],
+        depth: Optional[int] = None,
+        direction: Literal["out", "in", "both"] = "out",
+    ) -> Self:
+        """Return a new diagram with only the models within a number of relationships of the given
+        root models, and the edges between them. Models are not analyzed again, so this is a fast
+        way to render focused views of a large diagram. The new diagram shares ModelInfo and Edge
+        instances with this diagram.
+
+        Args:
+            roots (type | str | Collection[type | str]): Data model classes to start from, or
+                their fully qualified names.
+            depth (int | None, optional): Maximum number of relationships to follow from the root
+                models. Defaults to None, which does not limit the depth.
+            direction (Literal["out", "in", "both"], optional): Which edges to follow: "out" for
+                models that are referenced by the root models, "in" for models that reference the
+                root models, or "both". Defaults to "out".
+
+        Raises:
+            ModelNotInDiagramError: If a root model is not in the diagram.
+            ValueError: If direction is not a valid value.
+
+        Returns:
+            Self: New diagram of the same class as this diagram.
+        """
+        _check_direction(direction)
+        if isinstance(roots, (type, str)):
+            roots = [roots]
+        frontier = sorted({self._resolve_model_key(root) for root in roots})
+        selected = set(frontier)
+        level = 0
+        while frontier and (depth is None or level < depth):
+            next_frontier = []
+            for key in frontier:
+                for neighbor_key in self.neighbors(key, direction=direction):
+                    if neighbor_key not in selected and neighbor_key in self.models:
+                        selected.add(neighbor_key)
+                        next_frontier.append(neighbor_key)
+            frontier = next_frontier
+            level += 1
+
+        diagram = type(self)()
+        for key in selected:
+            diagram.models[key] = self.models[key]
+        for key in selected:
+            for edge_key in self._outgoing_edge_keys(key):
+                edge = self.edges[edge_key]
+                if str(edge.target_model_full_name) in selected:
+                    diagram.edges[edge_key] = edge
+        logger.debug(
+            "Extracted subgraph with %d of %d models and %d of %d edges.",
+            len(diagram.models),
+            len(self.models),
+            len(diagram.edges),
+            len(self.edges),
+        )
+        return diagram
+
+    def remove_model(self, model: Union[type, str]) -> ModelInfo:
+        """Remove a data model class from the diagram, together with the edges from its fields and
+        the edges from other models' fields that reference it. Models that it references are kept.
+        Only the model's own edges are visited, so the cost does not depend on the size of the
+        rest of the diagram.
+
+        Args:
+            model (type | str): Data model class to remove, or its fully qualified name.
+
+        Raises:
+            ModelNotInDiagramError: If the model is not in the diagram.
+
+        Returns:
+            ModelInfo: The removed ModelInfo instance.
+        """
+        key = self._resolve_model_key(model)
+        logger.info("Removing model '%s' from diagram...", key)
+        for edge_key in self._outgoing_edge_keys(key) + self._incoming_edge_keys(key):
+            if edge_key in self.edges:
+                self._remove_edge(edge_key)
+        return self.models.pop(key)
+
+    def refresh_model(
+        self, model: Union[type, str], recurse=True, max_depth: Optional[int] = None
+    ) -> None:
+        """Analyze a data model class in the diagram again, e.g., after it has been changed or its
+        module has been reloaded, and update the edges from its fields. Edges from other models
+        that reference it are kept. Models that it no longer references are kept in the diagram.
+
+        Args:
+            model (type | str): Data model class to refresh, or its fully qualified name. If a
+                name is given, the class is imported again.
+            recurse (bool, optional): Whether to recursively add models newly referenced by fields
+                of the model. If False, only edges to models already in the diagram are added.
+                Defaults to True.
+            max_depth (int | None, optional): Maximum number of relationships to follow from the
+                model when recursively adding models. Defaults to None, which does not limit the
+                depth.
+
+        Raises:
+            ModelNotInDiagramError: If the model is not in the diagram.
+            UnknownModelTypeError: If the model is not recognized as a data model class type that
+                is supported by registered plugins.
+        """
+        key = self._resolve_model_key(model)
+        raw_model = (
+            model if isinstance(model, type) else self.models[key].full_name.import_object()
+        )
+        logger.info("Refreshing model '%s' in diagram...", key)
+        # Analyze without the model info cache in case the model changed
+        model_info = self._model_info_cls.from_raw_model(raw_model)
+        model_info_cache.set(raw_model, model_info)
+        self._set_model(model_info, recurse=recurse, max_depth=max_depth)
+
+    def replace_model(
+        self,
+        old_model: Union[type, str],
+        new_model: type,
+        recurse=True,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        """Replace a data model class in the diagram with another one. Edges from the old model's
+        fields are replaced by edges from the new model's fields, and edges from other models that
+        referenced the old model are redirected to the new model.
+
+        Args:
+            old_model (type | str): Data model class to replace, or its fully qualified name.
+            new_model (type): Data model class to replace it with.
+            recurse (bool, optional): Whether to recursively add models referenced by fields of
+                the new model. If False, only edges to models already in the diagram are added.
+                Defaults to True.
+            max_depth (int | None, optional): Maximum number of relationships to follow from the
+                new model when recursively adding models. Defaults to None, which does not limit
+                the depth.
+
+        Raises:
+            ModelNotInDiagramError: If the old model is not in the diagram.
+            UnknownModelTypeError: If the new model is not recognized as a data model class type
+                that is supported by registered plugins.
+        """
+        old_key = self._resolve_model_key(old_model)
+        new_key = self._model_key(new_model)
+        if new_key is None:
+            raise UnknownModelTypeError(model=new_model, available_plugins=list_plugins())
+        logger.info("Replacing model '%s' with '%s' in diagram...", old_key, new_key)
+        # Analyze the new model first so that the diagram is unchanged if it is not a model
+        new_model_info = self._model_info_cls.from_raw_model(new_model)
+        model_info_cache.set(new_model, new_model_info)
+        incoming = [
+            self.edges[edge_key]
+            for edge_key in self._incoming_edge_keys(old_key)
+            if str(self.edges[edge_key].source_model_full_name) != old_key
+        ]
+        self.remove_model(old_key)
+        for edge in incoming:
+            self._set_edge(
+                edge.model_copy(update={"target_model_full_name": new_model_info.full_name})
+            )
+        self._set_model(new_model_info, recurse=recurse, max_depth=max_depth)
+
+    def _set_model(self, model_info: ModelInfo, recurse: bool, max_depth: Optional[int]) -> None:
+        """Private method to add or replace a model's ModelInfo instance and replace the edges
+        from its fields."""
+        for edge_key in self._outgoing_edge_keys(model_info.key):
+            self._remove_edge(edge_key)
+        self.models[model_info.key] = model_info
+        self._add_outgoing_edges(model_info, recurse=recurse, max_depth=max_depth)
 
     def draw(
         self,
@@ -585,7 +1206,8 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
     ):
         """Render entity relationship diagram for given data model classes to file. The file format
         can be inferred from the file extension. Typical formats include '.png', '.svg', and
-        '.pdf'.
+        '.pdf'. If the [render cache][erdantic.caching.RenderCache] is enabled, previously rendered
+        output for an unchanged diagram is reused.
 
         Args:
             out (str | os.PathLike): Output file path for rendered diagram.
@@ -599,18 +1221,59 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
                 [`pygraphviz.AGraph.draw`][pygraphviz.AGraph.draw].
         """
         logger.info("Rendering diagram to %s", out)
-        self.to_graphviz(
+        graph = self.to_graphviz(
             graph_attr=graph_attr,
             node_attr=node_attr,
             edge_attr=edge_attr,
-        ).draw(out, prog="dot", **kwargs)
+        )
+        if not render_cache.enabled:
+            graph.draw(out, prog="dot", **kwargs)
+            return
+        format = kwargs.pop("format", None) or _infer_format(out)
+        data = _render_graph(graph, format=format, **kwargs)
+        with open(out, "wb") as fp:
+            fp.write(data)
+
+    def draw_many(
+        self,
+        outputs: Sequence[Union[str, os.PathLike]],
+        graph_attr: Optional[Mapping[str, Any]] = None,
+        node_attr: Optional[Mapping[str, Any]] = None,
+        edge_attr: Optional[Mapping[str, Any]] = None,
+    ):
+        """Render entity relationship diagram for given data model classes to multiple files,
+        e.g., in different formats. The Graphviz layout is run only once, and every file is
+        rendered from that layout. The file format of each output is inferred from its file
+        extension. The output is the same as calling
+        [`draw`][erdantic.core.EntityRelationshipDiagram.draw] for each file.
+
+        Args:
+            outputs (Sequence[str | os.PathLike]): Output file paths for rendered diagram.
+            graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes on
+                the `pygraphviz.AGraph` instance. Defaults to None.
+            node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+                nodes on the `pygraphviz.AGraph` instance. Defaults to None.
+            edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+                edges on the `pygraphviz.AGraph` instance. Defaults to None.
+        """
+        logger.info("Rendering diagram to %s", ", ".join(str(out) for out in outputs))
+        graph = self.to_graphviz(
+            graph_attr=graph_attr,
+            node_attr=node_attr,
+            edge_attr=edge_attr,
+        )
+        formats = [_infer_format(out) for out in outputs]
+        rendered = _render_graph_formats(graph, formats)
+        for out, format in zip(outputs, formats):
+            with open(out, "wb") as fp:
+                fp.write(rendered[format])
 
     def to_graphviz(
         self,
         graph_attr: Optional[Mapping[str, Any]] = None,
         node_attr: Optional[Mapping[str, Any]] = None,
         edge_attr: Optional[Mapping[str, Any]] = None,
-    ) -> pgv.AGraph:
+    ) -> "pgv.AGraph":
         """Return [`pygraphviz.AGraph`][pygraphviz.agraph.AGraph] instance for diagram.
 
         Args:
@@ -624,8 +1287,13 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
         Returns:
             pygraphviz.AGraph: graph object for diagram
         """
+        # Lazy import so that pygraphviz is only needed for layout and rendering
+        import pygraphviz as pgv  # type: ignore [import-untyped, import-not-found]
+
+        from erdantic.dot import GRAPH_NAME
+
         g = pgv.AGraph(
-            name="Entity Relationship Diagram created by erdantic",
+            name=GRAPH_NAME,
             directed=True,
             strict=False,
         )
@@ -659,24 +1327,57 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
         edge_attr: Optional[Mapping[str, Any]] = None,
     ) -> str:
         """Generate Graphviz [DOT language](https://graphviz.org/doc/info/lang.html) representation
-        of entity relationship diagram for given data model classes.
+        of entity relationship diagram for given data model classes. The DOT code is written in
+        pure Python by [`render_dot`][erdantic.dot.render_dot] and is equivalent to the graph from
+        [`to_graphviz`][erdantic.core.EntityRelationshipDiagram.to_graphviz], so pygraphviz is not
+        needed.
 
         Args:
-            graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes on
-                the `pygraphviz.AGraph` instance. Defaults to None.
+            graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes.
+                Defaults to None.
             node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
-                nodes on the `pygraphviz.AGraph` instance. Defaults to None.
+                nodes. Defaults to None.
             edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
-                edges on the `pygraphviz.AGraph` instance. Defaults to None.
+                edges. Defaults to None.
 
         Returns:
             str: DOT language representation of diagram
         """
-        return self.to_graphviz(
+        # Lazy import to avoid a circular import: the DOT writer refers back to core types.
+        from erdantic.dot import render_dot
+
+        return render_dot(
+            self,
             graph_attr=graph_attr,
             node_attr=node_attr,
             edge_attr=edge_attr,
-        ).string()
+        )
+
+    def write_dot(
+        self,
+        fp: TextIO,
+        graph_attr: Optional[Mapping[str, Any]] = None,
+        node_attr: Optional[Mapping[str, Any]] = None,
+        edge_attr: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """Write Graphviz [DOT language](https://graphviz.org/doc/info/lang.html) representation
+        of entity relationship diagram to a text file-like object. The output is the same as
+        [`to_dot`][erdantic.core.EntityRelationshipDiagram.to_dot], but it is written
+        incrementally rather than built as one string.
+
+        Args:
+            fp (TextIO): Text file-like object to write to, e.g., an open file or `sys.stdout`.
+            graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes.
+                Defaults to None.
+            node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+                nodes. Defaults to None.
+            edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+                edges. Defaults to None.
+        """
+        # Lazy import to avoid a circular import: the DOT writer refers back to core types.
+        from erdantic.dot import write_dot
+
+        write_dot(self, fp, graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr)
 
     def to_d2(self) -> str:
         """Generate D2 class diagram representation of the entity relationship diagram.
@@ -691,6 +1392,20 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
 
         return render_d2(self)
 
+    def write_d2(self, fp: TextIO) -> None:
+        """Write D2 class diagram representation of the entity relationship diagram to a text
+        file-like object. The output is the same as
+        [`to_d2`][erdantic.core.EntityRelationshipDiagram.to_d2], but it is written incrementally
+        rather than built as one string.
+
+        Args:
+            fp (TextIO): Text file-like object to write to, e.g., an open file or `sys.stdout`.
+        """
+        # Lazy import to avoid a circular import: the D2 renderer refers back to core types.
+        from erdantic.d2 import write_d2
+
+        write_d2(self, fp)
+
     def _repr_pretty_(self, p, cycle):
         """IPython special method to pretty-print an object."""
         try:
@@ -719,13 +1434,12 @@ class EntityRelationshipDiagram(pydantic.BaseModel):
 
     def _repr_png_(self) -> bytes:
         """IPython special method to display object as a PNG image."""
-        graph = self.to_graphviz()
-        return graph.draw(prog="dot", format="png")
+        return _render_graph(self.to_graphviz(), format="png")
 
     def _repr_svg_(self) -> str:
         """IPython special method to display object as an SVG image."""
         graph = self.to_graphviz()
-        return graph.draw(prog="dot", format="svg").decode(graph.encoding)
+        return _render_graph(graph, format="svg").decode(graph.encoding)
 
     def __rich_repr__(self):
         """Rich special method to format the representation of an object."""
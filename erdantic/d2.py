@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from textwrap import dedent, indent
+from typing import Iterator, TextIO
 
 from erdantic.core import Cardinality, EntityRelationshipDiagram, Modality
 
@@ -57,7 +58,20 @@ _REL_DEF_TEMPLATE = dedent(
 
 def render_d2(diagram: EntityRelationshipDiagram) -> str:
     """Renders an EntityRelationshipDiagram into the D2 class diagram format."""
-    d2_parts: list[str] = []
+    return "".join(iter_d2(diagram))
+
+
+def write_d2(diagram: EntityRelationshipDiagram, fp: TextIO) -> None:
+    """Writes the D2 class diagram representation of an EntityRelationshipDiagram to a text
+    file-like object incrementally, one class or relationship at a time."""
+    for part in iter_d2(diagram):
+        fp.write(part)
+
+
+def iter_d2(diagram: EntityRelationshipDiagram) -> Iterator[str]:
+    """Generates the D2 class diagram representation of an EntityRelationshipDiagram one class or
+    relationship at a time. Joining the parts gives the same result as `render_d2`."""
+    separator = ""
 
     # Define all class shapes first
     for model in diagram.models.values():
@@ -73,41 +87,40 @@ def render_d2(diagram: EntityRelationshipDiagram) -> str:
                 class_def.append(f"  {visibility}{field.name}: {field_type}")
 
         class_def.append("}\n")
-        d2_parts.append("\n".join(class_def))
-
-    # Define all relationships between classes
-    for edge in diagram.edges.values():
-        source_model = diagram.models.get(str(edge.source_model_full_name))
-        target_model = diagram.models.get(str(edge.target_model_full_name))
-        if not source_model or not target_model:
-            continue
+        yield separator + "\n".join(class_def)
+        separator = "\n"
 
+    # Define all relationships between classes. Going through each model's outgoing edges gives
+    # the same order as the edges mapping, since edge keys start with the source model key.
+    for source_key, source_model in diagram.models.items():
         source_model_name = _quote_identifier(source_model.name)
-        target_model_name = _quote_identifier(target_model.name)
-        label = _quote_identifier(edge.source_field_name)
+        for edge in diagram.edges_from(source_key):
+            target_model = diagram.models.get(str(edge.target_model_full_name))
+            if not target_model:
+                continue
+
+            target_model_name = _quote_identifier(target_model.name)
+            label = _quote_identifier(edge.source_field_name)
 
-        connection = "->"  # Directed from source to target
+            connection = "->"  # Directed from source to target
 
-        target_shape = _get_crowsfoot_d2(edge.target_cardinality, edge.target_modality)
-        attributes = [f"target-arrowhead.shape: {target_shape}"]
+            target_shape = _get_crowsfoot_d2(edge.target_cardinality, edge.target_modality)
+            attributes = [f"target-arrowhead.shape: {target_shape}"]
 
-        # Source side: omit entirely when both are UNSPECIFIED. Otherwise, map and include.
-        if not (
-            edge.source_cardinality == Cardinality.UNSPECIFIED
-            and edge.source_modality == Modality.UNSPECIFIED
-        ):
-            source_shape = _get_crowsfoot_d2(edge.source_cardinality, edge.source_modality)
-            attributes.append(f"source-arrowhead.shape: {source_shape}")
-            connection = "<->"  # Bidirectional if source side is specified
+            # Source side: omit entirely when both are UNSPECIFIED. Otherwise, map and include.
+            if not (
+                edge.source_cardinality == Cardinality.UNSPECIFIED
+                and edge.source_modality == Modality.UNSPECIFIED
+            ):
+                source_shape = _get_crowsfoot_d2(edge.source_cardinality, edge.source_modality)
+                attributes.append(f"source-arrowhead.shape: {source_shape}")
+                connection = "<->"  # Bidirectional if source side is specified
 
-        d2_parts.append(
-            _REL_DEF_TEMPLATE.format(
+            yield separator + _REL_DEF_TEMPLATE.format(
                 source_model_name=source_model_name,
                 connection=connection,
                 target_model_name=target_model_name,
                 label=label,
                 attributes=indent("\n".join(attributes), " " * 2),
             )
-        )
-
-    return "\n".join(d2_parts)
+            separator = "\n"
@@ -0,0 +1,166 @@
+"""Pure-Python writer for the Graphviz [DOT language](https://graphviz.org/doc/info/lang.html).
+
+This produces DOT code equivalent to building a `pygraphviz.AGraph` with
+[`EntityRelationshipDiagram.to_graphviz`][erdantic.core.EntityRelationshipDiagram.to_graphviz]
+and calling its `string()` method, without needing pygraphviz or the Graphviz C library. It is
+used for DOT output, which does not need a layout.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional, TextIO
+
+if TYPE_CHECKING:
+    from erdantic.core import EntityRelationshipDiagram
+
+GRAPH_NAME = "Entity Relationship Diagram created by erdantic"
+"""Name of the DOT graph."""
+
+_ID_PATTERN = re.compile(
+    r"[A-Za-z_\x80-\uffff][A-Za-z0-9_\x80-\uffff]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?)"
+)
+_KEYWORDS = frozenset({"node", "edge", "graph", "digraph", "subgraph", "strict"})
+
+
+class _EscString(str):
+    """String that is already written in Graphviz's escString syntax, e.g., the default node label
+    `\\N`, so its backslashes are not escaped."""
+
+
+def quote_id(value: Any, html: bool = False) -> str:
+    """Return a value as a DOT ID. Values are converted to strings. Identifiers and numerals are
+    left unquoted, HTML strings (enclosed in `<` and `>`) are left as-is if `html` is true, and
+    all other values are quoted with backslashes and double quotes escaped.
+
+    Args:
+        value (Any): Value to convert to a DOT ID.
+        html (bool, optional): Whether a value enclosed in `<` and `>` is an HTML string. Like
+            pygraphviz, this is only the case for labels. Defaults to False.
+
+    Returns:
+        str: DOT ID
+    """
+    s = str(value)
+    if html and s.startswith("<") and s.endswith(">"):
+        return s
+    if _ID_PATTERN.fullmatch(s) and s.lower() not in _KEYWORDS:
+        return s
+    if not isinstance(value, _EscString):
+        s = s.replace("\\", "\\\\")
+    return '"' + s.replace('"', r"\"") + '"'
+
+
+def _attr_list(attrs: Iterable[tuple[str, Any]], sep: str = ",\n\t\t") -> str:
+    return sep.join(
+        f"{quote_id(key)}={quote_id(value, html=key == 'label')}" for key, value in attrs
+    )
+
+
+def _merge_attrs(
+    defaults: Iterable[tuple[str, Any]], overrides: Optional[Mapping[str, Any]]
+) -> list[tuple[str, Any]]:
+    merged = dict(defaults)
+    merged.update(overrides or {})
+    return sorted(merged.items())
+
+
+def iter_dot(
+    diagram: EntityRelationshipDiagram,
+    graph_attr: Optional[Mapping[str, Any]] = None,
+    node_attr: Optional[Mapping[str, Any]] = None,
+    edge_attr: Optional[Mapping[str, Any]] = None,
+) -> Iterator[str]:
+    """Generate the DOT language representation of an entity relationship diagram piece by piece.
+    Joining the pieces gives the same result as
+    [`render_dot`][erdantic.dot.render_dot].
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to render.
+        graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes. Defaults
+            to None.
+        node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+            nodes. Defaults to None.
+        edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+            edges. Defaults to None.
+
+    Yields:
+        str: DOT language code, one statement at a time.
+    """
+    # Lazy import to avoid a circular import: the DOT writer refers back to core types.
+    from erdantic.core import DEFAULT_EDGE_ATTR, DEFAULT_GRAPH_ATTR, DEFAULT_NODE_ATTR
+
+    yield f"digraph {quote_id(GRAPH_NAME)} {{\n"
+    graph_attrs = _merge_attrs(DEFAULT_GRAPH_ATTR, graph_attr)
+    if graph_attrs:
+        yield f"\tgraph [{_attr_list(graph_attrs)}\n\t];\n"
+    # Graphviz always includes the default node label, which is the node name
+    node_attrs = _merge_attrs((("label", _EscString(r"\N")), *DEFAULT_NODE_ATTR), node_attr)
+    yield f"\tnode [{_attr_list(node_attrs)}\n\t];\n"
+    edge_attrs = _merge_attrs(DEFAULT_EDGE_ATTR, edge_attr)
+    if edge_attrs:
+        yield f"\tedge [{_attr_list(edge_attrs)}];\n"
+    for full_name, model_info in diagram.models.items():
+        attrs = (
+            ("label", model_info.to_dot_label()),
+            ("tooltip", model_info.description.replace("\n", "&#xA;")),
+        )
+        yield f"\t{quote_id(full_name)}\t[{_attr_list(attrs)}];\n"
+    for edge in diagram.edges.values():
+        tail = f"{quote_id(edge.source_model_full_name)}:{quote_id(edge.source_field_name)}:e"
+        head = f"{quote_id(edge.target_model_full_name)}:_root:w"
+        attrs = (
+            ("arrowhead", edge.target_dot_arrow_shape()),
+            ("arrowtail", edge.source_dot_arrow_shape()),
+        )
+        yield f"\t{tail} -> {head}\t[{_attr_list(attrs)}];\n"
+    yield "}\n"
+
+
+def render_dot(
+    diagram: EntityRelationshipDiagram,
+    graph_attr: Optional[Mapping[str, Any]] = None,
+    node_attr: Optional[Mapping[str, Any]] = None,
+    edge_attr: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Renders an EntityRelationshipDiagram into the DOT language.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to render.
+        graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes. Defaults
+            to None.
+        node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+            nodes. Defaults to None.
+        edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+            edges. Defaults to None.
+
+    Returns:
+        str: DOT language representation of diagram
+    """
+    return "".join(
+        iter_dot(diagram, graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr)
+    )
+
+
+def write_dot(
+    diagram: EntityRelationshipDiagram,
+    fp: TextIO,
+    graph_attr: Optional[Mapping[str, Any]] = None,
+    node_attr: Optional[Mapping[str, Any]] = None,
+    edge_attr: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Writes the DOT language representation of an EntityRelationshipDiagram to a text file-like
+    object incrementally, one statement at a time, so the full output is never held in memory.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to render.
+        fp (TextIO): Text file-like object to write to.
+        graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes. Defaults
+            to None.
+        node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+            nodes. Defaults to None.
+        edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+            edges. Defaults to None.
+    """
+    for part in iter_dot(diagram, graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr):
+        fp.write(part)
@@ -26,6 +26,19 @@ class ModelOrModuleNotFoundError(ImportError, ErdanticException):
     """Raised when specified fully qualified name of model class or module cannot be imported."""
 
 
+class ModelNotInDiagramError(KeyError, ErdanticException):
+    """Raised when a specified model is not in an entity relationship diagram.
+
+    Attributes:
+        key (str): The fully qualified name of the model that was not found.
+    """
+
+    def __init__(self, *args: object, key: str) -> None:
+        self.key = key
+        message = f"Model not in diagram: '{key}'"
+        super().__init__(*args, message)
+
+
 class UnresolvableForwardRefError(NameError, ErdanticException):
     """Raised when a forward reference in a type annotation cannot be resolved automatically.
 
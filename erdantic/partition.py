@@ -0,0 +1,197 @@
+"""Split a large entity relationship diagram into smaller diagrams that can be laid out and
+rendered independently. Graphviz layout time grows faster than linearly with the size of a graph,
+so rendering many small diagrams in parallel is much faster than rendering one large diagram.
+"""
+
+import html
+import logging
+import os
+from pathlib import Path
+from typing import Any, Literal, Mapping, Optional, Union
+from urllib.parse import quote
+
+from erdantic.core import EntityRelationshipDiagram
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.html"
+"""Filename of the index page written by [`draw_partitioned`][erdantic.partition.draw_partitioned].
+"""
+
+
+def connected_components(diagram: EntityRelationshipDiagram) -> list[EntityRelationshipDiagram]:
+    """Split a diagram into its connected components, i.e., groups of models that are related to
+    each other directly or indirectly, ignoring the direction of relationships.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to split.
+
+    Returns:
+        list[EntityRelationshipDiagram]: Diagram for each connected component, ordered by the key
+            of the first model in each component.
+    """
+    components = []
+    seen: set[str] = set()
+    for key in diagram.models:
+        if key not in seen:
+            component = diagram.subgraph(key, direction="both")
+            seen.update(component.models)
+            components.append(component)
+    return components
+
+
+def partition(
+    diagram: EntityRelationshipDiagram,
+    by: Literal["component", "module"] = "component",
+    include_references: bool = True,
+) -> dict[str, EntityRelationshipDiagram]:
+    """Split a diagram into smaller diagrams, either by connected component or by the module that
+    defines each model.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to split.
+        by (Literal["component", "module"], optional): How to split the diagram. "component" gives
+            one diagram per connected component, named by the key of its first model. No
+            relationships are lost. "module" gives one diagram per module, named by the module
+            name. Defaults to "component".
+        include_references (bool, optional): When splitting by module, whether to also include
+            models from other modules that are referenced by the module's models, so that
+            relationships across modules are shown. Defaults to True.
+
+    Raises:
+        ValueError: If `by` is not a valid value.
+
+    Returns:
+        dict[str, EntityRelationshipDiagram]: Mapping of names to diagrams, sorted by name.
+    """
+    if by == "component":
+        return {
+            next(iter(component.models)): component for component in connected_components(diagram)
+        }
+    if by != "module":
+        raise ValueError(f"by must be 'component' or 'module', not {by!r}")
+
+    modules: dict[str, list[str]] = {}
+    for key, model_info in diagram.models.items():
+        modules.setdefault(model_info.full_name.module, []).append(key)
+    pieces = {}
+    for module, keys in sorted(modules.items()):
+        piece = type(diagram)()
+        for key in keys:
+            piece.models[key] = diagram.models[key]
+        for key in keys:
+            for edge in diagram.edges_from(key):
+                target_key = str(edge.target_model_full_name)
+                if target_key not in piece.models:
+                    if not include_references or target_key not in diagram.models:
+                        continue
+                    piece.models[target_key] = diagram.models[target_key]
+                piece.edges[edge.key] = edge
+        pieces[module] = piece
+    return pieces
+
+
+def draw_partitioned(
+    diagram: EntityRelationshipDiagram,
+    out_dir: Union[str, os.PathLike],
+    by: Literal["component", "module"] = "component",
+    format: str = "svg",
+    include_references: bool = True,
+    max_workers: Optional[int] = None,
+    graph_attr: Optional[Mapping[str, Any]] = None,
+    node_attr: Optional[Mapping[str, Any]] = None,
+    edge_attr: Optional[Mapping[str, Any]] = None,
+) -> dict[str, Path]:
+    """Split a diagram with [`partition`][erdantic.partition.partition] and render each piece to
+    its own file in a directory, using a pool of processes. Also writes an `index.html` page that
+    links to each file.
+
+    Pieces are pickled to send them to worker processes, so their data model classes must be
+    importable by name, i.e., not defined locally in a function. Use `max_workers=1` otherwise.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to split and render.
+        out_dir (str | os.PathLike): Output directory. Created if it does not exist.
+        by (Literal["component", "module"], optional): How to split the diagram. Defaults to
+            "component".
+        format (str, optional): Output file format, e.g., "svg" or "png". Defaults to "svg".
+        include_references (bool, optional): When splitting by module, whether to also include
+            referenced models from other modules. Defaults to True.
+        max_workers (int | None, optional): Maximum number of worker processes. If 1, pieces are
+            rendered in the current process. Defaults to None, which uses the number of
+            processors.
+        graph_attr (Mapping[str, Any] | None, optional): Override any graph attributes. Defaults
+            to None.
+        node_attr (Mapping[str, Any] | None, optional): Override any node attributes for all
+            nodes. Defaults to None.
+        edge_attr (Mapping[str, Any] | None, optional): Override any edge attributes for all
+            edges. Defaults to None.
+
+    Returns:
+        dict[str, Path]: Mapping of piece names to output file paths.
+    """
+    pieces = partition(diagram, by=by, include_references=include_references)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {name: out_dir / f"{name}.{format}" for name in pieces}
+    logger.info("Rendering %d diagrams to %s...", len(pieces), out_dir)
+    attrs = {"graph_attr": graph_attr, "node_attr": node_attr, "edge_attr": edge_attr}
+    if max_workers == 1 or len(pieces) <= 1:
+        for name, piece in pieces.items():
+            piece.draw(paths[name], format=format, **attrs)
+    else:
+        # Lazy import so that multiprocessing is only imported when it is used
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_draw_piece, piece, paths[name], format, attrs)
+                for name, piece in pieces.items()
+            ]
+            for future in futures:
+                future.result()
+    index_path = out_dir / INDEX_FILENAME
+    index_path.write_text(_render_index(pieces, paths), encoding="utf-8")
+    logger.info("Wrote index of diagrams to %s", index_path)
+    return paths
+
+
+def _draw_piece(
+    piece: EntityRelationshipDiagram, path: Path, format: str, attrs: Mapping[str, Any]
+) -> None:
+    """Render one piece of a partitioned diagram. Runs in worker processes."""
+    piece.draw(path, format=format, **attrs)
+
+
+def _render_index(
+    pieces: Mapping[str, EntityRelationshipDiagram], paths: Mapping[str, Path]
+) -> str:
+    """Render an HTML page that links to each rendered diagram and lists its models."""
+    items = []
+    for name, piece in pieces.items():
+        href = quote(paths[name].name)
+        model_names = ", ".join(
+            html.escape(model_info.name) for model_info in piece.models.values()
+        )
+        items.append(
+            f'    <li><a href="{href}">{html.escape(name)}</a> '
+            f"({len(piece.models)} models): {model_names}</li>"
+        )
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html lang="en">',
+            "<head>",
+            '  <meta charset="utf-8">',
+            "  <title>Entity Relationship Diagrams</title>",
+            "</head>",
+            "<body>",
+            "  <h1>Entity Relationship Diagrams</h1>",
+            "  <ul>",
+            *items,
+            "  </ul>",
+            "</body>",
+            "</html>",
+            "",
+        ]
+    )
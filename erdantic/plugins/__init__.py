@@ -1,7 +1,9 @@
-import importlib.metadata
+import importlib
 import logging
 import sys
-from typing import TYPE_CHECKING, Any, Optional, Protocol, Sequence, TypeVar
+import threading
+from typing import TYPE_CHECKING, Any, Collection, Optional, Protocol, Sequence, TypeVar
+import weakref
 
 if sys.version_info >= (3, 10):
     from typing import TypeGuard
@@ -25,21 +27,63 @@ CORE_PLUGINS: tuple[tuple[str, str], ...] = (
 )
 
 if sys.version_info < (3, 14):
-    CORE_PLUGINS += (("pydantic_v1", "erdantic.plugins.pydantic"),)
+    CORE_PLUGINS += (("pydantic_v1", "erdantic.plugins.pydantic_v1"),)
+
+_CORE_PLUGIN_FRAMEWORK_MODULES: dict[str, str] = {
+    "pydantic": "pydantic",
+    "attrs": "attr",
+    "dataclasses": "dataclasses",
+    "msgspec": "msgspec",
+    "pydantic_v1": "pydantic.v1",
+}
+"""Module of the data modeling framework supported by each core plugin. A class can only be a data
+model class of a framework if the framework's module has already been imported, so a core plugin
+is not needed until its framework module is in `sys.modules`."""
 
 _ModelType = TypeVar("_ModelType", bound=type)
 _ModelType_co = TypeVar("_ModelType_co", bound=type, covariant=True)
 _ModelType_contra = TypeVar("_ModelType_contra", bound=type, contravariant=True)
 
 
-def load_plugins():
-    for plugin, module in CORE_PLUGINS:
-        logger.debug("Loading plugin: %s", plugin)
-        try:
-            importlib.import_module(module)
-            logger.debug("Plugin successfully loaded: %s", plugin)
-        except ModuleNotFoundError:
-            logger.debug("Plugin dependencies not found. Skipping: %s", plugin)
+def load_plugins(lazy: bool = False):
+    """Load the core plugins.
+
+    Args:
+        lazy (bool, optional): If True, only load core plugins whose data modeling framework has
+            already been imported. The others are loaded once their framework is imported and
+            erdantic next needs to identify a model class, or when any function that looks up
+            plugins by key is called. This avoids importing frameworks that are not used. Defaults
+            to False, which loads all core plugins immediately.
+
+    Core plugins take precedence over other plugins, in the order of
+    [`CORE_PLUGINS`][erdantic.plugins.CORE_PLUGINS], regardless of the order in which they are
+    loaded. Loading is thread-safe.
+    """
+    with _plugin_lock:
+        for plugin, module in CORE_PLUGINS:
+            if plugin not in _dict:
+                _pending_plugins[plugin] = module
+        _load_pending_plugins(force=not lazy)
+
+
+def _load_plugin(plugin: str, module: str):
+    logger.debug("Loading plugin: %s", plugin)
+    try:
+        importlib.import_module(module)
+        logger.debug("Plugin successfully loaded: %s", plugin)
+    except ModuleNotFoundError:
+        logger.debug("Plugin dependencies not found. Skipping: %s", plugin)
+
+
+def _load_pending_plugins(force: bool = False):
+    """Load pending core plugins whose data modeling framework has been imported, or all pending
+    core plugins if force is True."""
+    if not _pending_plugins:
+        return
+    with _plugin_lock:
+        for plugin, module in list(_pending_plugins.items()):
+            if force or _CORE_PLUGIN_FRAMEWORK_MODULES[plugin] in sys.modules:
+                _load_pending_plugin(plugin)
 
 
 class ModelPredicate(Protocol[_ModelType_co]):
@@ -56,34 +100,165 @@ class ModelFieldExtractor(Protocol[_ModelType_contra]):
 
 _dict = {}
 
+_plugin_lock = threading.RLock()
+"""Lock held while loading and registering plugins and while identifying a type's plugin, so that
+threads never see a core plugin that is neither pending nor registered."""
+
+_pending_plugins: dict[str, str] = {}
+"""Core plugins that have not been loaded yet, with values of the plugin module name. See
+[`load_plugins`][erdantic.plugins.load_plugins]."""
+
+_dispatch_cache: "weakref.WeakKeyDictionary[Any, Optional[str]]" = weakref.WeakKeyDictionary()
+"""Cache of the plugin key identified for a type, or None if the type was not identified as a
+model by any plugin. Keys are weakly referenced so that classes can still be garbage collected.
+This cache is cleared whenever a plugin is registered."""
+
+_base_class_index: dict[type, set[str]] = {}
+"""Index from base classes to the keys of plugins that registered them."""
+
+_marker_attr_index: dict[str, set[str]] = {}
+"""Index from marker attribute names to the keys of plugins that registered them."""
+
+_indexed_keys: set[str] = set()
+"""Keys of plugins that are identified using the indexes instead of their predicate function."""
+
+_registry_version = 0
+"""Counter that is incremented whenever a plugin is registered, so that caches of analysis results
+can tell when they are stale."""
+
+_precedence_cache: tuple[int, tuple[str, ...], dict[str, int], tuple[tuple[int, str], ...]] = (
+    -1,
+    (),
+    {},
+    (),
+)
+"""Registry version that the other values were computed for, keys of registered plugins in order
+of precedence, the rank of each key in that order, and the ranks and keys of plugins that are not
+indexed. See [`_plugin_precedence`][erdantic.plugins._plugin_precedence]."""
+
 
 def register_plugin(
     key: str,
     predicate_fn: ModelPredicate[_ModelType],
     get_fields_fn: ModelFieldExtractor[_ModelType],
+    base_classes: Collection[type] = (),
+    marker_attrs: Collection[str] = (),
 ):
     """Register a plugin for a specific model class type.
 
+    If `base_classes` or `marker_attrs` are given, then erdantic identifies this plugin's model
+    classes by looking them up in an index with a single walk of a class's method resolution
+    order, instead of calling `predicate_fn`. This is faster when many plugins are registered. They
+    must be equivalent to `predicate_fn`: a class is a model class for this plugin if and only if
+    it is a subclass of one of the base classes or has one of the marker attributes, defined on the
+    class or one of its base classes, set to a value other than None.
+
     Args:
         key (str): An identifier for this plugin.
         predicate_fn (ModelPredicate): A predicate function to determine if an object is a class
             of the model that is supported by this plugin.
         get_fields_fn (ModelFieldExtractor): A function to extract fields from a model class that
             is supported by this plugin.
+        base_classes (Collection[type], optional): Base classes of the model classes that are
+            supported by this plugin. Defaults to no base classes.
+        marker_attrs (Collection[str], optional): Names of attributes that mark classes as model
+            classes that are supported by this plugin. Defaults to no marker attributes.
     """
+    global _registry_version
     logger.debug("Registering plugin '%s'", key)
-    if key in _dict:
-        logger.warning("Overwriting existing implementation for key '%s'", key)
-    _dict[key] = (predicate_fn, get_fields_fn)
+    with _plugin_lock:
+        if key in _dict:
+            logger.warning("Overwriting existing implementation for key '%s'", key)
+        _dict[key] = (predicate_fn, get_fields_fn)
+        # Remove any existing index entries for this key before adding new ones
+        for index in (_base_class_index, _marker_attr_index):
+            for index_key, plugin_keys in list(index.items()):
+                plugin_keys.discard(key)
+                if not plugin_keys:
+                    del index[index_key]
+        _indexed_keys.discard(key)
+        for base_class in base_classes:
+            _base_class_index.setdefault(base_class, set()).add(key)
+        for marker_attr in marker_attrs:
+            _marker_attr_index.setdefault(marker_attr, set()).add(key)
+        if base_classes or marker_attrs:
+            _indexed_keys.add(key)
+        _dispatch_cache.clear()
+        _registry_version += 1
+        # A plugin registered with the same key as a pending core plugin replaces it. Only remove
+        # it once the plugin is registered, so that it is always either pending or registered.
+        _pending_plugins.pop(key, None)
 
 
 def list_plugins() -> list[str]:
-    """List the keys of all registered plugins."""
-    return list(_dict.keys())
+    """List the keys of all registered plugins. Any pending core plugins are loaded first."""
+    _load_pending_plugins(force=True)
+    return _ordered_plugin_keys()
+
+
+def _list_active_plugins() -> list[str]:
+    """List the keys of registered plugins after loading pending core plugins whose framework has
+    been imported. Unlike [`list_plugins`][erdantic.plugins.list_plugins], this does not import
+    frameworks that are not in use, so it is suitable for searching for model classes."""
+    _load_pending_plugins()
+    return _ordered_plugin_keys()
+
+
+def _ordered_plugin_keys() -> list[str]:
+    """Return the keys of registered plugins in order of precedence: core plugins in the order of
+    `CORE_PLUGINS`, then other plugins in registration order. This does not depend on the order in
+    which lazily loaded core plugins were registered."""
+    keys, _, _ = _plugin_precedence()
+    return [key for key in keys if key in _dict]
+
+
+def _plugin_precedence() -> tuple[tuple[str, ...], dict[str, int], tuple[tuple[int, str], ...]]:
+    """Return the keys of registered plugins in order of precedence, the rank of each key in that
+    order, and the ranks and keys of plugins that are not indexed. The result is cached until the
+    registry version changes."""
+    global _precedence_cache
+    version, keys, ranks, predicate_keys = _precedence_cache
+    if version != _registry_version:
+        with _plugin_lock:
+            version = _registry_version
+            core_keys = [plugin for plugin, _ in CORE_PLUGINS if plugin in _dict]
+            keys = tuple(core_keys + [plugin for plugin in _dict if plugin not in core_keys])
+            ranks = {key: rank for rank, key in enumerate(keys)}
+            predicate_keys = tuple(
+                (rank, key) for rank, key in enumerate(keys) if key not in _indexed_keys
+            )
+            _precedence_cache = (version, keys, ranks, predicate_keys)
+    return keys, ranks, predicate_keys
+
+
+def _list_plugin_keys() -> list[str]:
+    """List the keys of registered plugins and pending core plugins in order of precedence,
+    without loading any pending core plugins. A pending core plugin may still turn out to be
+    unavailable once it is loaded, if its dependencies are not installed."""
+    with _plugin_lock:
+        core_keys = [
+            plugin for plugin, _ in CORE_PLUGINS if plugin in _dict or plugin in _pending_plugins
+        ]
+        return core_keys + [plugin for plugin in _dict if plugin not in core_keys]
+
+
+def _load_pending_plugin(key: str):
+    if key not in _pending_plugins:
+        return
+    with _plugin_lock:
+        module = _pending_plugins.get(key)
+        if module is not None:
+            try:
+                _load_plugin(key, module)
+            finally:
+                # Remove after loading, whether or not it succeeded, so that a failed import is
+                # not retried
+                _pending_plugins.pop(key, None)
 
 
 def get_predicate_fn(key: str) -> ModelPredicate:
     """Get the predicate function for a plugin by its key."""
+    _load_pending_plugin(key)
     try:
         return _dict[key][0]
     except KeyError:
@@ -92,6 +267,7 @@ def get_predicate_fn(key: str) -> ModelPredicate:
 
 def get_field_extractor_fn(key: str) -> ModelFieldExtractor:
     """Get the field extractor function for a plugin by its key."""
+    _load_pending_plugin(key)
     try:
         return _dict[key][1]
     except KeyError:
@@ -99,7 +275,8 @@ def get_field_extractor_fn(key: str) -> ModelFieldExtractor:
 
 
 def identify_field_extractor_fn(tp: type) -> Optional[ModelFieldExtractor]:
-    """Identify the field extractor function for a model type.
+    """Identify the field extractor function for a model type. Results are cached by type, so
+    each type is only checked against the registered plugins' predicate functions once.
 
     Args:
         tp (type): A type annotation.
@@ -108,9 +285,74 @@ def identify_field_extractor_fn(tp: type) -> Optional[ModelFieldExtractor]:
         ModelFieldExtractor | None: The field extractor function for a known model type, or None if
             the model type is not recognized by any registered plugins.
     """
-    for key, (predicate_fn, get_fields_fn) in _dict.items():
-        if predicate_fn(tp):
-            logger.debug("Identified '%s' as a '%s' model.", typenames(tp), key)
-            return get_fields_fn
-    logger.debug("'%s' is not a known model type.", typenames(tp))
+    key = _identify_plugin_key(tp)
+    if key is None:
+        return None
+    return _dict[key][1]
+
+
+def _identify_plugin_key(tp: type) -> Optional[str]:
+    """Return the key of the plugin that a type matches, or None if no plugins match, using the
+    cache of identified types."""
+    try:
+        key = _dispatch_cache[tp]
+    except (KeyError, TypeError):
+        # TypeError if tp is unhashable or does not support weak references
+        pass
+    else:
+        if key is None or key in _dict:
+            return key
+        # Cached plugin is no longer registered, so fall through and identify again
+
+    with _plugin_lock:
+        _load_pending_plugins()
+        key = _find_plugin_key(tp)
+        try:
+            _dispatch_cache[tp] = key
+        except TypeError:
+            pass
+    return key
+
+
+def _find_plugin_key(tp: type) -> Optional[str]:
+    """Identify which registered plugin a type matches, and return the key of the first plugin in
+    order of precedence that matches, or None if no plugins match. Plugins registered with base
+    classes or marker attributes are matched with a single walk of the type's method resolution
+    order against the indexes, and predicate functions are only called for other plugins that
+    take precedence over the best indexed match."""
+    keys, ranks, predicate_keys = _plugin_precedence()
+    best_rank = len(keys)
+    if isinstance(tp, type) and (_base_class_index or _marker_attr_index):
+        indexed_matches: list[str] = []
+        unresolved_marker_attrs = set(_marker_attr_index)
+        for base in tp.__mro__:
+            indexed_matches.extend(_base_class_index.get(base, ()))
+            if unresolved_marker_attrs:
+                namespace = base.__dict__
+                # The first class in the MRO that defines a marker attribute determines its value
+                for marker_attr in [m for m in unresolved_marker_attrs if m in namespace]:
+                    unresolved_marker_attrs.discard(marker_attr)
+                    if namespace[marker_attr] is not None:
+                        indexed_matches.extend(_marker_attr_index[marker_attr])
+        for key in indexed_matches:
+            rank = ranks.get(key, best_rank)
+            if rank < best_rank and key in _dict:
+                best_rank = rank
+    for rank, key in predicate_keys:
+        if rank >= best_rank:
+            break
+        plugin = _dict.get(key)
+        if plugin is not None and plugin[0](tp):
+            return _log_identified(tp, key)
+    if best_rank < len(keys):
+        return _log_identified(tp, keys[best_rank])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("'%s' is not a known model type.", typenames(tp))
     return None
+
+
+def _log_identified(tp: type, key: str) -> str:
+    # Rendering type names is slow, so only do it when debug logging is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Identified '%s' as a '%s' model.", typenames(tp), key)
+    return key
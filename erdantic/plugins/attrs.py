@@ -66,5 +66,8 @@ def get_fields_from_attrs_class(model: AttrsClassType) -> list[FieldInfo]:
 
 
 register_plugin(
-    key="attrs", predicate_fn=is_attrs_class, get_fields_fn=get_fields_from_attrs_class
+    key="attrs",
+    predicate_fn=is_attrs_class,
+    get_fields_fn=get_fields_from_attrs_class,
+    marker_attrs=["__attrs_attrs__"],
 )
@@ -70,7 +70,10 @@ def get_fields_from_dataclass(model: DataclassType) -> list[FieldInfo]:
 
 
 register_plugin(
-    key="dataclasses", predicate_fn=is_dataclass_class, get_fields_fn=get_fields_from_dataclass
+    key="dataclasses",
+    predicate_fn=is_dataclass_class,
+    get_fields_fn=get_fields_from_dataclass,
+    marker_attrs=["__dataclass_fields__"],
 )
 
 
@@ -67,5 +67,8 @@ def get_fields_from_msgspec_struct(model: MsgspecStruct) -> list[FieldInfo]:
 
 
 register_plugin(
-    key="msgspec", predicate_fn=is_msgspec_struct, get_fields_fn=get_fields_from_msgspec_struct
+    key="msgspec",
+    predicate_fn=is_msgspec_struct,
+    get_fields_fn=get_fields_from_msgspec_struct,
+    base_classes=[msgspec.Struct],
 )
@@ -1,4 +1,3 @@
-import re
 import sys
 from typing import Any, Optional, Type
 
@@ -9,16 +8,12 @@ else:
 
 import pydantic
 
-if sys.version_info < (3, 14):
-    import pydantic.v1
-
-    PYDANTIC_V1_AVAILABLE = True
-else:
-    PYDANTIC_V1_AVAILABLE = False
-
 from erdantic.core import FieldInfo, FullyQualifiedName
-from erdantic.exceptions import UnresolvableForwardRefError
+from erdantic.exceptions import UnresolvableForwardRefError, _UnevaluatedForwardRefError
 from erdantic.plugins import register_plugin
+from erdantic.typing_utils import get_recursive_args
+
+PYDANTIC_V1_AVAILABLE = sys.version_info < (3, 14)
 
 ## Pydantic v2
 
@@ -37,18 +32,35 @@ def is_pydantic_model(obj: Any) -> TypeGuard[PydanticModel]:
     return isinstance(obj, type) and issubclass(obj, pydantic.BaseModel)
 
 
-def get_fields_from_pydantic_model(model: PydanticModel) -> list[FieldInfo]:
+FORCE_MODEL_REBUILD = False
+"""Default for the `force_rebuild` argument of
+[`get_fields_from_pydantic_model`][erdantic.plugins.pydantic.get_fields_from_pydantic_model]. Set
+this to True to always rebuild Pydantic models when extracting their fields."""
+
+
+def get_fields_from_pydantic_model(
+    model: PydanticModel, force_rebuild: Optional[bool] = None
+) -> list[FieldInfo]:
     """Given a Pydantic model, return a list of FieldInfo instances for each field in the model.
 
+    The model is rebuilt to resolve forward references only if it is not complete or if any of its
+    fields' type annotations have unresolved forward references. Rebuilding regenerates the
+    model's schema and validator, which is expensive.
+
     Args:
         model (PydanticModel): The Pydantic model to get fields from.
+        force_rebuild (bool | None, optional): Whether to always rebuild the model. If None, uses
+            the value of `FORCE_MODEL_REBUILD`, which is False by default. Defaults to None.
 
     Returns:
         list[FieldInfo]: List of FieldInfo instances for each field in the model
     """
+    if force_rebuild is None:
+        force_rebuild = FORCE_MODEL_REBUILD
     try:
-        # Rebuild model schema to resolve forward references
-        model.model_rebuild(force=True)
+        if force_rebuild or needs_model_rebuild(model):
+            # Rebuild model schema to resolve forward references
+            model.model_rebuild(force=True)
     except pydantic.errors.PydanticUndefinedAnnotation as e:
         model_full_name = FullyQualifiedName.from_object(model)
         forward_ref = e.name
@@ -72,77 +84,51 @@ def get_fields_from_pydantic_model(model: PydanticModel) -> list[FieldInfo]:
     ]
 
 
-register_plugin(
-    key="pydantic", predicate_fn=is_pydantic_model, get_fields_fn=get_fields_from_pydantic_model
-)
+def needs_model_rebuild(model: PydanticModel) -> bool:
+    """Determine if a Pydantic model needs to be rebuilt to resolve forward references, i.e., if
+    the model is not complete or if any of its fields' type annotations contain unresolved forward
+    references. The second case can happen even for complete models, e.g., for fields inherited
+    from a parent model that was defined before the forward-referenced class.
 
-## Pydantic v1 legacy
+    Args:
+        model (PydanticModel): The Pydantic model to check.
 
-if PYDANTIC_V1_AVAILABLE:
-    PydanticV1Model = Type[pydantic.v1.BaseModel]
+    Returns:
+        bool: True if the model should be rebuilt, False otherwise.
+    """
+    if not getattr(model, "__pydantic_complete__", False):
+        return True
+    for pydantic_field_info in model.model_fields.values():
+        try:
+            get_recursive_args(pydantic_field_info.annotation)
+        except _UnevaluatedForwardRefError:
+            return True
+    return False
 
-    def is_pydantic_v1_model(obj) -> TypeGuard[PydanticV1Model]:
-        """Predicate function to determine if an object is a Pydantic V1 model (not an instance).
-        This is for models that use the legacy `pydantic.v1` namespace.
 
-        Args:
-            obj (Any): The object to check.
+register_plugin(
+    key="pydantic",
+    predicate_fn=is_pydantic_model,
+    get_fields_fn=get_fields_from_pydantic_model,
+    base_classes=[pydantic.BaseModel],
+)
+
 
-        Returns:
-            bool: True if the object is a Pydantic V1 model, False otherwise.
-        """
-        return isinstance(obj, type) and issubclass(obj, pydantic.v1.BaseModel)
+_PYDANTIC_V1_NAMES = frozenset(
+    {
+        "PydanticV1Model",
+        "is_pydantic_v1_model",
+        "get_fields_from_pydantic_v1_model",
+        "get_type_annotation_from_pydantic_v1_field",
+    }
+)
 
-    def get_fields_from_pydantic_v1_model(model: PydanticV1Model) -> list[FieldInfo]:
-        """Given a Pydantic V1 model, return a list of FieldInfo instances for each field in the
-        model.
 
-        Args:
-            model (PydanticV1Model): The Pydantic V1 model to get fields from.
+def __getattr__(name: str) -> Any:
+    # The Pydantic V1 plugin moved to erdantic.plugins.pydantic_v1 so that pydantic.v1 is only
+    # imported when needed. Keep its names available from this module.
+    if PYDANTIC_V1_AVAILABLE and name in _PYDANTIC_V1_NAMES:
+        import erdantic.plugins.pydantic_v1
 
-        Returns:
-            list[FieldInfo]: List of FieldInfo instances for each field in the model
-        """
-        try:
-            model.update_forward_refs()
-        except NameError as e:
-            model_full_name = FullyQualifiedName.from_object(model)
-            # NameError attribute 'name' was added in Python 3.10
-            forward_ref = getattr(
-                e,
-                "name",
-                re.search(r"(?<=')(?:[^'])*(?=')", str(e)).group(0),  # type: ignore [union-attr]
-            )
-            msg = (
-                f"Failed to resolve forward reference '{forward_ref}' in the type annotations for "
-                f"Pydantic V1 model {model_full_name}. "
-                "You should call the method update_forward_refs(**locals()) on the model in "
-                "the scope where it has been defined to manually resolve it."
-            )
-            raise UnresolvableForwardRefError(
-                msg, name=forward_ref, model_full_name=model_full_name
-            ) from e
-
-        return [
-            FieldInfo.from_raw_type(
-                model_full_name=FullyQualifiedName.from_object(model),
-                name=name,
-                raw_type=get_type_annotation_from_pydantic_v1_field(field),
-            )
-            for name, field in model.__fields__.items()
-        ]
-
-    def get_type_annotation_from_pydantic_v1_field(
-        field_info: pydantic.v1.fields.ModelField,
-    ) -> type:
-        """Utility function to get the type annotation from a Pydantic V1 field info object."""
-        tp = field_info.outer_type_
-        if field_info.allow_none:
-            return Optional[tp]  # type: ignore
-        return tp
-
-    register_plugin(
-        key="pydantic_v1",
-        predicate_fn=is_pydantic_v1_model,
-        get_fields_fn=get_fields_from_pydantic_v1_model,
-    )
+        return getattr(erdantic.plugins.pydantic_v1, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,147 @@
+"""Search a package and all of its subpackages and submodules for data model classes.
+
+Submodules are found with [`pkgutil.iter_modules`][pkgutil.iter_modules], the building block of
+[`pkgutil.walk_packages`][pkgutil.walk_packages], and are imported and searched with a pool of
+threads, so that reading and compiling the source files of different modules can overlap. The
+subpackages of a package are scanned as soon as the package is imported. A module that fails to
+import is reported in its result and does not stop the scan.
+"""
+
+from collections.abc import Collection
+from importlib import import_module
+import logging
+import pkgutil
+import time
+import traceback
+from types import ModuleType
+from typing import Optional, Union
+
+import pydantic
+
+from erdantic.convenience import find_models
+from erdantic.core import FullyQualifiedName
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleScanResult(pydantic.BaseModel):
+    """Result of importing and searching one module with
+    [`scan_package`][erdantic.scan.scan_package].
+
+    Attributes:
+        module (str): Fully qualified name of the module.
+        success (bool): Whether the module was imported and searched successfully.
+        duration (float): Time taken to import and search the module, in seconds. Modules that
+            were already imported are only searched.
+        models (list[type]): Data model classes found in the module.
+        error (str | None): Description of the exception if the module failed.
+        traceback (str | None): Formatted traceback of the exception if the module failed.
+    """
+
+    module: str
+    success: bool
+    duration: float
+    models: list[type] = []
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+
+    @property
+    def model_names(self) -> list[str]:
+        """Fully qualified names of the data model classes found in the module."""
+        return [str(FullyQualifiedName.from_object(model)) for model in self.models]
+
+
+def scan_package(
+    package: Union[str, ModuleType],
+    limit_search_models_to: Optional[Collection[str]] = None,
+    max_workers: Optional[int] = None,
+) -> list[ModuleScanResult]:
+    """Import a package and all of its subpackages and submodules, and search each one for data
+    model classes with [`find_models`][erdantic.convenience.find_models]. Modules named
+    `__main__` are skipped, since importing them usually runs a program.
+
+    Args:
+        package (str | ModuleType): Package, or its fully qualified name. A module that is not a
+            package is searched by itself.
+        limit_search_models_to (Collection[str] | None, optional): Plugin identifiers to limit to
+            when searching modules for data model classes. Defaults to None which will not impose
+            any limits.
+        max_workers (int | None, optional): Maximum number of threads for importing and searching
+            modules. If 1, modules are imported in the current thread. Defaults to None, which
+            uses the default of [`ThreadPoolExecutor`][concurrent.futures.ThreadPoolExecutor].
+
+    Returns:
+        list[ModuleScanResult]: Result for each module, sorted by module name.
+    """
+    name = package.__name__ if isinstance(package, ModuleType) else package
+    logger.info("Scanning package '%s' for data model classes...", name)
+    start = time.perf_counter()
+    results: list[ModuleScanResult] = []
+    if max_workers == 1:
+        stack = [name]
+        while stack:
+            result, module = _scan_module(stack.pop(), limit_search_models_to)
+            results.append(result)
+            stack.extend(_submodule_names(module))
+    else:
+        # Lazy import so that concurrent.futures is only imported when it is used
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(_scan_module, name, limit_search_models_to)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result, module = future.result()
+                    results.append(result)
+                    pending.update(
+                        executor.submit(_scan_module, submodule, limit_search_models_to)
+                        for submodule in _submodule_names(module)
+                    )
+    results.sort(key=lambda result: result.module)
+    failed = [result for result in results if not result.success]
+    for result in failed:
+        logger.warning("Failed to import module '%s': %s", result.module, result.error)
+    logger.info(
+        "Scanned %d modules in %.2f s and found %d data model classes. %d modules failed.",
+        len(results),
+        time.perf_counter() - start,
+        sum(len(result.models) for result in results),
+        len(failed),
+    )
+    return results
+
+
+def _scan_module(
+    name: str, limit_search_models_to: Optional[Collection[str]]
+) -> tuple[ModuleScanResult, Optional[ModuleType]]:
+    """Import and search one module. Exceptions are caught and reported in the result. Runs in
+    worker threads."""
+    start = time.perf_counter()
+    try:
+        module = import_module(name)
+        models = list(find_models(module, limit_search_models_to=limit_search_models_to))
+    except Exception as e:
+        result = ModuleScanResult(
+            module=name,
+            success=False,
+            duration=time.perf_counter() - start,
+            error="".join(traceback.format_exception_only(type(e), e)).strip(),
+            traceback="".join(traceback.format_exception(type(e), e, e.__traceback__)),
+        )
+        return result, None
+    duration = time.perf_counter() - start
+    logger.debug("Scanned module '%s' in %.3f s", name, duration)
+    return ModuleScanResult(module=name, success=True, duration=duration, models=models), module
+
+
+def _submodule_names(module: Optional[ModuleType]) -> list[str]:
+    """Return the names of the direct submodules and subpackages of a package."""
+    path = getattr(module, "__path__", None)
+    if module is None or path is None:
+        return []
+    return [
+        info.name
+        for info in pkgutil.iter_modules(path, prefix=f"{module.__name__}.")
+        if info.name.rpartition(".")[2] != "__main__"
+    ]
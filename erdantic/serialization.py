@@ -0,0 +1,400 @@
+"""Compact, versioned serialization format for entity relationship diagrams, for caching analyzed
+diagrams between runs.
+
+Compared to Pydantic's `model_dump_json` and `model_validate_json`, this format stores each
+string, such as a module name, qualified name, or type name, only once in a string table, and
+stores each edge as indexes of its source and target models rather than as nested objects. Loading
+constructs instances directly without per-object Pydantic validation, and each fully qualified
+name is shared by its model, the model's fields, and the edges that reference it.
+
+The serialized data is a JSON object:
+
+```json
+{
+  "format": "erdantic.diagram",
+  "version": 1,
+  "strings": ["erdantic.examples.pydantic", "Party", "str", ...],
+  "names": [[0, 1], ...],
+  "models": [[1, "Description...", [3, 2, ...]], ...],
+  "edges": [[0, 4, 1, 2, 1, 0, 0], ...]
+}
+```
+
+- `strings` is the string table, referenced by index everywhere else.
+- `names` are fully qualified names as `[module, qual_name]`. The first entries are the names of
+  the models, in the same order as `models`. Any further entries are names referenced only by
+  edges.
+- `models` are `[name, description, fields]`, where `fields` is a flat list of alternating field
+  name and type name.
+- `edges` are `[source, source_field_name, target, target_cardinality, target_modality,
+  source_cardinality, source_modality]`, where `source` and `target` are indexes into `names` and
+  cardinalities and modalities are indexes into the members of
+  [`Cardinality`][erdantic.core.Cardinality] and [`Modality`][erdantic.core.Modality].
+
+Raw data model classes and type annotations are not serialized. They are imported when needed,
+as for diagrams loaded from Pydantic's JSON serialization. Subclasses of erdantic's classes with
+additional fields are not supported by this format.
+"""
+
+from contextlib import contextmanager
+import gc
+import json
+import threading
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+)
+
+import pydantic
+from sortedcontainers_pydantic import SortedDict
+
+from erdantic.core import (
+    Cardinality,
+    Edge,
+    EntityRelationshipDiagram,
+    FieldInfo,
+    FullyQualifiedName,
+    Modality,
+    ModelInfo,
+    _EdgeDict,
+)
+
+FORMAT_NAME = "erdantic.diagram"
+"""Value of the `format` member of serialized diagrams."""
+
+FORMAT_VERSION = 1
+"""Current version of the serialization format. Loading data with a different version raises a
+`ValueError`."""
+
+_DiagramType = TypeVar("_DiagramType", bound=EntityRelationshipDiagram)
+_ModelType = TypeVar("_ModelType", bound=pydantic.BaseModel)
+
+_CARDINALITIES = list(Cardinality)
+_MODALITIES = list(Modality)
+_CARDINALITY_INDEXES = {member: i for i, member in enumerate(_CARDINALITIES)}
+_MODALITY_INDEXES = {member: i for i, member in enumerate(_MODALITIES)}
+
+
+def to_compact(diagram: EntityRelationshipDiagram) -> Dict[str, Any]:
+    """Serialize a diagram to the compact format as a JSON-compatible dictionary.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to serialize.
+
+    Raises:
+        ValueError: If the diagram uses subclasses of erdantic's classes with additional fields.
+
+    Returns:
+        dict[str, Any]: Serialized diagram.
+    """
+    _component_classes(type(diagram))
+    return _to_compact(diagram)
+
+
+def _to_compact(diagram: EntityRelationshipDiagram) -> Dict[str, Any]:
+    strings: List[str] = []
+    string_indexes: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        index = string_indexes.get(s)
+        if index is None:
+            index = string_indexes[s] = len(strings)
+            strings.append(s)
+        return index
+
+    names: List[List[int]] = []
+    name_indexes: Dict[str, int] = {}
+
+    def intern_name(full_name: FullyQualifiedName) -> int:
+        key = str(full_name)
+        index = name_indexes.get(key)
+        if index is None:
+            index = name_indexes[key] = len(names)
+            names.append([intern(full_name.module), intern(full_name.qual_name)])
+        return index
+
+    models = []
+    for model_info in diagram.models.values():
+        intern_name(model_info.full_name)
+        fields = []
+        for field_info in model_info.fields.values():
+            fields.append(intern(field_info.name))
+            fields.append(intern(field_info.type_name))
+        models.append([intern(model_info.name), model_info.description, fields])
+
+    edges = [
+        [
+            intern_name(edge.source_model_full_name),
+            intern(edge.source_field_name),
+            intern_name(edge.target_model_full_name),
+            _CARDINALITY_INDEXES[edge.target_cardinality],
+            _MODALITY_INDEXES[edge.target_modality],
+            _CARDINALITY_INDEXES[edge.source_cardinality],
+            _MODALITY_INDEXES[edge.source_modality],
+        ]
+        for edge in diagram.edges.values()
+    ]
+
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "strings": strings,
+        "names": names,
+        "models": models,
+        "edges": edges,
+    }
+
+
+def from_compact(
+    data: Dict[str, Any],
+    diagram_cls: Type[_DiagramType] = EntityRelationshipDiagram,  # type: ignore [assignment]
+    pause_gc: bool = False,
+) -> _DiagramType:
+    """Deserialize a diagram from the compact format. Instances are constructed without Pydantic
+    validation, so the data should come from [`to_compact`][erdantic.serialization.to_compact].
+
+    Args:
+        data (dict[str, Any]): Serialized diagram.
+        diagram_cls (type[EntityRelationshipDiagram], optional): Diagram class to create.
+            Defaults to EntityRelationshipDiagram.
+        pause_gc (bool, optional): If True, pause automatic garbage collection while the diagram
+            is constructed. Creating many objects that are all kept alive otherwise triggers
+            repeated collections, so this makes loading large diagrams several times faster.
+            Garbage collection is disabled for the whole process, including other threads, until
+            loading finishes. Defaults to False.
+
+    Raises:
+        ValueError: If the data is not in the compact format or has an unsupported version, or
+            if the diagram class uses subclasses of erdantic's classes with additional fields.
+
+    Returns:
+        EntityRelationshipDiagram: Deserialized diagram.
+    """
+    if not isinstance(data, dict) or data.get("format") != FORMAT_NAME:
+        raise ValueError(f"Data is not a serialized diagram in the '{FORMAT_NAME}' format.")
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported serialized diagram version {data.get('version')!r}. "
+            f"Expected version {FORMAT_VERSION}."
+        )
+    with _gc_paused(pause_gc):
+        return _from_compact(data, diagram_cls)
+
+
+def _from_compact(data: Dict[str, Any], diagram_cls: Type[_DiagramType]) -> _DiagramType:
+    model_info_cls, field_info_cls, edge_cls = _component_classes(diagram_cls)
+    new_full_name = _constructor(FullyQualifiedName)
+    new_field_info = _constructor(field_info_cls)
+    new_model_info = _constructor(model_info_cls)
+    new_edge = _constructor(edge_cls)
+    strings = data["strings"]
+
+    full_names = []
+    name_keys = []
+    for module_index, qual_name_index in data["names"]:
+        module = strings[module_index]
+        qual_name = strings[qual_name_index]
+        full_names.append(new_full_name({"module": module, "qual_name": qual_name}))
+        name_keys.append(f"{module}.{qual_name}")
+
+    models = []
+    for full_name, key, (name_index, description, fields) in zip(
+        full_names, name_keys, data["models"]
+    ):
+        field_infos = {}
+        for i in range(0, len(fields), 2):
+            field_name = strings[fields[i]]
+            field_infos[field_name] = new_field_info(
+                {
+                    "model_full_name": full_name,
+                    "name": field_name,
+                    "type_name": strings[fields[i + 1]],
+                },
+                # Same as ModelInfo._link_fields
+                {"_siblings": field_infos},
+            )
+        model_info = new_model_info(
+            {
+                "full_name": full_name,
+                "name": strings[name_index],
+                "fields": field_infos,
+                "description": description,
+            }
+        )
+        models.append((key, model_info))
+
+    edges = []
+    for source, field_index, target, *arrows in data["edges"]:
+        field_name = strings[field_index]
+        edge = new_edge(
+            {
+                "source_model_full_name": full_names[source],
+                "source_field_name": field_name,
+                "target_model_full_name": full_names[target],
+                "target_cardinality": _CARDINALITIES[arrows[0]],
+                "target_modality": _MODALITIES[arrows[1]],
+                "source_cardinality": _CARDINALITIES[arrows[2]],
+                "source_modality": _MODALITIES[arrows[3]],
+            }
+        )
+        edges.append((f"{name_keys[source]}-{field_name}-{name_keys[target]}", edge))
+
+    return diagram_cls.model_construct(models=SortedDict(models), edges=_EdgeDict(edges))
+
+
+def dumps(diagram: EntityRelationshipDiagram) -> str:
+    """Serialize a diagram to a JSON string in the compact format.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to serialize.
+
+    Returns:
+        str: JSON string.
+    """
+    return json.dumps(to_compact(diagram), separators=(",", ":"))
+
+
+def loads(
+    s: Union[str, bytes],
+    diagram_cls: Type[_DiagramType] = EntityRelationshipDiagram,  # type: ignore [assignment]
+    pause_gc: bool = False,
+) -> _DiagramType:
+    """Deserialize a diagram from a JSON string in the compact format.
+
+    Args:
+        s (str | bytes): JSON string.
+        diagram_cls (type[EntityRelationshipDiagram], optional): Diagram class to create.
+            Defaults to EntityRelationshipDiagram.
+        pause_gc (bool, optional): If True, pause automatic garbage collection for the whole
+            process while loading. See [`from_compact`][erdantic.serialization.from_compact].
+            Defaults to False.
+
+    Returns:
+        EntityRelationshipDiagram: Deserialized diagram.
+    """
+    with _gc_paused(pause_gc):
+        return from_compact(json.loads(s), diagram_cls=diagram_cls)
+
+
+def dump(diagram: EntityRelationshipDiagram, fp: IO[str]) -> None:
+    """Serialize a diagram as JSON in the compact format to a text file-like object.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to serialize.
+        fp (IO[str]): Text file-like object to write to.
+    """
+    json.dump(to_compact(diagram), fp, separators=(",", ":"))
+
+
+def load(
+    fp: IO[str],
+    diagram_cls: Type[_DiagramType] = EntityRelationshipDiagram,  # type: ignore [assignment]
+    pause_gc: bool = False,
+) -> _DiagramType:
+    """Deserialize a diagram from JSON in the compact format in a text file-like object.
+
+    Args:
+        fp (IO[str]): Text file-like object to read from.
+        diagram_cls (type[EntityRelationshipDiagram], optional): Diagram class to create.
+            Defaults to EntityRelationshipDiagram.
+        pause_gc (bool, optional): If True, pause automatic garbage collection for the whole
+            process while loading. See [`from_compact`][erdantic.serialization.from_compact].
+            Defaults to False.
+
+    Returns:
+        EntityRelationshipDiagram: Deserialized diagram.
+    """
+    with _gc_paused(pause_gc):
+        return from_compact(json.load(fp), diagram_cls=diagram_cls)
+
+
+def _component_classes(diagram_cls: Type[EntityRelationshipDiagram]):
+    """Return the model info, field info, and edge classes used by a diagram class, checking that
+    they do not have fields that the compact format does not store."""
+    model_info_cls = get_args(diagram_cls.model_fields["models"].annotation)[1]
+    edge_cls = get_args(diagram_cls.model_fields["edges"].annotation)[1]
+    field_info_cls = get_args(model_info_cls.model_fields["fields"].annotation)[1]
+    _check_fields(model_info_cls, ModelInfo)
+    _check_fields(field_info_cls, FieldInfo)
+    _check_fields(edge_cls, Edge)
+    return model_info_cls, field_info_cls, edge_cls
+
+
+def _constructor(cls: Type[_ModelType]) -> Callable[..., _ModelType]:
+    """Return a function that creates instances of a Pydantic model class from a dictionary of
+    all field values, and optionally a dictionary of private attribute values, without
+    validation. This does the same as the class's `model_construct` method for that case, but
+    without its per-instance overhead of resolving default values."""
+    fields_set = set(cls.model_fields)
+    private_defaults = {
+        name: private_attr.get_default()
+        for name, private_attr in cls.__private_attributes__.items()
+    }
+    has_private = bool(private_defaults)
+    new = cls.__new__
+    set_attr = object.__setattr__
+
+    def construct(values: Dict[str, Any], private: Optional[Dict[str, Any]] = None) -> _ModelType:
+        obj = new(cls)
+        set_attr(obj, "__dict__", values)
+        set_attr(obj, "__pydantic_fields_set__", set(fields_set))
+        set_attr(obj, "__pydantic_extra__", None)
+        if has_private:
+            set_attr(obj, "__pydantic_private__", {**private_defaults, **(private or {})})
+        else:
+            set_attr(obj, "__pydantic_private__", None)
+        return obj
+
+    return construct
+
+
+_gc_lock = threading.Lock()
+"""Lock held while pausing or resuming garbage collection."""
+
+_gc_pause_depth = 0
+"""Number of active [`_gc_paused`][erdantic.serialization._gc_paused] contexts that pause garbage
+collection, across all threads."""
+
+_gc_was_enabled = False
+"""Whether garbage collection was enabled when the outermost active pause started."""
+
+
+@contextmanager
+def _gc_paused(pause: bool = True) -> Iterator[None]:
+    """Pause automatic garbage collection for the whole process if pause is True. Pauses may be
+    nested or overlap between threads, and garbage collection is only resumed, if it was enabled
+    before, once the last of them ends."""
+    global _gc_pause_depth, _gc_was_enabled
+    if not pause:
+        yield
+        return
+    with _gc_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _check_fields(cls: type, base: type) -> None:
+    extra = set(cls.model_fields) - set(base.model_fields)  # type: ignore [attr-defined]
+    if extra:
+        raise ValueError(
+            f"{cls.__qualname__} has additional fields {', '.join(sorted(extra))}, which are "
+            "not supported by the compact format."
+        )
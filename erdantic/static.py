@@ -0,0 +1,918 @@
+"""Discover data model classes by parsing the source code of modules with the standard library
+[`ast`][ast] module instead of importing them. Importing a module runs its side effects and imports
+all of its dependencies, which can be slow for large code bases; parsing only reads the module's
+own source file. Many modules can be parsed in parallel with a pool of processes.
+
+Static analysis recognizes data model classes that subclass Pydantic's `BaseModel` or msgspec's
+`Struct`, directly or through other classes defined in analyzed modules, or that are decorated with
+`@dataclass` or an attrs class decorator such as `@attrs.define`. Names are resolved through the
+import statements of each module, including relative imports, re-exports, and imports in
+`if TYPE_CHECKING:` blocks. Fields are the annotated attributes of the class bodies, and their
+type names are the annotations as written in the source code, without module prefixes or
+Annotated metadata. Anything that is only known at
+runtime is not seen, e.g., classes or fields created dynamically, field types from type aliases
+or generic type parameters, or the docstrings that frameworks generate for classes without one.
+"""
+
+import ast
+import builtins
+from collections import deque
+import logging
+import os
+from pathlib import Path
+import sys
+import sysconfig
+from typing import Collection, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+import pydantic
+
+from erdantic.core import (
+    Cardinality,
+    Edge,
+    EntityRelationshipDiagram,
+    FieldInfo,
+    FullyQualifiedName,
+    Modality,
+    ModelInfo,
+)
+from erdantic.exceptions import ModelOrModuleNotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+_FRAMEWORK_BASES: dict[str, str] = {
+    "pydantic.BaseModel": "pydantic",
+    "pydantic.main.BaseModel": "pydantic",
+    "pydantic.v1.BaseModel": "pydantic_v1",
+    "pydantic.v1.main.BaseModel": "pydantic_v1",
+    "msgspec.Struct": "msgspec",
+}
+"""Fully qualified names of base classes of data modeling frameworks, mapped to the key of the
+plugin for the framework."""
+
+_FRAMEWORK_DECORATORS: dict[str, str] = {
+    "dataclasses.dataclass": "dataclasses",
+    "pydantic.dataclasses.dataclass": "dataclasses",
+    **{
+        f"{module}.{name}": "attrs"
+        for module in ("attr", "attrs")
+        for name in ("s", "attrs", "define", "mutable", "frozen", "dataclass")
+    },
+}
+"""Fully qualified names of class decorators of data modeling frameworks, mapped to the key of the
+plugin for the framework."""
+
+_FRAMEWORK_PACKAGES = frozenset(
+    ["attr", "attrs", "msgspec", "pydantic", "pydantic_core", "typing_extensions"]
+)
+"""Top-level packages that are never parsed, because their classes are only recognized by name."""
+
+_COLLECTION_ABCS = (
+    "AbstractSet",
+    "Collection",
+    "Container",
+    "Generator",
+    "ItemsView",
+    "Iterable",
+    "Iterator",
+    "KeysView",
+    "Mapping",
+    "MutableMapping",
+    "MutableSequence",
+    "MutableSet",
+    "Reversible",
+    "Sequence",
+    "Set",
+    "ValuesView",
+)
+_COLLECTION_TYPES = frozenset(
+    [
+        *(f"builtins.{name}" for name in ("dict", "frozenset", "list", "set", "tuple")),
+        *(f"collections.{name}" for name in ("ChainMap", "Counter", "OrderedDict")),
+        "collections.defaultdict",
+        "collections.deque",
+        *(f"collections.abc.{name}" for name in _COLLECTION_ABCS),
+        *(f"typing.{name}" for name in _COLLECTION_ABCS),
+        *(
+            f"typing.{name}"
+            for name in (
+                "ChainMap",
+                "Counter",
+                "DefaultDict",
+                "Deque",
+                "Dict",
+                "FrozenSet",
+                "List",
+                "OrderedDict",
+                "Tuple",
+            )
+        ),
+    ]
+)
+"""Fully qualified names of generic collection types, i.e., the origins that
+[`analyze_type_args`][erdantic.typing_utils.analyze_type_args] treats as collections."""
+
+_UNION_TYPES = frozenset(["typing.Optional", "typing.Union"])
+_EXCLUDED_FIELD_TYPES = frozenset(
+    ["dataclasses.InitVar", "dataclasses.KW_ONLY", "typing.ClassVar"]
+)
+"""Annotations of class attributes that are not fields."""
+_REWRITTEN_TYPES = frozenset(["typing.Annotated", "typing.Union"])
+"""Generic types whose type names are rendered differently from the source code."""
+
+
+class StaticTypeArg(NamedTuple):
+    """Static counterpart of [`TypeArg`][erdantic.typing_utils.TypeArg]: a name referenced in a
+    field's type annotation that may be a data model class.
+
+    Attributes:
+        name (str): Fully qualified name as resolved in the field's module. It may be a re-export,
+            i.e., not where the referenced object is defined.
+        is_collection (bool): Whether the name appears inside a collection type.
+    """
+
+    name: str
+    is_collection: bool
+
+
+class StaticField(pydantic.BaseModel):
+    """A field of a class found by parsing source code.
+
+    Attributes:
+        name (str): Name of the field.
+        type_name (str): Type annotation as written in the source code, with module prefixes
+            and Annotated metadata removed and string annotations unquoted.
+        type_args (list[StaticTypeArg]): Names referenced in the type annotation.
+        is_nullable (bool): Whether the type annotation, inside Annotated if it is wrapped in
+            it, is a typing.Optional or typing.Union that includes None.
+        is_annotated (bool): Whether the type annotation is wrapped in Annotated.
+    """
+
+    name: str
+    type_name: str
+    type_args: list[StaticTypeArg] = []
+    is_nullable: bool = False
+    is_annotated: bool = False
+
+
+class StaticClass(pydantic.BaseModel):
+    """A class definition found by parsing source code. Whether it is a data model class can
+    depend on its base classes in other modules, so this is decided by
+    [`StaticAnalyzer`][erdantic.static.StaticAnalyzer].
+
+    Attributes:
+        qual_name (str): Qualified name of the class in its module.
+        bases (list[str]): Fully qualified names of base classes, as resolved in the module.
+        plugin (str | None): Key of the plugin for the data modeling framework if the class has
+            one of the framework's decorators or directly subclasses the framework's base class.
+        fields (list[StaticField]): Annotated attributes defined in the class body, except class
+            variables.
+        docstring (str | None): Docstring of the class.
+    """
+
+    qual_name: str
+    bases: list[str] = []
+    plugin: Optional[str] = None
+    fields: list[StaticField] = []
+    docstring: Optional[str] = None
+
+
+class StaticModule(pydantic.BaseModel):
+    """Result of parsing the source code of a module with
+    [`parse_module`][erdantic.static.parse_module].
+
+    Attributes:
+        name (str): Name of the module.
+        path (Path): Path of the module's source file.
+        imports (dict[str, str]): Module-level names bound by import statements or by assigning
+            another name, mapped to the fully qualified names that they refer to.
+        classes (dict[str, StaticClass]): Classes defined in the module by qualified name, in
+            source order. Includes nested classes.
+    """
+
+    name: str
+    path: Path
+    imports: dict[str, str] = {}
+    classes: dict[str, StaticClass] = {}
+
+
+def find_module_file(name: str, search_path: Optional[Sequence[str]] = None) -> Optional[Path]:
+    """Find the source file of a module without importing it or its parent packages.
+
+    Args:
+        name (str): Fully qualified name of the module.
+        search_path (Sequence[str] | None, optional): Directories to search. Defaults to None,
+            which uses `sys.path`.
+
+    Returns:
+        Path | None: Path of the module's `.py` file, or of the package's `__init__.py` file.
+            None if there is no source file, e.g., for built-in and extension modules, namespace
+            packages, and modules that do not exist.
+    """
+    parts = name.split(".")
+    for entry in sys.path if search_path is None else search_path:
+        base = Path(entry or os.getcwd()).joinpath(*parts)
+        init_file = base / "__init__.py"
+        if init_file.is_file():
+            return init_file
+        module_file = base.parent / f"{parts[-1]}.py"
+        if module_file.is_file():
+            return module_file
+    return None
+
+
+def parse_module(name: str, path: Union[str, os.PathLike, None] = None) -> StaticModule:
+    """Parse the source code of a module to find the classes that it defines and the names that it
+    imports. The module is not imported.
+
+    Args:
+        name (str): Fully qualified name of the module. Used to resolve relative imports and to
+            give defined classes their fully qualified names.
+        path (str | os.PathLike | None, optional): Path of the module's source file. Defaults to
+            None, which looks it up with [`find_module_file`][erdantic.static.find_module_file].
+
+    Raises:
+        ModelOrModuleNotFoundError: If no source file is found for the module.
+        SyntaxError: If the source code is not valid Python.
+
+    Returns:
+        StaticModule: Parsed module.
+    """
+    if path is None:
+        path = find_module_file(name)
+        if path is None:
+            raise ModelOrModuleNotFoundError(f"No source file found for module '{name}'.")
+    path = Path(path)
+    tree = ast.parse(path.read_bytes(), filename=str(path))
+    return _ModuleParser(name, is_package=path.name == "__init__.py").parse(tree, path)
+
+
+def parse_modules(
+    names: Iterable[str], max_workers: Optional[int] = None
+) -> dict[str, Optional[StaticModule]]:
+    """Parse the source code of many modules, in parallel using a pool of processes. Modules
+    without a source file or with invalid source code are logged and skipped.
+
+    Args:
+        names (Iterable[str]): Fully qualified names of modules.
+        max_workers (int | None, optional): Maximum number of worker processes. If 1, modules are
+            parsed in the current process. Defaults to None, which uses the number of processors.
+
+    Returns:
+        dict[str, StaticModule | None]: Mapping of module names to parsed modules, or to None for
+            modules that could not be parsed.
+    """
+    # Source files are looked up here so that workers do not depend on this process's sys.path
+    paths = {name: find_module_file(name) for name in dict.fromkeys(names)}
+    results: dict[str, Optional[StaticModule]] = dict.fromkeys(paths)
+    to_parse = [(name, path) for name, path in paths.items() if path is not None]
+    if max_workers == 1 or len(to_parse) <= 1:
+        results.update((name, _parse_module_or_none(name, path)) for name, path in to_parse)
+    else:
+        # Lazy import so that multiprocessing is only imported when it is used
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Parsing one module is fast, so send modules to workers in chunks
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(to_parse) // (workers * 4))
+            parsed = executor.map(_parse_module_or_none, *zip(*to_parse), chunksize=chunksize)
+            results.update(zip((name for name, _ in to_parse), parsed))
+    return results
+
+
+def _parse_module_or_none(name: str, path: Path) -> Optional[StaticModule]:
+    """Parse a module, logging and returning None on errors. Runs in worker processes."""
+    try:
+        return parse_module(name, path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.warning("Failed to parse module '%s' from %s: %s", name, path, e)
+        return None
+
+
+class _ResolvedModel(NamedTuple):
+    """A class that static analysis identified as a data model class, with inherited fields."""
+
+    full_name: FullyQualifiedName
+    plugin: str
+    fields: dict[str, StaticField]
+    docstring: Optional[str]
+
+
+class StaticAnalyzer:
+    """Identifies data model classes from parsed modules. Modules are parsed when they are first
+    needed, e.g., to resolve a base class or a field's type, and parsed modules are kept for
+    later lookups.
+
+    Modules in the standard library and in the packages of supported data modeling frameworks are
+    never parsed.
+
+    Args:
+        max_workers (int | None, optional): Maximum number of worker processes used by
+            [`parse`][erdantic.static.StaticAnalyzer.parse]. Defaults to 1, which parses modules
+            in the current process.
+
+    Attributes:
+        modules (dict[str, StaticModule | None]): Parsed modules by name, with None for modules
+            that could not be parsed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = 1):
+        self.max_workers = max_workers
+        self.modules: dict[str, Optional[StaticModule]] = {}
+        self._models: dict[str, Optional[_ResolvedModel]] = {}
+
+    def parse(self, names: Iterable[str]) -> None:
+        """Parse modules that have not been parsed yet, in parallel if enabled.
+
+        Args:
+            names (Iterable[str]): Fully qualified names of modules.
+        """
+        to_parse = []
+        for name in names:
+            if name in self.modules:
+                continue
+            if _is_skipped_module(name):
+                self.modules[name] = None
+            else:
+                to_parse.append(name)
+        if to_parse:
+            self.modules.update(parse_modules(to_parse, max_workers=self.max_workers))
+
+    def get_module(self, name: str) -> Optional[StaticModule]:
+        """Return a parsed module, parsing it if necessary.
+
+        Args:
+            name (str): Fully qualified name of the module.
+
+        Returns:
+            StaticModule | None: Parsed module, or None if it could not be parsed.
+        """
+        self.parse([name])
+        return self.modules[name]
+
+    def find_class(
+        self, name: str, _seen: Optional[set[str]] = None
+    ) -> Optional[tuple[StaticModule, StaticClass]]:
+        """Find the definition of a class by a fully qualified name, following re-exports.
+
+        Args:
+            name (str): Fully qualified name that refers to the class.
+
+        Returns:
+            tuple[StaticModule, StaticClass] | None: Module that defines the class, and the class.
+                None if the name does not refer to a class in a parsed module.
+        """
+        seen = _seen if _seen is not None else set()
+        if name in seen:
+            return None
+        seen.add(name)
+        parts = name.split(".")
+        # Try the longest module name first, e.g., 'a.b' with 'C' before 'a' with 'b.C'
+        for i in range(len(parts) - 1, 0, -1):
+            module = self.get_module(".".join(parts[:i]))
+            if module is None:
+                continue
+            qual_name = ".".join(parts[i:])
+            if qual_name in module.classes:
+                return module, module.classes[qual_name]
+            head, _, rest = qual_name.partition(".")
+            if head in module.imports:
+                target = module.imports[head] + (f".{rest}" if rest else "")
+                return self.find_class(target, seen)
+            return None
+        return None
+
+    def get_model(self, name: str) -> Optional[_ResolvedModel]:
+        """Identify the data model class referred to by a fully qualified name."""
+        if name not in self._models:
+            # Placeholder guards against cyclic base classes
+            self._models[name] = None
+            self._models[name] = self._resolve_model(name)
+        return self._models[name]
+
+    def find_models(
+        self, module_name: str, limit_search_models_to: Optional[Collection[str]] = None
+    ) -> Iterator[ModelInfo]:
+        """Static counterpart of [`find_models`][erdantic.convenience.find_models]: yields the
+        data model classes defined at the top level of a module.
+
+        Args:
+            module_name (str): Fully qualified name of the module.
+            limit_search_models_to (Collection[str] | None, optional): Plugin identifiers to
+                limit to. Defaults to None which will not impose any limits.
+
+        Raises:
+            ModelOrModuleNotFoundError: If the module's source could not be parsed.
+
+        Yields:
+            ModelInfo: Information about each data model class found.
+        """
+        module = self.get_module(module_name)
+        if module is None:
+            raise ModelOrModuleNotFoundError(f"Unable to parse module '{module_name}'.")
+        for qual_name in module.classes:
+            if "." in qual_name:
+                continue
+            model = self.get_model(f"{module.name}.{qual_name}")
+            if model is None:
+                continue
+            if limit_search_models_to is not None and model.plugin not in limit_search_models_to:
+                continue
+            logger.debug("Found data model class '%s' in module '%s'", qual_name, module.name)
+            yield _to_model_info(model)
+
+    def _resolve_model(self, name: str) -> Optional[_ResolvedModel]:
+        found = self.find_class(name)
+        if found is None:
+            return None
+        module, cls = found
+        full_name = f"{module.name}.{cls.qual_name}"
+        if full_name != name:
+            return self.get_model(full_name)
+        parents = [
+            parent
+            for parent in (
+                self.get_model(base) for base in cls.bases if base not in _FRAMEWORK_BASES
+            )
+            if parent is not None
+        ]
+        plugin = cls.plugin or next((parent.plugin for parent in parents), None)
+        if plugin is None:
+            return None
+        fields: dict[str, StaticField] = {}
+        # Earlier base classes take precedence, like in the method resolution order
+        for parent in reversed(parents):
+            fields.update(parent.fields)
+        if cls.plugin is not None or plugin not in ("attrs", "dataclasses"):
+            # A subclass of a dataclass or attrs class that is not itself decorated only has the
+            # fields of its parents
+            for field in cls.fields:
+                fields[field.name] = field
+        if plugin in ("pydantic", "pydantic_v1"):
+            # Underscore attributes are private attributes in Pydantic
+            fields = {name: field for name, field in fields.items() if not name.startswith("_")}
+        docstring = cls.docstring or next(
+            (parent.docstring for parent in parents if parent.docstring), None
+        )
+        return _ResolvedModel(
+            full_name=FullyQualifiedName(module=module.name, qual_name=cls.qual_name),
+            plugin=plugin,
+            fields=fields,
+            docstring=docstring,
+        )
+
+
+def find_models_static(
+    module_name: str,
+    limit_search_models_to: Optional[Collection[str]] = None,
+) -> list[ModelInfo]:
+    """Find the data model classes defined at the top level of a module by parsing its source
+    code, without importing it. Base classes from other modules are resolved by parsing those
+    modules too.
+
+    Args:
+        module_name (str): Fully qualified name of the module.
+        limit_search_models_to (Collection[str] | None, optional): Plugin identifiers to limit to.
+            Defaults to None which will not impose any limits.
+
+    Raises:
+        ModelOrModuleNotFoundError: If the module's source could not be parsed.
+
+    Returns:
+        list[ModelInfo]: Information about each data model class found, in source order. Their
+            fields' type names are the annotations from the source code.
+    """
+    analyzer = StaticAnalyzer()
+    return list(analyzer.find_models(module_name, limit_search_models_to=limit_search_models_to))
+
+
+def create_static(
+    *models_or_modules: str,
+    terminal_models: Collection[str] = (),
+    limit_search_models_to: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+    max_workers: Optional[int] = 1,
+) -> EntityRelationshipDiagram:
+    """Static counterpart of [`create`][erdantic.convenience.create]: create an entity
+    relationship diagram by parsing source code instead of importing modules. Data model classes
+    and modules are given by their fully qualified names. The given modules are parsed first, in
+    parallel if enabled, and other modules are parsed when their classes are referenced.
+
+    Args:
+        *models_or_modules (str): Fully qualified names of data model classes to add to diagram,
+            or modules to search for data model classes.
+        terminal_models (Collection[str]): Fully qualified names of data model classes to set as
+            terminal nodes. erdantic will stop recursing when it reaches these models.
+        limit_search_models_to (Collection[str] | None): Plugin identifiers to limit to when
+            searching modules for data model classes. Defaults to None which will not impose any
+            limits.
+        max_depth (int | None): Maximum number of relationships to follow from each given data
+            model class. Defaults to None, which follows all relationships.
+        max_workers (int | None, optional): Maximum number of worker processes for parsing the
+            given modules. Defaults to 1, which parses modules in the current process.
+
+    Raises:
+        ModelOrModuleNotFoundError: If a name does not refer to a parsable module or to a data
+            model class.
+
+    Returns:
+        EntityRelationshipDiagram: Diagram object for given data model.
+    """
+    analyzer = StaticAnalyzer(max_workers=max_workers)
+    analyzer.parse(models_or_modules)
+    diagram = EntityRelationshipDiagram()
+
+    def add(name: str) -> str:
+        model = analyzer.get_model(name)
+        if model is None:
+            raise ModelOrModuleNotFoundError(
+                f"'{name}' is not a module or data model class that can be parsed."
+            )
+        key = str(model.full_name)
+        if key not in diagram.models:
+            diagram.models[key] = _to_model_info(model)
+        return key
+
+    terminal_keys = {add(name) for name in terminal_models}
+    queue: deque[tuple[str, int]] = deque()
+    for name in models_or_modules:
+        if analyzer.modules.get(name) is not None:
+            for model_info in analyzer.find_models(name, limit_search_models_to):
+                queue.append((add(str(model_info.full_name)), 0))
+        else:
+            queue.append((add(name), 0))
+
+    # Breadth-first, so that each model is searched at its smallest depth
+    searched: set[str] = set()
+    while queue:
+        key, depth = queue.popleft()
+        if key in searched or key in terminal_keys:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            continue
+        searched.add(key)
+        model = analyzer.get_model(key)
+        assert model is not None
+        for field in model.fields.values():
+            # Combine references to the same target model, like Edge.from_field_info
+            targets: dict[str, bool] = {}
+            for arg in field.type_args:
+                target = analyzer.get_model(arg.name)
+                if target is not None:
+                    target_key = add(str(target.full_name))
+                    targets[target_key] = targets.get(target_key, False) or arg.is_collection
+            for target_key, is_collection in targets.items():
+                edge = _make_edge(
+                    model, field, diagram.models[target_key].full_name, is_collection
+                )
+                diagram.edges[edge.key] = edge
+                queue.append((target_key, depth + 1))
+    return diagram
+
+
+def _to_model_info(model: _ResolvedModel) -> ModelInfo:
+    description = str(model.full_name)
+    if model.docstring:
+        description += "\n\n" + model.docstring + "\n"
+    return ModelInfo(
+        full_name=model.full_name,
+        name=model.full_name.qual_name.split(".")[-1],
+        fields={
+            name: FieldInfo(model_full_name=model.full_name, name=name, type_name=field.type_name)
+            for name, field in model.fields.items()
+        },
+        description=description,
+    )
+
+
+def _make_edge(
+    model: _ResolvedModel,
+    field: StaticField,
+    target_full_name: FullyQualifiedName,
+    is_collection: bool,
+) -> Edge:
+    """Same logic as Edge.from_field_info, from statically analyzed type arguments."""
+    if is_collection:
+        cardinality = Cardinality.MANY
+    else:
+        cardinality = Cardinality.ONE
+    # Pydantic removes Annotated from field types, while other frameworks keep it, and
+    # is_nullable_type does not look inside it
+    is_nullable = field.is_nullable and (
+        not field.is_annotated or model.plugin in ("pydantic", "pydantic_v1")
+    )
+    if is_nullable:
+        modality = Modality.ZERO
+    else:
+        modality = Modality.UNSPECIFIED if is_collection else Modality.ONE
+    return Edge(
+        source_model_full_name=model.full_name,
+        source_field_name=field.name,
+        target_model_full_name=target_full_name,
+        target_cardinality=cardinality,
+        target_modality=modality,
+    )
+
+
+def _is_skipped_module(name: str) -> bool:
+    """Whether a module should not be parsed, because it is part of the standard library or of a
+    data modeling framework."""
+    top_level = name.partition(".")[0]
+    if top_level in _FRAMEWORK_PACKAGES or top_level in sys.builtin_module_names:
+        return True
+    path = find_module_file(top_level)
+    if path is None:
+        return False
+    return _is_stdlib_path(path)
+
+
+def _is_stdlib_path(path: Path) -> bool:
+    paths = sysconfig.get_paths()
+    resolved = str(path.resolve())
+    site_dirs = {os.path.realpath(paths[key]) for key in ("purelib", "platlib")}
+    if any(resolved.startswith(site_dir + os.sep) for site_dir in site_dirs):
+        return False
+    return resolved.startswith(os.path.realpath(paths["stdlib"]) + os.sep)
+
+
+class _ModuleParser:
+    """Collects the imports and class definitions of one module's syntax tree."""
+
+    def __init__(self, name: str, is_package: bool):
+        self.name = name
+        self.package = name if is_package else name.rpartition(".")[0]
+        self.imports: dict[str, str] = {}
+        self.local_classes: set[str] = set()
+
+    def parse(self, tree: ast.Module, path: Path) -> StaticModule:
+        class_nodes = []
+        for node in _iter_module_statements(tree.body):
+            if isinstance(node, ast.ClassDef):
+                self.local_classes.add(node.name)
+                class_nodes.append(node)
+        for node in _iter_module_statements(tree.body):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        self.imports[alias.asname] = alias.name
+                    else:
+                        head = alias.name.partition(".")[0]
+                        self.imports[head] = head
+            elif isinstance(node, ast.ImportFrom):
+                base = self._import_base(node)
+                for alias in node.names:
+                    if alias.name != "*":
+                        target = f"{base}.{alias.name}" if base else alias.name
+                        self.imports[alias.asname or alias.name] = target
+            elif (
+                isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, (ast.Name, ast.Attribute))
+            ):
+                # Simple aliases, e.g., 'Model = other_module.Model'
+                target = self.resolve(node.value)
+                if target is not None:
+                    self.imports[node.targets[0].id] = target
+        classes: dict[str, StaticClass] = {}
+        for node in class_nodes:
+            for cls in self._parse_class(node, prefix="", scope={}):
+                classes[cls.qual_name] = cls
+        return StaticModule(name=self.name, path=path, imports=self.imports, classes=classes)
+
+    def _import_base(self, node: ast.ImportFrom) -> str:
+        if not node.level:
+            return node.module or ""
+        parts = self.package.split(".") if self.package else []
+        if node.level > 1:
+            parts = parts[: len(parts) - (node.level - 1)]
+        if node.module:
+            parts.append(node.module)
+        return ".".join(parts)
+
+    def resolve(self, node: ast.expr, scope: Optional[dict[str, str]] = None) -> Optional[str]:
+        """Resolve a name or attribute expression to a fully qualified name."""
+        if isinstance(node, ast.Attribute):
+            value = self.resolve(node.value, scope)
+            return f"{value}.{node.attr}" if value is not None else None
+        if not isinstance(node, ast.Name):
+            return None
+        name = node.id
+        if scope and name in scope:
+            return scope[name]
+        if name in self.local_classes:
+            return f"{self.name}.{name}"
+        if name in self.imports:
+            target = self.imports[name]
+            if target.startswith("typing_extensions."):
+                target = "typing." + target[len("typing_extensions.") :]
+            return target
+        if hasattr(builtins, name):
+            return f"builtins.{name}"
+        return f"{self.name}.{name}"
+
+    def _parse_class(
+        self, node: ast.ClassDef, prefix: str, scope: dict[str, str]
+    ) -> Iterator[StaticClass]:
+        qual_name = prefix + node.name
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Subscript):
+                # Parametrized generic base class, e.g., 'BaseModel[T]'
+                base = base.value
+            resolved = self.resolve(base, scope)
+            if resolved is not None:
+                bases.append(resolved)
+        plugin = None
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            resolved = self.resolve(target, scope)
+            if resolved in _FRAMEWORK_DECORATORS:
+                plugin = _FRAMEWORK_DECORATORS[resolved]
+                break
+        if plugin is None:
+            plugin = next(
+                (_FRAMEWORK_BASES[base] for base in bases if base in _FRAMEWORK_BASES), None
+            )
+
+        nested_scope = {
+            stmt.name: f"{self.name}.{qual_name}.{stmt.name}"
+            for stmt in node.body
+            if isinstance(stmt, ast.ClassDef)
+        }
+        fields = []
+        for stmt in node.body:
+            if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                field = self._parse_field(stmt.target.id, stmt.annotation, nested_scope)
+                if field is not None:
+                    fields.append(field)
+        yield StaticClass(
+            qual_name=qual_name,
+            bases=bases,
+            plugin=plugin,
+            fields=fields,
+            docstring=ast.get_docstring(node),
+        )
+        for stmt in node.body:
+            if isinstance(stmt, ast.ClassDef):
+                yield from self._parse_class(stmt, prefix=f"{qual_name}.", scope=nested_scope)
+
+    def _parse_field(
+        self, name: str, annotation: ast.expr, scope: dict[str, str]
+    ) -> Optional[StaticField]:
+        annotation = _unquote(annotation)
+        origin = annotation.value if isinstance(annotation, ast.Subscript) else annotation
+        if self.resolve(origin, scope) in _EXCLUDED_FIELD_TYPES:
+            return None
+        type_args = list(self._analyze_type_args(annotation, scope, False, True))
+        is_nullable = self._is_nullable(annotation, scope)
+        is_annotated = (
+            isinstance(annotation, ast.Subscript)
+            and self.resolve(annotation.value, scope) == "typing.Annotated"
+        )
+        if isinstance(annotation, ast.Name):
+            type_name = annotation.id
+        else:
+            # Only annotations with module prefixes, strings, Annotated, or Union need to be
+            # rewritten
+            if any(
+                isinstance(node, (ast.Attribute, ast.Constant))
+                or (
+                    isinstance(node, ast.Subscript)
+                    and self.resolve(node.value, scope) in _REWRITTEN_TYPES
+                )
+                for node in ast.walk(annotation)
+            ):
+                annotation = _TypeNameTransformer(self, scope).visit(annotation)
+            type_name = ast.unparse(annotation)
+        return StaticField(
+            name=name,
+            type_name=type_name,
+            type_args=type_args,
+            is_nullable=is_nullable,
+            is_annotated=is_annotated,
+        )
+
+    def _analyze_type_args(
+        self, node: ast.expr, scope: dict[str, str], in_collection: bool, in_unions: bool
+    ) -> Iterator[StaticTypeArg]:
+        """Mirrors analyze_type_args, with the origins of generic types resolved by name."""
+        node = _unquote(node)
+        if isinstance(node, ast.Subscript):
+            origin = self.resolve(node.value, scope)
+            args = _subscript_args(node)
+            if origin == "typing.Literal":
+                return
+            if origin == "typing.Annotated":
+                args = args[:1]
+            elif in_unions:
+                if origin in _COLLECTION_TYPES:
+                    in_collection, in_unions = True, False
+                elif origin not in _UNION_TYPES:
+                    in_unions = False
+            for arg in args:
+                yield from self._analyze_type_args(arg, scope, in_collection, in_unions)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            for arg in (node.left, node.right):
+                yield from self._analyze_type_args(arg, scope, in_collection, in_unions)
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            # E.g., the parameters of 'Callable[[A, B], C]'
+            for arg in node.elts:
+                yield from self._analyze_type_args(arg, scope, in_collection, False)
+        else:
+            resolved = self.resolve(node, scope)
+            if resolved is not None:
+                yield StaticTypeArg(name=resolved, is_collection=in_collection)
+
+    def _is_nullable(self, node: ast.expr, scope: dict[str, str]) -> bool:
+        """Mirrors is_nullable_type: whether the annotation is a typing.Optional or typing.Union
+        that includes None. Like is_nullable_type, unions written with '|' are not nullable.
+        Annotated is unwrapped, like Pydantic does for field types."""
+        node = _unquote(node)
+        if isinstance(node, ast.Subscript):
+            origin = self.resolve(node.value, scope)
+            if origin == "typing.Annotated":
+                return self._is_nullable(_subscript_args(node)[0], scope)
+            if origin == "typing.Optional":
+                return True
+            if origin == "typing.Union":
+                return any(_is_none(_unquote(arg)) for arg in _subscript_args(node))
+        return False
+
+
+class _TypeNameTransformer(ast.NodeTransformer):
+    """Rewrites an annotation for display like typenames: removes module prefixes from names,
+    unquotes string annotations except for the values of Literal types, replaces Annotated
+    types with the type that they wrap, and renders unions with None as Optional."""
+
+    def __init__(self, parser: _ModuleParser, scope: dict[str, str]):
+        self.parser = parser
+        self.scope = scope
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        unquoted = _unquote(node)
+        return node if unquoted is node else self.visit(unquoted)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        return ast.copy_location(ast.Name(id=node.attr, ctx=node.ctx), node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        origin = self.parser.resolve(node.value, self.scope)
+        if origin == "typing.Literal":
+            node.value = self.visit(node.value)
+            return node
+        if origin == "typing.Annotated":
+            return self.visit(_subscript_args(node)[0])
+        if origin == "typing.Union":
+            args = _subscript_args(node)
+            others = [arg for arg in args if not _is_none(_unquote(arg))]
+            if others and len(others) < len(args):
+                inner: ast.expr = others[0]
+                if len(others) > 1:
+                    inner = ast.Subscript(
+                        value=ast.Name(id="Union", ctx=ast.Load()),
+                        slice=ast.Tuple(elts=others, ctx=ast.Load()),
+                        ctx=ast.Load(),
+                    )
+                node = ast.Subscript(
+                    value=ast.Name(id="Optional", ctx=ast.Load()), slice=inner, ctx=ast.Load()
+                )
+        return self.generic_visit(node)
+
+
+def _iter_module_statements(body: list[ast.stmt]) -> Iterator[ast.stmt]:
+    """Yield module-level statements, including those in 'if' and 'try' blocks, e.g.,
+    'if TYPE_CHECKING:' imports, but not in function or class bodies."""
+    for node in body:
+        if isinstance(node, ast.If):
+            yield from _iter_module_statements(node.body)
+            yield from _iter_module_statements(node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _iter_module_statements(node.body)
+            for handler in node.handlers:
+                yield from _iter_module_statements(handler.body)
+            yield from _iter_module_statements(node.orelse)
+            yield from _iter_module_statements(node.finalbody)
+        else:
+            yield node
+
+
+def _unquote(node: ast.expr) -> ast.expr:
+    """Parse a string annotation, i.e., a forward reference, into an expression."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            return ast.parse(node.value.strip(), mode="eval").body
+        except SyntaxError:
+            return node
+    return node
+
+
+def _subscript_args(node: ast.Subscript) -> list[ast.expr]:
+    if isinstance(node.slice, ast.Tuple):
+        return list(node.slice.elts)
+    return [node.slice]
+
+
+def _is_none(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and node.value is None
@@ -1,6 +1,16 @@
 import collections.abc
 import sys
-from typing import Any, ForwardRef, Iterator, Literal, TypeVar, Union, get_args, get_origin
+from typing import (
+    Any,
+    ForwardRef,
+    Iterator,
+    Literal,
+    NamedTuple,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from typenames import BaseNode, GenericNode, parse_type_tree
 
@@ -17,14 +27,19 @@ else:
     _TypeForm = TypeVar("_TypeForm", bound=Union[type, str, object])
 
 
+def _is_collection_origin(origin: Any) -> bool:
+    """Returns True if the origin of a generic type is a collection class."""
+    return isinstance(origin, type) and (
+        issubclass(origin, collections.abc.Container)
+        or issubclass(origin, collections.abc.Iterable)
+        or issubclass(origin, collections.abc.Sized)
+    )
+
+
 def _walk_type_tree(node: BaseNode, target: type) -> bool:
     """Recursively walk a type tree to check if type is many in target type."""
     if isinstance(node, GenericNode):
-        if isinstance(node.origin, type) and (
-            issubclass(node.origin, collections.abc.Container)
-            or issubclass(node.origin, collections.abc.Iterable)
-            or issubclass(node.origin, collections.abc.Sized)
-        ):
+        if _is_collection_origin(node.origin):
             # Check recursive args for target type
             return target in get_recursive_args(node.tp)
         elif node.origin is Union:
@@ -70,19 +85,7 @@ def get_recursive_args(tp: _TypeForm) -> list[_TypeForm]:
     """Recursively finds leaf-node types of possibly-nested generic type."""
 
     def recurse(t: _TypeForm) -> Iterator[_TypeForm]:
-        if isinstance(t, str):
-            raise _UnevaluatedForwardRefError(forward_ref=t)
-        elif isinstance(t, ForwardRef):
-            # Python < 3.14 caches an "evaluated" state on ForwardRef
-            if hasattr(t, "__forward_evaluated__"):
-                if t.__forward_evaluated__:
-                    t = t.__forward_value__  # type: ignore [assignment]
-                else:
-                    raise _UnevaluatedForwardRefError(forward_ref=t.__forward_arg__)
-            else:
-                # Python 3.14+ no longer exposes this evaluated state
-                raise _UnevaluatedForwardRefError(forward_ref=t.__forward_arg__)
-
+        t = _resolve_forward_ref(t)
         if get_origin(t) is Literal:
             yield t
             return
@@ -97,6 +100,78 @@ def get_recursive_args(tp: _TypeForm) -> list[_TypeForm]:
     return list(recurse(tp))
 
 
+class TypeArg(NamedTuple):
+    """A leaf-node type of a possibly-nested generic type, as returned by
+    [`analyze_type_args`][erdantic.typing_utils.analyze_type_args].
+
+    Attributes:
+        tp (Any): The leaf-node type.
+        is_collection (bool): Whether the type annotation represents a collection of many elements
+            of this type, with the same meaning as
+            [`is_collection_type_of`][erdantic.typing_utils.is_collection_type_of].
+    """
+
+    tp: Any
+    is_collection: bool
+
+
+def analyze_type_args(tp: _TypeForm) -> list[TypeArg]:
+    """Recursively finds leaf-node types of possibly-nested generic type, in the same order as
+    [`get_recursive_args`][erdantic.typing_utils.get_recursive_args], together with whether each
+    one is contained in a collection. This walks the type annotation once, rather than once per
+    target type like `is_collection_type_of`.
+
+    Args:
+        tp (Union[type, GenericAlias]): Type annotation.
+
+    Returns:
+        list[TypeArg]: Leaf-node types with whether they are contained in a collection.
+    """
+
+    def recurse(t: _TypeForm, in_collection: bool, in_unions: bool) -> Iterator[TypeArg]:
+        # in_unions: whether all enclosing generic types are unions, in which case a collection
+        # type here makes its leaf types many
+        t = _resolve_forward_ref(t)
+        origin = get_origin(t)
+        if origin is Literal:
+            yield TypeArg(t, in_collection)
+            return
+
+        args = get_args(t)
+        if args:
+            if in_unions:
+                if _is_collection_origin(origin):
+                    in_collection, in_unions = True, False
+                elif origin is not Union:
+                    in_unions = False
+            for arg in args:
+                yield from recurse(arg, in_collection, in_unions)
+        else:
+            yield TypeArg(t, in_collection)
+
+    return list(recurse(tp, False, True))
+
+
+def _resolve_forward_ref(t: _TypeForm) -> _TypeForm:
+    """Returns the evaluated value of a forward reference. Other types are returned unchanged.
+
+    Raises:
+        _UnevaluatedForwardRefError: If the forward reference has not been evaluated.
+    """
+    if isinstance(t, str):
+        raise _UnevaluatedForwardRefError(forward_ref=t)
+    elif isinstance(t, ForwardRef):
+        # Python < 3.14 caches an "evaluated" state on ForwardRef
+        if hasattr(t, "__forward_evaluated__"):
+            if t.__forward_evaluated__:
+                return t.__forward_value__  # type: ignore [return-value]
+            raise _UnevaluatedForwardRefError(forward_ref=t.__forward_arg__)
+        else:
+            # Python 3.14+ no longer exposes this evaluated state
+            raise _UnevaluatedForwardRefError(forward_ref=t.__forward_arg__)
+    return t
+
+
 def repr_type_with_mro(obj: Any) -> str:
     """Return MRO of object if it has one. Otherwise return its repr."""
 
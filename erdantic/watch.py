@@ -0,0 +1,306 @@
+"""Watch the source files of data model classes and re-render a diagram when they change.
+
+Source files are polled for changes to their modification times, so no additional dependencies
+are needed. When a module changes, it is reloaded together with the modules whose data model
+classes depend on it or inherit from its classes, directly or indirectly, so that their type
+annotations and base classes refer to the new classes. The diagram is then recreated with the
+[model info cache][erdantic.caching.ModelInfoCache] enabled, so only the models in reloaded modules
+are analyzed again, and it is only re-rendered if its output changed.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import sysconfig
+import time
+from types import ModuleType
+from typing import Callable, Collection, Iterable, Optional
+
+from erdantic.caching import model_info_cache
+from erdantic.core import EntityRelationshipDiagram
+
+logger = logging.getLogger(__name__)
+
+
+def diagram_modules(diagram: EntityRelationshipDiagram) -> set[str]:
+    """Return the names of the modules that define the data model classes in a diagram.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to get modules for.
+
+    Returns:
+        set[str]: Module names.
+    """
+    return {model_info.full_name.module for model_info in diagram.models.values()}
+
+
+def module_dependencies(diagram: EntityRelationshipDiagram) -> dict[str, set[str]]:
+    """Return the dependencies between the modules of a diagram's data model classes and of their
+    base classes. A module depends on another module if one of its models has a field that
+    references a model from the other module, or if one of its models has a base class from the
+    other module. Modules of base classes are only included if they are source files outside of
+    the standard library and installed packages, e.g., not the base classes of data modeling
+    frameworks.
+
+    Args:
+        diagram (EntityRelationshipDiagram): Diagram to get module dependencies for.
+
+    Returns:
+        dict[str, set[str]]: Mapping of module names to the names of modules they depend on.
+    """
+    dependencies: dict[str, set[str]] = {module: set() for module in diagram_modules(diagram)}
+    for model_info in diagram.models.values():
+        source = model_info.full_name.module
+        for base in model_info.raw_model.__mro__[1:]:
+            target = getattr(base, "__module__", None)
+            if target is None or target == source or not _is_local_module(target):
+                continue
+            dependencies.setdefault(target, set())
+            dependencies[source].add(target)
+    for edge in diagram.edges.values():
+        source = edge.source_model_full_name.module
+        target = edge.target_model_full_name.module
+        if source != target:
+            dependencies.setdefault(source, set()).add(target)
+    return dependencies
+
+
+def reload_order(changed: Iterable[str], dependencies: dict[str, set[str]]) -> list[str]:
+    """Determine which modules need to be reloaded when some modules have changed, and in what
+    order. These are the changed modules and all modules that depend on them, directly or
+    indirectly. Modules are ordered so that each module is reloaded after the modules it depends
+    on, except within dependency cycles.
+
+    Args:
+        changed (Iterable[str]): Names of changed modules.
+        dependencies (dict[str, set[str]]): Mapping of module names to the names of modules they
+            depend on, e.g., from [`module_dependencies`][erdantic.watch.module_dependencies].
+
+    Returns:
+        list[str]: Names of modules to reload, in order.
+    """
+    dependents: dict[str, set[str]] = {}
+    for module, deps in dependencies.items():
+        for dep in deps:
+            dependents.setdefault(dep, set()).add(module)
+    affected: set[str] = set()
+    stack = list(changed)
+    while stack:
+        module = stack.pop()
+        if module not in affected:
+            affected.add(module)
+            stack.extend(dependents.get(module, ()))
+
+    order: list[str] = []
+    visited: set[str] = set()
+
+    def visit(module: str):
+        if module in visited:
+            return
+        visited.add(module)
+        for dep in sorted(dependencies.get(module, ())):
+            if dep in affected:
+                visit(dep)
+        order.append(module)
+
+    for module in sorted(affected):
+        visit(module)
+    return order
+
+
+class ModuleWatcher:
+    """Polls the source files of modules for changes.
+
+    Attributes:
+        modules (set[str]): Names of watched modules.
+    """
+
+    def __init__(self, modules: Iterable[str] = ()):
+        self._mtimes: dict[str, Optional[int]] = {}
+        self.update(modules)
+
+    @property
+    def modules(self) -> set[str]:
+        return set(self._mtimes)
+
+    def update(self, modules: Iterable[str]) -> None:
+        """Set the watched modules. Modules that were already watched keep their recorded
+        modification times, so changes since the last check are not missed.
+
+        Args:
+            modules (Iterable[str]): Names of modules to watch. Modules that are not imported or
+                do not have a source file are ignored.
+        """
+        mtimes = {}
+        for module in modules:
+            if module in self._mtimes:
+                mtimes[module] = self._mtimes[module]
+            elif _source_file(module) is not None:
+                mtimes[module] = _mtime(module)
+        self._mtimes = mtimes
+
+    def changed(self) -> list[str]:
+        """Return the names of watched modules whose source files changed since the last check.
+
+        Returns:
+            list[str]: Names of changed modules.
+        """
+        changed = []
+        for module, mtime in self._mtimes.items():
+            new_mtime = _mtime(module)
+            if new_mtime != mtime:
+                self._mtimes[module] = new_mtime
+                changed.append(module)
+        return changed
+
+
+class DiagramWatcher:
+    """Recreates and re-renders a diagram when the source files of its data model classes change.
+    Call [`check`][erdantic.watch.DiagramWatcher.check] periodically, or use
+    [`watch`][erdantic.watch.watch] to do so in a loop.
+
+    Args:
+        create_fn (Callable[[], EntityRelationshipDiagram]): Function that creates the diagram. It
+            is called again after modules are reloaded, so it should import data model classes
+            and modules by name.
+        render_fn (Callable[[EntityRelationshipDiagram], None]): Function that renders the
+            diagram.
+        output_fn (Callable[[EntityRelationshipDiagram], str], optional): Function that returns
+            the output to compare to decide whether the diagram needs to be re-rendered. Defaults
+            to the diagram's DOT language representation.
+        modules (Collection[str], optional): Names of additional modules to watch, e.g., modules
+            that are searched for data model classes. Defaults to no additional modules.
+
+    Attributes:
+        diagram (EntityRelationshipDiagram | None): Most recently created diagram.
+    """
+
+    def __init__(
+        self,
+        create_fn: Callable[[], EntityRelationshipDiagram],
+        render_fn: Callable[[EntityRelationshipDiagram], None],
+        output_fn: Callable[[EntityRelationshipDiagram], str] = EntityRelationshipDiagram.to_dot,
+        modules: Collection[str] = (),
+    ):
+        self.create_fn = create_fn
+        self.render_fn = render_fn
+        self.output_fn = output_fn
+        self.extra_modules = set(modules)
+        self.diagram: Optional[EntityRelationshipDiagram] = None
+        self._output: Optional[str] = None
+        self._dependencies: dict[str, set[str]] = {}
+        self._watcher = ModuleWatcher()
+
+    def render(self) -> bool:
+        """Create the diagram and render it if its output changed since it was last rendered.
+
+        Returns:
+            bool: Whether the diagram was rendered.
+        """
+        diagram = self.create_fn()
+        self.diagram = diagram
+        self._dependencies = module_dependencies(diagram)
+        self._watcher.update(set(self._dependencies) | self.extra_modules)
+        output = self.output_fn(diagram)
+        if output == self._output:
+            logger.info("Diagram is unchanged. Skipping rendering.")
+            return False
+        self.render_fn(diagram)
+        self._output = output
+        return True
+
+    def check(self) -> bool:
+        """Check for changed source files. If any changed, reload the affected modules, then
+        recreate the diagram and re-render it if its output changed. Errors from reloading modules
+        or creating the diagram are logged, so that they can be fixed while watching.
+
+        Returns:
+            bool: Whether the diagram was rendered.
+        """
+        changed = self._watcher.changed()
+        if not changed:
+            return False
+        logger.info("Detected changes in modules: %s", ", ".join(sorted(changed)))
+        try:
+            for module in reload_order(changed, self._dependencies):
+                if module in sys.modules:
+                    logger.debug("Reloading module '%s'", module)
+                    importlib.reload(sys.modules[module])
+            return self.render()
+        except Exception:
+            logger.exception("Failed to update diagram. Waiting for further changes.")
+            return False
+
+
+def watch(
+    create_fn: Callable[[], EntityRelationshipDiagram],
+    render_fn: Callable[[EntityRelationshipDiagram], None],
+    output_fn: Callable[[EntityRelationshipDiagram], str] = EntityRelationshipDiagram.to_dot,
+    modules: Collection[str] = (),
+    interval: float = 1.0,
+) -> None:
+    """Render a diagram, then watch the source files of its data model classes and re-render it
+    when they change. Runs until interrupted with Ctrl+C. The
+    [model info cache][erdantic.caching.ModelInfoCache] is enabled while watching.
+
+    Args:
+        create_fn (Callable[[], EntityRelationshipDiagram]): Function that creates the diagram. It
+            is called again after modules are reloaded, so it should import data model classes
+            and modules by name.
+        render_fn (Callable[[EntityRelationshipDiagram], None]): Function that renders the
+            diagram.
+        output_fn (Callable[[EntityRelationshipDiagram], str], optional): Function that returns
+            the output to compare to decide whether the diagram needs to be re-rendered. Defaults
+            to the diagram's DOT language representation.
+        modules (Collection[str], optional): Names of additional modules to watch, e.g., modules
+            that are searched for data model classes. Defaults to no additional modules.
+        interval (float, optional): Time in seconds between checks for changes. Defaults to 1.
+    """
+    cache_was_enabled = model_info_cache.enabled
+    if not cache_was_enabled:
+        model_info_cache.enable()
+    try:
+        watcher = DiagramWatcher(create_fn, render_fn, output_fn=output_fn, modules=modules)
+        watcher.render()
+        logger.info("Watching for changes. Press Ctrl+C to stop.")
+        while True:
+            time.sleep(interval)
+            watcher.check()
+    except KeyboardInterrupt:
+        logger.info("Stopped watching.")
+    finally:
+        if not cache_was_enabled:
+            model_info_cache.disable()
+
+
+def _source_file(module: str) -> Optional[str]:
+    obj = sys.modules.get(module)
+    if not isinstance(obj, ModuleType):
+        return None
+    return getattr(obj, "__file__", None)
+
+
+def _is_local_module(module: str) -> bool:
+    """Whether a module has a source file that is not in the standard library or installed
+    packages, so that it may be edited while watching."""
+    path = _source_file(module)
+    if path is None:
+        return False
+    path = os.path.realpath(path)
+    paths = sysconfig.get_paths()
+    for key in ("stdlib", "platstdlib", "purelib", "platlib"):
+        directory = paths.get(key)
+        if directory and path.startswith(os.path.realpath(directory) + os.sep):
+            return False
+    return True
+
+
+def _mtime(module: str) -> Optional[int]:
+    path = _source_file(module)
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
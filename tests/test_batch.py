@@ -0,0 +1,104 @@
+import filecmp
+
+import pydantic
+import pytest
+
+import erdantic as erd
+from erdantic.batch import DrawJob, draw_batch, load_manifest
+from erdantic.caching import model_info_cache
+import erdantic.examples.dataclasses as dataclasses_examples
+import erdantic.examples.pydantic as pydantic_examples
+import erdantic.plugins
+
+
+def test_draw_job_validation(tmp_path):
+    job = DrawJob(
+        models_or_modules=[pydantic_examples.Party, dataclasses_examples],
+        terminal_models=pydantic_examples.Quest,
+        out=tmp_path / "diagram.png",
+    )
+    assert job.models_or_modules == [
+        "erdantic.examples.pydantic.Party",
+        "erdantic.examples.dataclasses",
+    ]
+    assert job.terminal_models == ["erdantic.examples.pydantic.Quest"]
+    assert job.out == [tmp_path / "diagram.png"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_draw_batch(tmp_path, max_workers):
+    expected = tmp_path / "expected.svg"
+    erd.draw(pydantic_examples.Party, out=expected)
+
+    jobs = [
+        DrawJob(models_or_modules=[pydantic_examples.Party], out=tmp_path / "party.svg"),
+        {
+            "models_or_modules": ["erdantic.examples.dataclasses"],
+            "out": [str(tmp_path / "dataclasses.svg"), str(tmp_path / "dataclasses.png")],
+        },
+        {"models_or_modules": ["erdantic.examples.not_a_module"], "out": tmp_path / "bad.svg"},
+    ]
+    results = draw_batch(jobs, max_workers=max_workers)
+
+    assert [result.success for result in results] == [True, True, False]
+    assert all(result.duration > 0 for result in results)
+    assert filecmp.cmp(tmp_path / "party.svg", expected, shallow=False)
+    assert (tmp_path / "dataclasses.svg").exists()
+    assert (tmp_path / "dataclasses.png").exists()
+    assert not (tmp_path / "bad.svg").exists()
+    assert results[2].error.startswith("erdantic.exceptions.ModelOrModuleNotFoundError")
+    assert "Traceback" in results[2].traceback
+    assert results[0].error is None
+
+
+def test_draw_batch_shares_model_infos(tmp_path, monkeypatch):
+    """Jobs run in the current process analyze data model classes shared between them once."""
+    extractions = []
+    get_fields_fn = erdantic.plugins.get_field_extractor_fn("pydantic")
+
+    def counting_get_fields_fn(model):
+        extractions.append(model)
+        return get_fields_fn(model)
+
+    monkeypatch.setitem(
+        erdantic.plugins._dict,
+        "pydantic",
+        (erdantic.plugins._dict["pydantic"][0], counting_get_fields_fn),
+    )
+    jobs = [
+        DrawJob(models_or_modules=[pydantic_examples.Party], out=tmp_path / "party.svg"),
+        DrawJob(models_or_modules=[pydantic_examples.Quest], out=tmp_path / "quest.svg"),
+        DrawJob(models_or_modules=[pydantic_examples], out=tmp_path / "pydantic.svg"),
+    ]
+    results = draw_batch(jobs, max_workers=1)
+
+    assert all(result.success for result in results)
+    assert sorted(model.__name__ for model in extractions) == [
+        "Adventurer",
+        "Party",
+        "Quest",
+        "QuestGiver",
+    ]
+    assert not model_info_cache.enabled
+    assert model_info_cache.cache_info().currsize == 0
+
+
+def test_load_manifest(tmp_path):
+    manifest = tmp_path / "manifest.toml"
+    manifest.write_text(
+        "[[diagrams]]\n"
+        'models_or_modules = ["erdantic.examples.pydantic.Party"]\n'
+        f'out = ["party.png", "{(tmp_path / "abs" / "party.svg").as_posix()}"]\n'
+        "max_depth = 1\n"
+    )
+    (job,) = load_manifest(manifest)
+    assert job.out == [tmp_path / "party.png", tmp_path / "abs" / "party.svg"]
+    assert job.max_depth == 1
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text('{"diagrams": [{"models_or_modules": ["a"], "out": "a.png", "x": 1}]}')
+    with pytest.raises(pydantic.ValidationError):
+        load_manifest(manifest)
+    manifest.write_text('[{"models_or_modules": ["a"], "out": "a.png"}]')
+    with pytest.raises(ValueError, match="diagrams"):
+        load_manifest(manifest)
@@ -0,0 +1,512 @@
+import dataclasses
+import gc
+import os
+import sys
+from typing import Annotated, Callable, Literal, Optional, Union
+import weakref
+
+import pygraphviz as pgv
+import pytest
+from typenames import typenames
+
+from erdantic.caching import (
+    RenderCache,
+    TypeNameCache,
+    _WeakKeyLRUCache,
+    analysis_cache,
+    default_cache_dir,
+    model_info_cache,
+    render_cache,
+)
+from erdantic.convenience import _create_by_name, create
+from erdantic.core import EntityRelationshipDiagram, ModelInfo
+from erdantic.examples.dataclasses import Adventurer, Party, Quest, QuestGiver
+import erdantic.plugins
+
+
+@pytest.fixture
+def enabled_render_cache(tmp_path):
+    render_cache.enable(directory=tmp_path / "render")
+    yield render_cache
+    render_cache.clear()
+    render_cache.disable()
+
+
+@pytest.fixture
+def enabled_cache():
+    model_info_cache.enable()
+    yield model_info_cache
+    model_info_cache.disable()
+
+
+@pytest.fixture
+def enabled_analysis_cache(tmp_path):
+    analysis_cache.enable(directory=tmp_path / "analysis")
+    yield analysis_cache
+    analysis_cache.clear()
+    analysis_cache.disable()
+
+
+ANALYSIS_MODELS_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Item:
+    name: str
+
+@dataclasses.dataclass
+class Inventory:
+    items: list[Item]
+"""
+
+
+@pytest.fixture
+def analysis_pkg_dir(tmp_path, monkeypatch):
+    """Create a package with a module of data model classes."""
+    pkg = tmp_path / "analysis_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "models.py").write_text(ANALYSIS_MODELS_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    yield pkg
+    for module in list(sys.modules):
+        if module.startswith("analysis_pkg"):
+            del sys.modules[module]
+
+
+def test_model_info_cache_disabled_by_default():
+    assert not model_info_cache.enabled
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    assert model_info_cache.cache_info().currsize == 0
+
+
+def test_model_info_cache(enabled_cache, monkeypatch):
+    diagram1 = EntityRelationshipDiagram()
+    diagram1.add_model(Party)
+    info = enabled_cache.cache_info()
+    assert info.hits == 0
+    assert info.currsize == 4
+    assert set(enabled_cache.cached_models()) == {Party, Adventurer, Quest, QuestGiver}
+
+    # Second diagram uses cached analysis without calling the field extractor
+    def fail(model):
+        raise AssertionError("Field extractor should not be called")
+
+    monkeypatch.setitem(
+        erdantic.plugins._dict,
+        "dataclasses",
+        (erdantic.plugins._dict["dataclasses"][0], fail),
+    )
+    diagram2 = EntityRelationshipDiagram()
+    diagram2.add_model(Party)
+    assert enabled_cache.cache_info().hits == 4
+    assert diagram2 == diagram1
+    assert diagram2.models["erdantic.examples.dataclasses.Party"].raw_model is Party
+
+    # Cached entries are copies, so modifying a diagram does not affect other diagrams
+    diagram2.models["erdantic.examples.dataclasses.Party"].description = "Modified"
+    diagram2.models["erdantic.examples.dataclasses.Party"].fields["name"].type_name = "Modified"
+    diagram3 = EntityRelationshipDiagram()
+    diagram3.add_model(Party)
+    assert diagram3 == diagram1
+
+    enabled_cache.clear()
+    assert enabled_cache.cache_info() == (0, 0, 1024, 0)
+
+
+def test_model_info_cache_lru_eviction(enabled_cache):
+    enabled_cache.enable(maxsize=2)
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    assert enabled_cache.cache_info().currsize == 2
+    # Least recently used models were evicted
+    assert enabled_cache.cached_models() == [Quest, QuestGiver]
+
+
+def test_model_info_cache_weak_keys(enabled_cache):
+    @dataclasses.dataclass
+    class Temporary:
+        value: int
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Temporary)
+    assert enabled_cache.cache_info().currsize == 1
+
+    del diagram, Temporary
+    gc.collect()
+    assert enabled_cache.cache_info().currsize == 0
+
+
+def test_model_info_cache_weak_annotations(enabled_cache, monkeypatch):
+    """Cached type annotations do not keep the classes they reference alive, and the names of
+    collected classes are pruned."""
+
+    @dataclasses.dataclass
+    class Related:
+        value: int
+
+    @dataclasses.dataclass
+    class Temporary:
+        # Not typing.Optional, since typing's own cache holds the classes it is subscripted with
+        related: list[Related]
+        mapping: dict[str, Related]
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Temporary)
+    assert enabled_cache.cache_info().currsize == 2
+    model_info = diagram.models[f"{__name__}.{Temporary.__qualname__}"]
+    raw_type_ref = weakref.ref(model_info.fields["related"].raw_type)
+
+    # Cached entries restore type annotations without calling the field extractor
+    def fail(model):
+        raise AssertionError("Field extractor should not be called")
+
+    with monkeypatch.context() as m:
+        m.setitem(
+            erdantic.plugins._dict,
+            "dataclasses",
+            (erdantic.plugins._dict["dataclasses"][0], fail),
+        )
+        diagram2 = EntityRelationshipDiagram()
+        diagram2.add_model(Temporary)
+    assert diagram2 == diagram
+    model_info2 = diagram2.models[f"{__name__}.{Temporary.__qualname__}"]
+    for name in ("related", "mapping"):
+        assert model_info2.fields[name].raw_type is model_info.fields[name].raw_type
+
+    del diagram, diagram2, model_info, model_info2, Temporary, Related
+    gc.collect()
+    assert enabled_cache.cache_info().currsize == 0
+    assert raw_type_ref() is None
+    assert enabled_cache._names == {}
+
+
+def test_model_info_cache_collected_annotation(enabled_cache):
+    """An entry whose type annotations were garbage collected is a miss."""
+
+    @dataclasses.dataclass
+    class Temporary:
+        value: int
+
+    model_info = ModelInfo.from_raw_model(Temporary)
+    # Annotation that is not held by the model class
+    model_info.fields["value"]._raw_type = list[int]
+    enabled_cache.set(Temporary, model_info)
+    assert enabled_cache.cache_info().currsize == 1
+
+    del model_info
+    gc.collect()
+    assert enabled_cache.get(Temporary, ModelInfo) is None
+    assert enabled_cache.cache_info() == (0, 1, 1024, 0)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="X | Y unions require Python 3.10+")
+def test_model_info_cache_union_type_annotations(enabled_cache):
+    """X | Y unions, which can't be weakly referenced, are reconstructed from their members."""
+
+    @dataclasses.dataclass
+    class Related:
+        value: int
+
+    @dataclasses.dataclass
+    class Temporary:
+        related: Related | None  # type: ignore [syntax]
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Temporary)
+    diagram2 = EntityRelationshipDiagram()
+    diagram2.add_model(Temporary)
+    assert enabled_cache.cache_info().hits == 2
+    assert diagram2 == diagram
+    field_info = diagram2.models[f"{__name__}.{Temporary.__qualname__}"].fields["related"]
+    assert field_info.raw_type == Related | None  # type: ignore [operator]
+
+
+def test_model_info_cache_redefinition(enabled_cache):
+    def define():
+        @dataclasses.dataclass
+        class Redefined:
+            value: int
+
+        return Redefined
+
+    Original = define()
+    EntityRelationshipDiagram().add_model(Original)
+    assert enabled_cache.cached_models() == [Original]
+
+    Redefined = define()
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Redefined)
+    assert enabled_cache.cached_models() == [Redefined]
+    assert next(iter(diagram.models.values())).raw_model is Redefined
+
+
+def test_model_info_cache_invalidated_by_register_plugin(enabled_cache, monkeypatch):
+    monkeypatch.setattr(erdantic.plugins, "_dict", erdantic.plugins._dict.copy())
+    EntityRelationshipDiagram().add_model(Party)
+    assert enabled_cache.cache_info().currsize == 4
+
+    erdantic.plugins.register_plugin("dataclasses", *erdantic.plugins._dict["dataclasses"])
+    assert enabled_cache.cache_info().currsize == 0
+
+
+def test_model_info_cache_model_info_subclass(enabled_cache):
+    class CustomModelInfo(ModelInfo):
+        pass
+
+    class CustomEntityRelationshipDiagram(EntityRelationshipDiagram):
+        models: erdantic.core.SortedDict[str, CustomModelInfo] = erdantic.core.SortedDict()
+
+    EntityRelationshipDiagram().add_model(Party)
+    diagram = CustomEntityRelationshipDiagram()
+    diagram.add_model(Party)
+    assert all(type(model_info) is CustomModelInfo for model_info in diagram.models.values())
+    assert enabled_cache.cache_info().currsize == 8
+
+
+def test_weak_key_lru_cache_unsupported_keys():
+    cache: _WeakKeyLRUCache[str] = _WeakKeyLRUCache(maxsize=None)
+    # int does not support weak references, list is unhashable
+    cache.set(1, "int")
+    cache.set([], "list")
+    assert cache.get(1) is None
+    assert cache.get([]) is None
+    assert cache.cache_info().currsize == 0
+
+
+def test_type_name_cache():
+    cache = TypeNameCache()
+    assert cache.typenames(Optional[str]) == typenames(Optional[str])
+    assert cache.typenames(Optional[str]) == typenames(Optional[str])
+    assert cache.typenames(list[int]) == "list[int]"
+    assert cache.typenames(list[int]) == "list[int]"
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert info.hit_rate == 0.5
+
+    # Options are part of the key
+    assert cache.typenames(Quest) == "erdantic.examples.dataclasses.Quest"
+    assert cache.typenames(Quest, remove_modules=["erdantic.examples.dataclasses"]) == "Quest"
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 4096, 0)
+    assert cache.cache_info().hit_rate == 0.0
+
+
+def test_type_name_cache_argument_order():
+    """Annotations that compare equal but render differently are cached separately."""
+    cache = TypeNameCache()
+    assert Union[int, str] == Union[str, int]
+    for tp in (Union[int, str], Union[str, int], Literal[1, 2], Literal[2, 1]):
+        assert cache.typenames(tp) == typenames(tp)
+    assert cache.cache_info().hits == 0
+    assert cache.typenames(Union[int, str]) != cache.typenames(Union[str, int])
+
+
+def test_type_name_cache_unhashable():
+    cache = TypeNameCache()
+    unhashable = Annotated[int, {"meta": "data"}]
+    assert cache.typenames(unhashable) == cache.typenames(unhashable)
+    assert cache.cache_info() == (0, 0, 4096, 0)
+
+    # Callable parameter lists are supported
+    assert cache.typenames(Callable[[int], str]) == cache.typenames(Callable[[int], str])
+    assert cache.cache_info().hits == 1
+
+
+def test_type_name_cache_does_not_pin_classes():
+    cache = TypeNameCache()
+
+    class Temporary:
+        pass
+
+    # Use builtin generics; typing special forms are cached (and pinned) by typing itself
+    cache.typenames(dict[str, list[Temporary]])
+    assert cache.cache_info().currsize == 1
+    ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert ref() is None
+
+
+def test_type_name_cache_maxsize_and_disable():
+    cache = TypeNameCache(maxsize=2)
+    for tp in (int, str, float):
+        cache.typenames(tp)
+    assert cache.cache_info().currsize == 2
+
+    cache.disable()
+    assert cache.typenames(int) == "int"
+    assert cache.cache_info() == (0, 0, 2, 0)
+    cache.enable(maxsize=None)
+    cache.typenames(int)
+    assert cache.cache_info() == (0, 1, None, 1)
+
+
+def test_render_cache(enabled_render_cache, tmp_path, monkeypatch):
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    diagram.draw(tmp_path / "first.png")
+    info = enabled_render_cache.cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+    assert info.currsize == (tmp_path / "first.png").stat().st_size
+
+    # Unchanged diagram skips layout
+    def fail(*args, **kwargs):
+        raise AssertionError("Graphviz should not be called")
+
+    monkeypatch.setattr(pgv.AGraph, "draw", fail)
+    diagram.draw(tmp_path / "second.png")
+    assert (tmp_path / "second.png").read_bytes() == (tmp_path / "first.png").read_bytes()
+    assert diagram._repr_png_() == (tmp_path / "first.png").read_bytes()
+    assert enabled_render_cache.cache_info().hits == 2
+
+    # Different format or attributes are different entries
+    with pytest.raises(AssertionError, match="Graphviz should not be called"):
+        diagram.draw(tmp_path / "first.svg")
+    with pytest.raises(AssertionError, match="Graphviz should not be called"):
+        diagram.draw(tmp_path / "third.png", graph_attr={"rankdir": "TB"})
+    monkeypatch.undo()
+
+    enabled_render_cache.clear()
+    assert enabled_render_cache.cache_info() == (0, 0, 256 * 1024 * 1024, 0)
+
+
+def test_render_cache_eviction(tmp_path):
+    cache = RenderCache()
+    assert cache.get("digraph {}", "png", "dot") is None
+    cache.enable(directory=tmp_path, max_bytes=10)
+    cache.set("a", "png", "dot", b"12345")
+    cache.set("b", "png", "dot", b"12345")
+    assert cache.cache_info().currsize == 10
+    os.utime(cache._path("a", "png", "dot", ""), (0, 0))
+    # Least recently used file is evicted
+    cache.set("c", "png", "dot", b"12345")
+    assert cache.get("a", "png", "dot") is None
+    assert cache.get("b", "png", "dot") == b"12345"
+    assert cache.get("c", "png", "dot") == b"12345"
+    assert cache.cache_info() == (2, 1, 10, 10)
+
+    cache.disable()
+    assert cache.get("b", "png", "dot") is None
+
+
+def test_default_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("ERDANTIC_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == tmp_path
+    monkeypatch.delenv("ERDANTIC_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "erdantic"
+
+
+def test_analysis_cache(enabled_analysis_cache, analysis_pkg_dir):
+    import analysis_pkg.models
+
+    diagram = create(analysis_pkg.models)
+    assert enabled_analysis_cache.cache_info()[:2] == (0, 1)
+    cached = create(analysis_pkg.models)
+    assert enabled_analysis_cache.cache_info()[:2] == (1, 1)
+    assert cached == diagram
+    assert cached is not diagram
+    assert cached.to_dot() == diagram.to_dot()
+
+    # Different arguments are different entries
+    create(analysis_pkg.models.Inventory)
+    assert enabled_analysis_cache.cache_info()[:2] == (1, 2)
+
+    # Looking up by name doesn't import anything
+    del sys.modules["analysis_pkg.models"]
+    assert _create_by_name(["analysis_pkg.models"]) == diagram
+    assert "analysis_pkg.models" not in sys.modules
+    assert enabled_analysis_cache.cache_info()[:2] == (2, 2)
+
+    # Touching a file without changing it keeps the entry
+    path = analysis_pkg_dir / "models.py"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _create_by_name(["analysis_pkg.models"]) == diagram
+    assert enabled_analysis_cache.cache_info()[:2] == (3, 2)
+
+    # Changing a file invalidates the entry
+    path.write_text(ANALYSIS_MODELS_SOURCE + "    count: int = 0\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    changed = _create_by_name(["analysis_pkg.models"])
+    assert enabled_analysis_cache.cache_info()[:2] == (3, 3)
+    assert list(changed.models["analysis_pkg.models.Inventory"].fields) == ["items", "count"]
+    assert _create_by_name(["analysis_pkg.models"]) == changed
+
+
+ANALYSIS_BASE_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Base:
+    id: int
+"""
+
+ANALYSIS_COMPONENTS_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Tag:
+    name: str
+"""
+
+ANALYSIS_ORDER_SOURCE = """\
+import dataclasses
+
+from analysis_pkg.base import Base
+from analysis_pkg.components import Tag
+
+@dataclasses.dataclass
+class Order(Base):
+    tags: list[Tag]
+"""
+
+
+@pytest.mark.parametrize("changed_module", ["base", "components"])
+def test_analysis_cache_other_modules(enabled_analysis_cache, analysis_pkg_dir, changed_module):
+    """Changing the module of a base class or of a model added to the diagram through a field
+    invalidates the entry."""
+    (analysis_pkg_dir / "base.py").write_text(ANALYSIS_BASE_SOURCE)
+    (analysis_pkg_dir / "components.py").write_text(ANALYSIS_COMPONENTS_SOURCE)
+    (analysis_pkg_dir / "order.py").write_text(ANALYSIS_ORDER_SOURCE)
+
+    diagram = _create_by_name(["analysis_pkg.order.Order"])
+    assert _create_by_name(["analysis_pkg.order.Order"]) == diagram
+    assert enabled_analysis_cache.cache_info()[:2] == (1, 1)
+
+    path = analysis_pkg_dir / f"{changed_module}.py"
+    stat = path.stat()
+    path.write_text(path.read_text() + "    extra: str\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    for module in list(sys.modules):
+        if module.startswith("analysis_pkg."):
+            del sys.modules[module]
+    changed = _create_by_name(["analysis_pkg.order.Order"])
+    assert enabled_analysis_cache.cache_info()[:2] == (1, 2)
+    assert changed != diagram
+    if changed_module == "base":
+        assert list(changed.models["analysis_pkg.order.Order"].fields) == ["id", "extra", "tags"]
+    else:
+        assert list(changed.models["analysis_pkg.components.Tag"].fields) == ["name", "extra"]
+
+
+def test_analysis_cache_not_cacheable(enabled_analysis_cache):
+    @dataclasses.dataclass
+    class Local:
+        name: str
+
+    create(Local)
+    create(Local)
+    assert enabled_analysis_cache.cache_info() == (0, 0, 256 * 1024 * 1024, 0)
+
+
+def test_analysis_cache_disabled_by_default(analysis_pkg_dir):
+    assert not analysis_cache.enabled
+    import analysis_pkg.models
+
+    create(analysis_pkg.models)
+    assert analysis_cache.cache_info()[:2] == (0, 0)
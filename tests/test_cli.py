@@ -1,6 +1,7 @@
 import filecmp
 import re
 import subprocess
+import textwrap
 
 import click
 import pytest
@@ -8,6 +9,7 @@ from typer.testing import CliRunner
 
 import erdantic as erd
 from erdantic._version import __version__
+from erdantic.caching import analysis_cache
 from erdantic.cli import app, import_object_from_name
 import erdantic.examples.dataclasses as examples_dataclasses
 import erdantic.examples.pydantic as examples_pydantic
@@ -189,6 +191,36 @@ def test_no_overwrite(tmp_path):
     assert path.stat().st_size > 0
 
 
+def test_multiple_out(tmp_path):
+    """Test rendering multiple files with repeated -o."""
+    expected_svg = tmp_path / "expected.svg"
+    erd.draw(Party, out=expected_svg)
+    paths = [tmp_path / "diagram.svg", tmp_path / "diagram.png"]
+    result = runner.invoke(
+        app, ["erdantic.examples.pydantic.Party", "-o", str(paths[0]), "-o", str(paths[1])]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert filecmp.cmp(paths[0], expected_svg, shallow=False)
+    assert paths[1].stat().st_size > 0
+
+    # No overwrite checks all paths
+    paths[0].unlink()
+    result = runner.invoke(
+        app,
+        [
+            "erdantic.examples.pydantic.Party",
+            "-o",
+            str(paths[0]),
+            "-o",
+            str(paths[1]),
+            "--no-overwrite",
+        ],
+    )
+    assert result.exit_code == 1
+    assert not paths[0].exists()
+
+
 def test_dot(tmp_path):
     result = runner.invoke(app, ["erdantic.examples.pydantic.Party", "-d"])
     print(result.output)
@@ -215,6 +247,243 @@ def test_dot(tmp_path):
     assert erd.to_dot(Party).strip() == result.stdout.strip()
 
 
+def test_text_out(tmp_path):
+    """Test writing --dot and --d2 output to a file with --text-out."""
+    diagram = erd.create(Party)
+    for flag, expected in (("--dot", diagram.to_dot()), ("--d2", diagram.to_d2())):
+        path = tmp_path / f"diagram{flag.replace('-', '.')}"
+        result = runner.invoke(
+            app, ["erdantic.examples.pydantic.Party", flag, "--text-out", str(path)]
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert path.read_text() == expected
+
+        # No overwrite
+        result = runner.invoke(
+            app,
+            ["erdantic.examples.pydantic.Party", flag, "--text-out", str(path), "--no-overwrite"],
+        )
+        assert result.exit_code == 1
+
+    # Requires --dot or --d2
+    path = tmp_path / "diagram.png"
+    result = runner.invoke(
+        app,
+        ["erdantic.examples.pydantic.Party", "-o", str(path), "--text-out", str(tmp_path / "x")],
+    )
+    assert result.exit_code == 1
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_manifest(tmp_path, jobs):
+    """Test rendering many diagrams from TOML and JSON manifests in one process."""
+    expected_svg = tmp_path / "expected.svg"
+    erd.draw(Party, out=expected_svg, graph_attr={"rankdir": "TB"})
+
+    toml_manifest = tmp_path / "manifest.toml"
+    toml_manifest.write_text(
+        "[[diagrams]]\n"
+        'models_or_modules = ["erdantic.examples.pydantic.Party"]\n'
+        'out = ["party.svg", "party.png"]\n'
+        'graph_attr = { rankdir = "TB" }\n'
+        "\n"
+        "[[diagrams]]\n"
+        'models_or_modules = ["erdantic.examples.dataclasses"]\n'
+        'out = "dataclasses.png"\n'
+    )
+    result = runner.invoke(app, ["--manifest", str(toml_manifest), "-j", jobs])
+    print(result.output)
+    assert result.exit_code == 0
+    assert filecmp.cmp(tmp_path / "party.svg", expected_svg, shallow=False)
+    assert (tmp_path / "party.png").exists()
+    assert (tmp_path / "dataclasses.png").exists()
+
+    # No overwrite checks all outputs before rendering
+    (tmp_path / "party.svg").unlink()
+    result = runner.invoke(app, ["--manifest", str(toml_manifest), "--no-overwrite"])
+    assert result.exit_code == 1
+    assert not (tmp_path / "party.svg").exists()
+
+    # JSON manifest with a failing entry renders the others but exits with an error
+    json_manifest = tmp_path / "manifest.json"
+    json_manifest.write_text(
+        '{"diagrams": ['
+        '{"models_or_modules": ["erdantic.examples.not_a_module"], "out": "bad.png"},'
+        '{"models_or_modules": ["erdantic.examples.pydantic.Party"], "out": "party.svg",'
+        ' "graph_attr": {"rankdir": "TB"}}'
+        "]}"
+    )
+    result = runner.invoke(app, ["--manifest", str(json_manifest), "-j", jobs])
+    print(result.output)
+    assert result.exit_code == 1
+    assert not (tmp_path / "bad.png").exists()
+    assert filecmp.cmp(tmp_path / "party.svg", expected_svg, shallow=False)
+
+
+def test_manifest_invalid(tmp_path):
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text("diagrams: []")
+    result = runner.invoke(app, ["--manifest", str(manifest)])
+    assert result.exit_code == 1
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text('{"diagrams": [{"out": "diagram.png"}]}')
+    result = runner.invoke(app, ["--manifest", str(manifest)])
+    assert result.exit_code == 1
+
+    result = runner.invoke(app, ["--manifest", str(manifest), "--dot"])
+    assert result.exit_code == 1
+
+
+def test_watch(tmp_path, monkeypatch):
+    """Test that --watch renders the diagram and keeps running until interrupted."""
+
+    def interrupt(interval):
+        assert interval == 0.5
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("erdantic.watch.time.sleep", interrupt)
+    expected = tmp_path / "expected.svg"
+    erd.draw(Party, out=expected)
+    path = tmp_path / "diagram.svg"
+    result = runner.invoke(
+        app,
+        [
+            "erdantic.examples.pydantic.Party",
+            "-o",
+            str(path),
+            "--watch",
+            "--watch-interval",
+            "0.5",
+        ],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert filecmp.cmp(path, expected, shallow=False)
+
+
+def test_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    args = ["erdantic.examples.pydantic", "-d", "--cache", "--cache-dir", str(cache_dir)]
+    expected = erd.create(examples_pydantic).to_dot()
+    try:
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0
+        assert result.stdout.strip() == expected.strip()
+        assert len(list(cache_dir.iterdir())) == 1
+
+        # Second run uses cached diagram
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0
+        assert result.stdout.strip() == expected.strip()
+        assert analysis_cache.cache_info().hits == 1
+    finally:
+        analysis_cache.clear()
+        analysis_cache.disable()
+
+    result = runner.invoke(app, args + ["--watch"])
+    assert result.exit_code == 1
+
+
+def test_recursive():
+    result = runner.invoke(app, ["erdantic.examples", "-d", "--recursive"])
+    assert result.exit_code == 0
+    assert "erdantic.examples.pydantic.Party" in result.stdout
+    assert "erdantic.examples.dataclasses.Party" in result.stdout
+
+    result = runner.invoke(app, ["erdantic.examples", "-d", "--recursive", "--static"])
+    assert result.exit_code == 1
+
+
+def test_static():
+    result = runner.invoke(app, ["erdantic.examples.pydantic", "-d", "--static"])
+    assert result.exit_code == 0
+    assert result.stdout.strip() == erd.create(examples_pydantic).to_dot().strip()
+
+    result = runner.invoke(app, ["erdantic.examples.pydantic", "-d", "--static", "--watch"])
+    assert result.exit_code == 1
+
+
+def test_focus():
+    diagram = erd.create(examples_pydantic)
+    result = runner.invoke(
+        app,
+        [
+            "erdantic.examples.pydantic",
+            "--focus",
+            "erdantic.examples.pydantic.Quest",
+            "--depth",
+            "1",
+            "--focus-direction",
+            "both",
+            "-d",
+        ],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    expected = diagram.subgraph("erdantic.examples.pydantic.Quest", depth=1, direction="both")
+    assert result.stdout.strip() == expected.to_dot().strip()
+
+    # --depth requires --focus
+    result = runner.invoke(app, ["erdantic.examples.pydantic", "--depth", "1", "-d"])
+    assert result.exit_code == 1
+
+
+def test_focus_not_in_diagram(caplog):
+    result = runner.invoke(app, ["erdantic.examples.pydantic", "--focus", "Quest", "-d"])
+    assert result.exit_code == 1
+    assert "--focus model 'Quest' is not in the diagram." in caplog.text
+    assert "Did you mean: erdantic.examples.pydantic.Quest" in caplog.text
+
+    caplog.clear()
+    result = runner.invoke(app, ["erdantic.examples.pydantic", "--focus", "xyz", "-d"])
+    assert result.exit_code == 1
+    assert "Specify models by their fully qualified names" in caplog.text
+
+
+def test_split(tmp_path):
+    out_dir = tmp_path / "diagrams"
+    result = runner.invoke(
+        app,
+        [
+            "erdantic.examples.pydantic",
+            "erdantic.examples.dataclasses",
+            "--split",
+            "module",
+            "--split-format",
+            "png",
+            "-j",
+            "2",
+            "-o",
+            str(out_dir),
+        ],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert sorted(path.name for path in out_dir.iterdir()) == [
+        "erdantic.examples.dataclasses.png",
+        "erdantic.examples.pydantic.png",
+        "index.html",
+    ]
+
+    # --no-overwrite
+    result = runner.invoke(
+        app,
+        ["erdantic.examples.pydantic", "--split", "module", "-o", str(out_dir), "--no-overwrite"],
+    )
+    assert result.exit_code == 1
+
+    # Requires single output directory
+    result = runner.invoke(
+        app,
+        ["erdantic.examples.pydantic", "--split", "component", "-o", "a", "-o", "b"],
+    )
+    assert result.exit_code == 1
+
+
 def test_list_plugins():
     result = runner.invoke(app, ["--list-plugins"])
     print(result.output)
@@ -230,6 +499,30 @@ def test_list_plugins_custom_plugin(custom_plugin):
     assert re.findall(rf"\[X\]\s*{key}", result.output)
 
 
+def test_import_lazy():
+    """Importing the CLI does not load pending core plugins or import the modules of commands that
+    are not used, and pending core plugins are still available to --limit-search-models-to."""
+    script = textwrap.dedent(
+        """\
+        import sys
+        import erdantic.cli
+        import erdantic.plugins
+        modules = ("attr", "msgspec", "pydantic.v1", "erdantic.batch", "erdantic.partition",
+                   "erdantic.static", "erdantic.watch")
+        for module in modules:
+            assert module not in sys.modules, module
+        assert "attrs" in erdantic.cli.AvailablePluginKeys.__members__
+        assert "msgspec" in erdantic.cli.AvailablePluginKeys.__members__
+        """
+    )
+    result = subprocess.run(
+        ["python", "-c", script],
+        capture_output=True,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
 def test_help():
     """Test the CLI with --help flag."""
     result = runner.invoke(app, ["--help"])
@@ -1,3 +1,6 @@
+import dataclasses
+from types import ModuleType
+
 import pytest
 
 from erdantic.convenience import create, find_models
@@ -33,6 +36,38 @@ def test_find_models():
         list(find_models(pydantic_examples, limit_search_models_to=["unknown_key"]))
 
 
+def test_find_models_namespace_only():
+    module = ModuleType("lazy_models")
+
+    @dataclasses.dataclass
+    class Second:
+        name: str
+
+    @dataclasses.dataclass
+    class First:
+        second: Second
+
+    for model in (Second, First):
+        model.__module__ = module.__name__
+        setattr(module, model.__name__, model)
+    module.Imported = pydantic_examples.Party
+    module.CONSTANT = 42
+
+    loaded = []
+
+    def lazy_getattr(name):
+        loaded.append(name)
+        raise AttributeError(name)
+
+    module.__getattr__ = lazy_getattr
+    module.__dir__ = lambda: ["Lazy", "First", "Second"]
+
+    # Classes are yielded in definition order, and lazily loaded attributes are not loaded
+    assert list(find_models(module)) == [Second, First]
+    assert list(find_models(module, limit_search_models_to=["pydantic"])) == []
+    assert loaded == []
+
+
 def test_create():
     expected = EntityRelationshipDiagram()
     expected.add_model(pydantic_examples.Party)
@@ -1,4 +1,5 @@
 import builtins
+import copy
 import dataclasses
 import filecmp
 import os
@@ -16,16 +17,22 @@ from erdantic.core import (
     EntityRelationshipDiagram,
     FieldInfo,
     FullyQualifiedName,
+    Modality,
     ModelInfo,
     SortedDict,
 )
 import erdantic.examples.dataclasses as dataclasses_examples
 from erdantic.examples.dataclasses import Adventurer, Party
 import erdantic.examples.pydantic as pydantic_examples
-from erdantic.exceptions import FieldNotFoundError, UnknownModelTypeError
+from erdantic.exceptions import (
+    FieldNotFoundError,
+    ModelNotInDiagramError,
+    UnknownModelTypeError,
+)
 import erdantic.plugins
 from erdantic.plugins.dataclasses import DataclassType
 from erdantic.typing_utils import is_nullable_type
+from tests.utils import assert_dot_equals
 
 if sys.version_info < (3, 14):
     ASSETS_SUBDIR = "py_lt_314"
@@ -76,6 +83,43 @@ def test_field_info_raw_type():
     assert field_info.raw_type == list[Adventurer]
 
 
+def test_field_info_raw_type_batch(monkeypatch):
+    """FieldInfo instances of a ModelInfo recover their raw types with one field extraction."""
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    diagram = EntityRelationshipDiagram.model_validate_json(diagram.model_dump_json())
+    model_info = diagram.models[str(FullyQualifiedName.from_object(Party))]
+
+    extractions = []
+    get_fields_fn = erdantic.plugins.get_field_extractor_fn("dataclasses")
+
+    def counting_get_fields_fn(model):
+        extractions.append(model)
+        return get_fields_fn(model)
+
+    monkeypatch.setitem(
+        erdantic.plugins._dict,
+        "dataclasses",
+        (erdantic.plugins._dict["dataclasses"][0], counting_get_fields_fn),
+    )
+    assert model_info.fields["members"].raw_type == list[Adventurer]
+    assert model_info.fields["name"].raw_type is str
+    assert model_info.fields["formed_datetime"].raw_type == dataclasses_examples.datetime
+    assert extractions == [Party]
+
+
+@pytest.mark.parametrize("copy_fn", [lambda f: f.model_copy(), copy.deepcopy])
+def test_field_info_raw_type_copy(copy_fn):
+    """A copy of a FieldInfo of a deserialized ModelInfo recovers its own raw type."""
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    diagram = EntityRelationshipDiagram.model_validate_json(diagram.model_dump_json())
+    field_info = diagram.models[str(FullyQualifiedName.from_object(Party))].fields["name"]
+    field_info_copy = copy_fn(field_info)
+    assert field_info_copy.raw_type is str
+    assert field_info.raw_type is str
+
+
 def test_field_info_annotated():
     """FieldInfo should handle Annotated types. The type_name should not included metadata."""
 
@@ -217,6 +261,355 @@ def test_model_with_ellipsis():
     diagram.to_dot()
 
 
+def test_add_model_deep_composition_chain():
+    """Composition chains deeper than the recursion limit should be added without error."""
+    depth = sys.getrecursionlimit() * 2
+    models = []
+    next_model = None
+    for idx in reversed(range(depth)):
+        fields = [("next", Optional[next_model])] if next_model else []
+        next_model = dataclasses.make_dataclass(f"ChainNode{idx}", fields)
+        models.append(next_model)
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(models[-1])
+    assert len(diagram.models) == depth
+    assert len(diagram.edges) == depth - 1
+
+
+def test_add_model_max_depth():
+    """max_depth should limit how many relationships are followed from the given model."""
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(pydantic_examples.Party, max_depth=0)
+    assert [m.name for m in diagram.models.values()] == ["Party"]
+    assert len(diagram.edges) == 0
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(pydantic_examples.Party, max_depth=1)
+    assert {m.name for m in diagram.models.values()} == {"Party", "Adventurer", "Quest"}
+    # Models at the maximum depth are not searched, so there's no edge from Quest to QuestGiver
+    assert {
+        (e.source_field_name, e.target_model_full_name.qual_name) for e in diagram.edges.values()
+    } == {
+        ("members", "Adventurer"),
+        ("active_quest", "Quest"),
+    }
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(pydantic_examples.Party, max_depth=2)
+    expected = EntityRelationshipDiagram()
+    expected.add_model(pydantic_examples.Party)
+    assert diagram == expected
+
+
+def test_add_model_max_depth_shorter_path():
+    """A model first reached at the maximum depth should still be searched if it's later reached
+    via a shorter path."""
+
+    @dataclasses.dataclass
+    class Leaf:
+        name: str
+
+    @dataclasses.dataclass
+    class Middle:
+        leaf: Leaf
+
+    @dataclasses.dataclass
+    class Inner:
+        middle: Middle
+
+    @dataclasses.dataclass
+    class Root:
+        inner: Inner
+        middle: Middle
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Root, max_depth=2)
+    assert {m.name for m in diagram.models.values()} == {"Root", "Inner", "Middle", "Leaf"}
+    assert {
+        (e.source_model_full_name.qual_name.split(".")[-1], e.source_field_name)
+        for e in diagram.edges.values()
+    } == {("Root", "inner"), ("Root", "middle"), ("Inner", "middle"), ("Middle", "leaf")}
+
+
+def test_add_model_max_depth_shorter_path_below_limit():
+    """A model first reached via a longer path, but not at the maximum depth, should be searched
+    again if it's later reached via a shorter path."""
+
+    @dataclasses.dataclass
+    class E:
+        name: str
+
+    @dataclasses.dataclass
+    class D:
+        e: E
+
+    @dataclasses.dataclass
+    class C:
+        d: D
+
+    @dataclasses.dataclass
+    class B:
+        c: C
+
+    @dataclasses.dataclass
+    class A:
+        b: B
+
+    @dataclasses.dataclass
+    class Root:
+        a: A
+        b: B
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Root, max_depth=3)
+    assert {m.name for m in diagram.models.values()} == {"Root", "A", "B", "C", "D"}
+    assert ("D", "e") not in {
+        (e.source_model_full_name.qual_name.split(".")[-1], e.source_field_name)
+        for e in diagram.edges.values()
+    }
+
+
+def test_draw_many(tmp_path, monkeypatch):
+    """Rendering multiple files lays out the graph once, with the same output as draw."""
+    import pygraphviz.graphviz as gv
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Party)
+    for ext in ("svg", "png"):
+        diagram.draw(tmp_path / f"expected.{ext}")
+
+    layouts = []
+    gvLayout = gv.gvLayout
+
+    def counting_gvLayout(*args):
+        layouts.append(args)
+        return gvLayout(*args)
+
+    monkeypatch.setattr(gv, "gvLayout", counting_gvLayout)
+    outputs = [tmp_path / "diagram.svg", tmp_path / "diagram.png", tmp_path / "other.svg"]
+    diagram.draw_many(outputs)
+    assert len(layouts) == 1
+    for out in outputs:
+        assert filecmp.cmp(out, tmp_path / f"expected{out.suffix}", shallow=False)
+
+
+def test_edge_queries():
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Quest)
+    quest_key = "erdantic.examples.dataclasses.Quest"
+    quest_giver_key = "erdantic.examples.dataclasses.QuestGiver"
+    party_key = "erdantic.examples.dataclasses.Party"
+    assert [e.key for e in diagram.edges_from(dataclasses_examples.Quest)] == [
+        f"{quest_key}-giver-{quest_giver_key}"
+    ]
+    assert diagram.edges_to(quest_key) == []
+    assert diagram.neighbors(quest_giver_key) == [quest_key]
+
+    # Indexes are kept up to date as models are added
+    diagram.add_model(dataclasses_examples.Party)
+    assert [e.key for e in diagram.edges_to(quest_key)] == [
+        f"{party_key}-active_quest-{quest_key}"
+    ]
+    assert diagram.neighbors(quest_key) == [party_key, quest_giver_key]
+    assert diagram.neighbors(quest_key, direction="out") == [quest_giver_key]
+    assert diagram.neighbors(quest_key, direction="in") == [party_key]
+    assert diagram.neighbors(party_key, direction="out") == [
+        "erdantic.examples.dataclasses.Adventurer",
+        quest_key,
+    ]
+    assert [e for key in diagram.models for e in diagram.edges_from(key)] == list(
+        diagram.edges.values()
+    )
+
+    with pytest.raises(ModelNotInDiagramError):
+        diagram.edges_from("not.a.Model")
+    with pytest.raises(ValueError):
+        diagram.neighbors(quest_key, direction="sideways")  # type: ignore [arg-type]
+
+    # Indexes are rebuilt if edges are replaced
+    diagram.edges = SortedDict()
+    assert diagram.edges_to(quest_key) == []
+
+
+def test_edge_queries_direct_changes():
+    """Indexes are rebuilt if edges are changed directly, even if the number of edges stays the
+    same."""
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    quest_key = "erdantic.examples.dataclasses.Quest"
+    party_key = "erdantic.examples.dataclasses.Party"
+    assert diagram.neighbors(quest_key, direction="in") == [party_key]
+
+    edge = diagram.edges.pop(f"{party_key}-active_quest-{quest_key}")
+    new_edge = edge.model_copy(update={"source_field_name": "next_quest"})
+    diagram.edges[new_edge.key] = new_edge
+    assert [e.key for e in diagram.edges_to(quest_key)] == [new_edge.key]
+
+    # Changes made directly are also seen by diagram methods that update the indexes
+    diagram.edges.pop(new_edge.key)
+    diagram.edges[edge.key] = edge
+    diagram.remove_model(dataclasses_examples.Quest)
+    assert edge.key not in diagram.edges
+    assert diagram.edges_from(party_key) == [
+        e for e in diagram.edges.values() if str(e.source_model_full_name) == party_key
+    ]
+
+
+def test_subgraph():
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    quest_key = "erdantic.examples.dataclasses.Quest"
+
+    def model_names(d):
+        return {m.name for m in d.models.values()}
+
+    assert model_names(diagram.subgraph(dataclasses_examples.Quest)) == {"Quest", "QuestGiver"}
+    assert model_names(diagram.subgraph(quest_key, depth=0)) == {"Quest"}
+    assert model_names(diagram.subgraph(quest_key, direction="in")) == {"Party", "Quest"}
+    sub = diagram.subgraph([quest_key], depth=1, direction="both")
+    assert model_names(sub) == {"Party", "Quest", "QuestGiver"}
+    assert {e.source_field_name for e in sub.edges.values()} == {"active_quest", "giver"}
+    assert sub.models[quest_key] is diagram.models[quest_key]
+    assert sub.edges_to(quest_key) == diagram.edges_to(quest_key)
+    assert diagram.subgraph(dataclasses_examples.Party, direction="both") == diagram
+    sub = diagram.subgraph(
+        [dataclasses_examples.Adventurer, dataclasses_examples.QuestGiver], direction="in", depth=1
+    )
+    assert model_names(sub) == {"Party", "Adventurer", "Quest", "QuestGiver"}
+    # Edges between all selected models are included
+    assert sub == diagram
+
+    with pytest.raises(ModelNotInDiagramError):
+        diagram.subgraph("not.a.Model")
+    with pytest.raises(ValueError):
+        diagram.subgraph(quest_key, depth=0, direction="sideways")  # type: ignore [arg-type]
+
+
+def test_remove_model():
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    removed = diagram.remove_model(dataclasses_examples.Quest)
+    assert removed.name == "Quest"
+    assert {m.name for m in diagram.models.values()} == {"Party", "Adventurer", "QuestGiver"}
+    assert list(diagram.edges) == [
+        "erdantic.examples.dataclasses.Party-members-erdantic.examples.dataclasses.Adventurer"
+    ]
+
+    # Index is rebuilt when edges are changed directly
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    diagram.remove_model(dataclasses_examples.Adventurer)
+    diagram.add_model(dataclasses_examples.Adventurer)
+    edge = Edge.from_field_info(
+        dataclasses_examples.Adventurer,
+        diagram.models[str(FullyQualifiedName.from_object(dataclasses_examples.Party))].fields[
+            "members"
+        ],
+    )
+    diagram.edges[edge.key] = edge
+    diagram.remove_model("erdantic.examples.dataclasses.Adventurer")
+    assert {e.target_model_full_name.qual_name for e in diagram.edges.values()} == {
+        "Quest",
+        "QuestGiver",
+    }
+
+    with pytest.raises(ModelNotInDiagramError):
+        diagram.remove_model(dataclasses_examples.Adventurer)
+    with pytest.raises(ModelNotInDiagramError):
+        diagram.remove_model("not.a.Model")
+
+
+def test_refresh_model():
+    @dataclasses.dataclass
+    class Target:
+        name: str
+
+    @dataclasses.dataclass
+    class Other:
+        name: str
+
+    @dataclasses.dataclass
+    class Source:
+        target: Target
+
+    @dataclasses.dataclass
+    class Parent:
+        source: Source
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(Parent)
+
+    @dataclasses.dataclass
+    class Source:  # type: ignore [no-redef]
+        target: Optional[Target]
+        others: List[Other]
+
+    diagram.refresh_model(Source)
+    expected = EntityRelationshipDiagram()
+    expected.add_model(Source)
+    expected.add_model(Parent)
+    assert diagram == expected
+    (target_edge,) = [e for e in diagram.edges.values() if e.source_field_name == "target"]
+    assert target_edge.target_modality == Modality.ZERO
+
+    # Without recursion, only edges to models already in the diagram are added
+    diagram.remove_model(Other)
+    diagram.refresh_model(Source, recurse=False)
+    assert {m.name for m in diagram.models.values()} == {"Parent", "Source", "Target"}
+    assert {e.source_field_name for e in diagram.edges.values()} == {"source", "target"}
+
+    # Refresh by name imports the class
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    expected = diagram.model_copy(deep=True)
+    diagram.refresh_model("erdantic.examples.dataclasses.Party")
+    assert diagram == expected
+
+
+def test_replace_model():
+    @dataclasses.dataclass
+    class Reward:
+        amount: int
+
+    @dataclasses.dataclass
+    class NewQuest:
+        giver: dataclasses_examples.QuestGiver
+        reward: Optional[Reward]
+
+    diagram = EntityRelationshipDiagram()
+    diagram.add_model(dataclasses_examples.Party)
+    diagram.replace_model(dataclasses_examples.Quest, NewQuest)
+    assert {m.name for m in diagram.models.values()} == {
+        "Party",
+        "Adventurer",
+        "NewQuest",
+        "QuestGiver",
+        "Reward",
+    }
+    assert {
+        (
+            e.source_model_full_name.qual_name.split(".")[-1],
+            e.source_field_name,
+            e.target_model_full_name.qual_name.split(".")[-1],
+        )
+        for e in diagram.edges.values()
+    } == {
+        ("Party", "members", "Adventurer"),
+        ("Party", "active_quest", "NewQuest"),
+        ("NewQuest", "giver", "QuestGiver"),
+        ("NewQuest", "reward", "Reward"),
+    }
+    (quest_edge,) = [e for e in diagram.edges.values() if e.source_field_name == "active_quest"]
+    assert quest_edge.target_modality == Modality.ZERO
+
+    # Diagram is unchanged if the new model is not a model
+    expected = diagram.model_copy(deep=True)
+    with pytest.raises(UnknownModelTypeError):
+        diagram.replace_model(NewQuest, int)
+    assert diagram == expected
+
+
 def test_model_with_no_fields():
     """Model with no fields should not error."""
 
@@ -465,9 +858,10 @@ def test_subclass(caplog, outputs_dir, version_patch, reset_plugins):
         ).read_text()
 
     (out_dir / f"{filename}.dot").write_text(diagram.to_dot())
-    assert (out_dir / f"{filename}.dot").read_text() == (
-        expected_dir / f"{filename}.dot"
-    ).read_text()
+    # Graphviz wraps long lines, so compare the parsed graphs rather than the text
+    assert_dot_equals(
+        (out_dir / f"{filename}.dot").read_text(), (expected_dir / f"{filename}.dot").read_text()
+    )
 
     (out_dir / f"{filename}.json").write_text(diagram.model_dump_json(indent=2))
     assert (out_dir / f"{filename}.json").read_text() == (
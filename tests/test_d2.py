@@ -1,3 +1,5 @@
+import io
+
 import erdantic as erd
 from erdantic.core import Cardinality, Modality
 from erdantic.d2 import (
@@ -5,6 +7,7 @@ from erdantic.d2 import (
     _get_visibility_prefix,
     _maybe_quote_value,
     _quote_identifier,
+    iter_d2,
     render_d2,
 )
 from erdantic.examples import pydantic
@@ -34,6 +37,18 @@ def test_render_d2():
     assert "target-arrowhead.shape: cf-one-required" in d2_string
 
 
+def test_write_d2():
+    """Writing D2 incrementally gives the same output as rendering it to a string."""
+    diagram = erd.create(pydantic)
+    parts = list(iter_d2(diagram))
+    assert len(parts) == len(diagram.models) + len(diagram.edges)
+    assert "".join(parts) == render_d2(diagram)
+
+    fp = io.StringIO()
+    diagram.write_d2(fp)
+    assert fp.getvalue() == diagram.to_d2()
+
+
 def test_get_visibility_prefix():
     """Test visibility prefix determination."""
     assert _get_visibility_prefix("public_field") == "+"
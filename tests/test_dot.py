@@ -0,0 +1,74 @@
+import dataclasses
+import io
+
+import pygraphviz as pgv
+import pytest
+
+import erdantic as erd
+from erdantic.dot import iter_dot, quote_id, render_dot
+import erdantic.examples.attrs as attrs_examples
+import erdantic.examples.dataclasses as dataclasses_examples
+import erdantic.examples.msgspec as msgspec_examples
+import erdantic.examples.pydantic as pydantic_examples
+
+
+@pytest.mark.parametrize(
+    "examples_module",
+    [attrs_examples, dataclasses_examples, msgspec_examples, pydantic_examples],
+)
+def test_render_dot_matches_graphviz(examples_module):
+    """DOT written in pure Python is parsed by Graphviz to the same graph as to_graphviz."""
+    diagram = erd.create(examples_module)
+    kwargs = {
+        "graph_attr": {"label": 'A "quoted" label', "rankdir": "TB"},
+        "node_attr": {"fontsize": 10},
+        "edge_attr": {"color": "red"},
+    }
+    for attrs in ({}, kwargs):
+        dot = render_dot(diagram, **attrs)
+        assert pgv.AGraph(dot).string() == diagram.to_graphviz(**attrs).string()
+        assert diagram.to_dot(**attrs) == dot
+        assert "".join(iter_dot(diagram, **attrs)) == dot
+        fp = io.StringIO()
+        diagram.write_dot(fp, **attrs)
+        assert fp.getvalue() == dot
+
+
+@dataclasses.dataclass
+class Graph:
+    """A class with a field named with a DOT keyword and a "quoted" docstring."""
+
+    edge: "Graph"
+
+
+def test_render_dot_escaping():
+    diagram = erd.create(Graph)
+    graph = pgv.AGraph(render_dot(diagram))
+    assert graph.string() == diagram.to_graphviz().string()
+    node = graph.get_node(next(iter(diagram.models)))
+    assert '"quoted"' in node.attr["tooltip"]
+
+
+def test_quote_id():
+    assert quote_id("name") == "name"
+    assert quote_id("_name2") == "_name2"
+    assert quote_id(1.5) == "1.5"
+    assert quote_id("-.5") == "-.5"
+    assert quote_id("node") == '"node"'
+    assert quote_id("Digraph") == '"Digraph"'
+    assert quote_id("") == '""'
+    assert quote_id("a.b") == '"a.b"'
+    assert quote_id('say "hi"') == r'"say \"hi\""'
+    assert quote_id("<<b>html</b>>", html=True) == "<<b>html</b>>"
+    # Only labels are HTML strings, like in pygraphviz
+    assert quote_id("<x>") == '"<x>"'
+    # Backslashes are escaped before double quotes
+    assert quote_id('a\\"b') == r'"a\\\"b"'
+    assert quote_id("a\\") == r'"a\\"'
+
+
+def test_render_dot_tooltip_not_html():
+    diagram = erd.create(Graph)
+    dot = render_dot(diagram, node_attr={"tooltip": "<x>"})
+    assert 'tooltip="<x>"' in dot
+    assert pgv.AGraph(dot).string() == diagram.to_graphviz(node_attr={"tooltip": "<x>"}).string()
@@ -0,0 +1,73 @@
+import dataclasses
+import filecmp
+
+import pytest
+
+import erdantic as erd
+import erdantic.examples.dataclasses as dataclasses_examples
+import erdantic.examples.pydantic as pydantic_examples
+from erdantic.partition import INDEX_FILENAME, draw_partitioned, partition
+
+
+@dataclasses.dataclass
+class Owner:
+    name: str
+
+
+@dataclasses.dataclass
+class Pet:
+    owner: Owner
+    friend: pydantic_examples.Adventurer
+
+
+def test_partition_by_component():
+    diagram = erd.create(pydantic_examples, dataclasses_examples)
+    pieces = partition(diagram)
+    assert list(pieces) == [
+        "erdantic.examples.dataclasses.Adventurer",
+        "erdantic.examples.pydantic.Adventurer",
+    ]
+    assert pieces["erdantic.examples.pydantic.Adventurer"] == erd.create(pydantic_examples)
+    assert pieces["erdantic.examples.dataclasses.Adventurer"] == erd.create(dataclasses_examples)
+
+    with pytest.raises(ValueError, match="by must be"):
+        partition(diagram, by="size")
+
+
+def test_partition_by_module():
+    diagram = erd.create(Pet, pydantic_examples)
+    pieces = partition(diagram, by="module")
+    assert list(pieces) == ["erdantic.examples.pydantic", "tests.test_partition"]
+    assert pieces["erdantic.examples.pydantic"] == erd.create(pydantic_examples)
+    local = pieces["tests.test_partition"]
+    assert list(local.models) == [
+        "erdantic.examples.pydantic.Adventurer",
+        "tests.test_partition.Owner",
+        "tests.test_partition.Pet",
+    ]
+    assert list(local.edges) == [
+        "tests.test_partition.Pet-friend-erdantic.examples.pydantic.Adventurer",
+        "tests.test_partition.Pet-owner-tests.test_partition.Owner",
+    ]
+
+    pieces = partition(diagram, by="module", include_references=False)
+    local = pieces["tests.test_partition"]
+    assert list(local.models) == ["tests.test_partition.Owner", "tests.test_partition.Pet"]
+    assert list(local.edges) == ["tests.test_partition.Pet-owner-tests.test_partition.Owner"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_draw_partitioned(tmp_path, max_workers):
+    diagram = erd.create(pydantic_examples, dataclasses_examples)
+    paths = draw_partitioned(diagram, tmp_path / "out", by="module", max_workers=max_workers)
+    assert paths == {
+        "erdantic.examples.dataclasses": tmp_path / "out" / "erdantic.examples.dataclasses.svg",
+        "erdantic.examples.pydantic": tmp_path / "out" / "erdantic.examples.pydantic.svg",
+    }
+    expected = tmp_path / "expected.svg"
+    erd.draw(pydantic_examples, out=expected)
+    assert filecmp.cmp(paths["erdantic.examples.pydantic"], expected, shallow=False)
+
+    index = (tmp_path / "out" / INDEX_FILENAME).read_text()
+    assert '<a href="erdantic.examples.pydantic.svg">erdantic.examples.pydantic</a>' in index
+    assert "(4 models): Adventurer, Party, Quest, QuestGiver" in index
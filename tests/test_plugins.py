@@ -1,6 +1,10 @@
+import dataclasses
+import gc
 import subprocess
 import sys
 import textwrap
+from typing import Literal
+import weakref
 
 import pytest
 
@@ -92,7 +96,7 @@ def test_identify_field_extractor_fn():
 
 
 def test_core_plugins():
-    """Core plugins are loaded when erdantic is imported."""
+    """Core plugins are available when erdantic is imported."""
     expected_keys = ["attrs", "dataclasses", "pydantic", "msgspec"]
     if sys.version_info < (3, 14):
         expected_keys.append("pydantic_v1")
@@ -110,3 +114,225 @@ def test_core_plugins():
             universal_newlines=True,
         )
         assert result.returncode == 0, result.stderr
+
+
+def test_core_plugins_lazy():
+    """Importing erdantic does not import unused data modeling frameworks or rendering
+    dependencies. Core plugins are loaded once their framework is imported."""
+    script = textwrap.dedent(
+        """\
+        import sys
+        import erdantic
+        import erdantic.plugins
+        for module in ("attr", "msgspec", "pydantic.v1", "pygraphviz", "multiprocessing"):
+            assert module not in sys.modules, module
+        assert "attrs" not in erdantic.plugins._dict
+        import attrs
+        @attrs.define
+        class Model:
+            x: int
+        assert erdantic.plugins.identify_field_extractor_fn(Model) is not None
+        assert "attrs" in erdantic.plugins._dict
+        assert "msgspec" not in sys.modules
+        assert erdantic.plugins.get_predicate_fn("msgspec") is not None
+        assert "msgspec" in sys.modules
+        """
+    )
+    result = subprocess.run(
+        ["python", "-c", script],
+        capture_output=True,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_core_plugins_lazy_threads():
+    """Lazily loaded core plugins are identified correctly by concurrent threads, and core
+    plugins keep their precedence regardless of the order in which they are loaded."""
+    script = textwrap.dedent(
+        """\
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
+        import erdantic
+        import erdantic.plugins
+        import attrs
+        import msgspec
+        @attrs.define
+        class AttrsModel:
+            x: int
+        class MsgspecModel(msgspec.Struct):
+            x: int
+        models = [AttrsModel, MsgspecModel] * 16
+        barrier = threading.Barrier(len(models))
+        def identify(model):
+            barrier.wait()
+            return erdantic.plugins.identify_field_extractor_fn(model)
+        with ThreadPoolExecutor(max_workers=len(models)) as executor:
+            results = list(executor.map(identify, models))
+        assert all(result is not None for result in results), results
+        plugins = erdantic.plugins.list_plugins()
+        core_plugins = [plugin for plugin, _ in erdantic.plugins.CORE_PLUGINS]
+        assert plugins == core_plugins, plugins
+        """
+    )
+    for _ in range(3):
+        result = subprocess.run(
+            ["python", "-c", script],
+            capture_output=True,
+            universal_newlines=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+
+def test_identify_field_extractor_fn_cache(custom_plugin):
+    """Identification results are cached per type, including negative results, and the cache is
+    invalidated when a plugin is registered."""
+    key, base_model, predicate_fn, get_fields_fn = custom_plugin
+
+    calls = []
+
+    def counting_predicate_fn(obj):
+        calls.append(obj)
+        return predicate_fn(obj)
+
+    erdantic.plugins.register_plugin(key, counting_predicate_fn, get_fields_fn)
+
+    class MyModel(base_model): ...
+
+    class NotAModel: ...
+
+    for _ in range(3):
+        assert identify_field_extractor_fn(MyModel) == get_fields_fn
+        assert identify_field_extractor_fn(NotAModel) is None
+    assert calls.count(MyModel) == 1
+    assert calls.count(NotAModel) == 1
+
+    # Registering a plugin invalidates the cache
+    erdantic.plugins.register_plugin(key, counting_predicate_fn, get_fields_fn)
+    assert identify_field_extractor_fn(NotAModel) is None
+    assert calls.count(NotAModel) == 2
+
+
+def test_identify_field_extractor_fn_cache_weak_keys():
+    """The identification cache should not keep classes alive."""
+
+    @dataclasses.dataclass
+    class TemporaryModel:
+        name: str
+
+    assert identify_field_extractor_fn(TemporaryModel) is not None
+    ref = weakref.ref(TemporaryModel)
+    del TemporaryModel
+    gc.collect()
+    assert ref() is None
+
+
+def test_identify_field_extractor_fn_uncacheable():
+    """Objects that can't be weakly referenced or hashed can still be identified."""
+    assert identify_field_extractor_fn("NotAModel") is None
+    assert identify_field_extractor_fn(None) is None
+    assert identify_field_extractor_fn(Literal[[1]]) is None  # type: ignore [valid-type]
+
+
+@pytest.fixture()
+def indexed_plugins():
+    """Register custom plugins that use base classes and marker attributes, and clean them up."""
+    keys = ["test_base_class_plugin", "test_marker_attr_plugin"]
+    yield keys
+    for key in keys:
+        erdantic.plugins.register_plugin(key, lambda obj: False, lambda model: [])
+        del erdantic.plugins._dict[key]
+
+
+def test_register_plugin_indexed(indexed_plugins):
+    """Plugins registered with base classes or marker attributes are identified without calling
+    their predicate function."""
+    base_class_key, marker_attr_key = indexed_plugins
+
+    class CustomBase: ...
+
+    def predicate_fn(obj):
+        raise AssertionError("Predicate function should not be called.")
+
+    def get_fields_from_base_class_model(model):
+        return []
+
+    def get_fields_from_marker_attr_model(model):
+        return []
+
+    erdantic.plugins.register_plugin(
+        base_class_key,
+        predicate_fn=predicate_fn,
+        get_fields_fn=get_fields_from_base_class_model,
+        base_classes=[CustomBase],
+    )
+    erdantic.plugins.register_plugin(
+        marker_attr_key,
+        predicate_fn=predicate_fn,
+        get_fields_fn=get_fields_from_marker_attr_model,
+        marker_attrs=["__custom_marker__"],
+    )
+
+    class BaseClassModel(CustomBase): ...
+
+    class MarkerAttrModel:
+        __custom_marker__ = True
+
+    class ChildMarkerAttrModel(MarkerAttrModel): ...
+
+    class DisabledMarkerAttrModel:
+        __custom_marker__ = None
+
+    class BothModel(CustomBase):
+        __custom_marker__ = True
+
+    class ChildDisabledMarkerAttrModel(MarkerAttrModel):
+        __custom_marker__ = None
+
+    assert identify_field_extractor_fn(BaseClassModel) == get_fields_from_base_class_model
+    assert identify_field_extractor_fn(MarkerAttrModel) == get_fields_from_marker_attr_model
+    assert identify_field_extractor_fn(ChildMarkerAttrModel) == get_fields_from_marker_attr_model
+    assert identify_field_extractor_fn(DisabledMarkerAttrModel) is None
+    assert identify_field_extractor_fn(ChildDisabledMarkerAttrModel) is None
+    # Earlier registered plugin takes precedence
+    assert identify_field_extractor_fn(BothModel) == get_fields_from_base_class_model
+    # Instances are not model classes
+    assert identify_field_extractor_fn(BaseClassModel()) is None
+    assert identify_field_extractor_fn(MarkerAttrModel()) is None
+
+    # Re-registering without an index falls back to the predicate function
+    erdantic.plugins.register_plugin(
+        base_class_key,
+        predicate_fn=lambda obj: obj is BothModel,
+        get_fields_fn=get_fields_from_base_class_model,
+    )
+    assert identify_field_extractor_fn(BaseClassModel) is None
+    assert identify_field_extractor_fn(BothModel) == get_fields_from_base_class_model
+
+
+def test_find_plugin_key_predicates_after_indexed_match(custom_plugin):
+    """Predicate functions of plugins with lower precedence than an indexed match are not called,
+    and the ordered plugin keys are cached until a plugin is registered."""
+    key, base_model, predicate_fn, get_fields_fn = custom_plugin
+
+    calls = []
+
+    def counting_predicate_fn(obj):
+        calls.append(obj)
+        return predicate_fn(obj)
+
+    erdantic.plugins.register_plugin(key, counting_predicate_fn, get_fields_fn)
+
+    # Core pydantic plugin is indexed and takes precedence over the custom plugin
+    assert erdantic.plugins._find_plugin_key(erdantic.examples.pydantic.Party) == "pydantic"
+    assert calls == []
+
+    class MyModel(base_model): ...
+
+    assert erdantic.plugins._find_plugin_key(MyModel) == key
+    assert calls == [MyModel]
+
+    keys, _, _ = erdantic.plugins._plugin_precedence()
+    assert erdantic.plugins._plugin_precedence()[0] is keys
+    erdantic.plugins.register_plugin(key, predicate_fn, get_fields_fn)
+    assert erdantic.plugins._plugin_precedence()[0] is not keys
@@ -13,9 +13,11 @@ if sys.version_info < (3, 14):
 from erdantic.core import EntityRelationshipDiagram, FullyQualifiedName
 import erdantic.examples.pydantic as pydantic_examples
 from erdantic.exceptions import UnresolvableForwardRefError
+import erdantic.plugins.pydantic
 from erdantic.plugins.pydantic import (
     get_fields_from_pydantic_model,
     is_pydantic_model,
+    needs_model_rebuild,
 )
 
 
@@ -57,6 +59,44 @@ def test_get_fields_from_pydantic_model():
     assert fields[3].raw_type == Optional[pydantic_examples.Quest]
 
 
+def test_get_fields_from_pydantic_model_rebuild(monkeypatch):
+    class OtherModel(pydantic.BaseModel):
+        my_field: str
+
+    class Model(pydantic.BaseModel):
+        ref: OtherModel
+
+        # Model is not complete until it is first used
+        model_config = pydantic.ConfigDict(defer_build=True)
+
+    rebuilds = []
+    original_model_rebuild = Model.model_rebuild.__func__
+
+    def model_rebuild(cls, **kwargs):
+        rebuilds.append(cls)
+        return original_model_rebuild(cls, **kwargs)
+
+    monkeypatch.setattr(Model, "model_rebuild", classmethod(model_rebuild))
+
+    # Incomplete model is rebuilt
+    assert needs_model_rebuild(Model)
+    fields = get_fields_from_pydantic_model(Model)
+    assert fields[0].raw_type is OtherModel
+    assert rebuilds == [Model]
+
+    # Complete model is not rebuilt
+    assert not needs_model_rebuild(Model)
+    get_fields_from_pydantic_model(Model)
+    assert rebuilds == [Model]
+
+    # Unless forced
+    get_fields_from_pydantic_model(Model, force_rebuild=True)
+    assert rebuilds == [Model, Model]
+    monkeypatch.setattr(erdantic.plugins.pydantic, "FORCE_MODEL_REBUILD", True)
+    get_fields_from_pydantic_model(Model)
+    assert rebuilds == [Model, Model, Model]
+
+
 class GlobalOtherModelBefore(pydantic.BaseModel):
     """Another model to be referenced as a forward reference. Defined before the model that
     references it."""
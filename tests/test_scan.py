@@ -0,0 +1,108 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import erdantic as erd
+from erdantic.scan import scan_package
+
+A_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Item:
+    name: str
+"""
+
+B_SOURCE = """\
+import pydantic
+
+from scan_pkg.a import Item
+
+class Inventory(pydantic.BaseModel):
+    items: list[Item]
+
+class NotAModel:
+    pass
+"""
+
+
+@pytest.fixture()
+def scan_pkg_dir(tmp_path, monkeypatch):
+    """Create a package with a subpackage, a module that fails to import, and a __main__ module."""
+    pkg = tmp_path / "scan_pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "__main__.py").write_text("raise SystemExit('should not be imported')\n")
+    (pkg / "a.py").write_text(A_SOURCE)
+    (pkg / "broken.py").write_text("raise RuntimeError('broken module')\n")
+    (pkg / "sub" / "__init__.py").write_text("")
+    (pkg / "sub" / "b.py").write_text(B_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for module in list(sys.modules):
+        if module.startswith("scan_pkg"):
+            del sys.modules[module]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_scan_package(scan_pkg_dir, max_workers, caplog):
+    results = scan_package("scan_pkg", max_workers=max_workers)
+    assert [result.module for result in results] == [
+        "scan_pkg",
+        "scan_pkg.a",
+        "scan_pkg.broken",
+        "scan_pkg.sub",
+        "scan_pkg.sub.b",
+    ]
+    by_module = {result.module: result for result in results}
+    assert by_module["scan_pkg.a"].model_names == ["scan_pkg.a.Item"]
+    assert by_module["scan_pkg.sub.b"].model_names == ["scan_pkg.sub.b.Inventory"]
+    assert not by_module["scan_pkg.broken"].success
+    assert by_module["scan_pkg.broken"].error == "RuntimeError: broken module"
+    assert "Traceback" in by_module["scan_pkg.broken"].traceback
+    assert all(result.success for name, result in by_module.items() if name != "scan_pkg.broken")
+    assert all(result.duration >= 0 for result in results)
+    assert "Failed to import module 'scan_pkg.broken'" in caplog.text
+
+    results = scan_package("scan_pkg", limit_search_models_to=["pydantic"], max_workers=1)
+    assert [name for result in results for name in result.model_names] == [
+        "scan_pkg.sub.b.Inventory"
+    ]
+
+
+def test_create_recursive(scan_pkg_dir):
+    import scan_pkg
+
+    assert erd.create(scan_pkg).models == {}
+    diagram = erd.create(scan_pkg, recursive=True)
+    assert list(diagram.models) == ["scan_pkg.a.Item", "scan_pkg.sub.b.Inventory"]
+    assert len(diagram.edges) == 1
+
+
+def test_scan_package_threads_lazy_plugin(tmp_path):
+    """Models of a framework whose plugin is loaded lazily during a threaded scan are all found.
+    Runs in fresh processes so that the msgspec plugin is not loaded yet."""
+    pkg = tmp_path / "msgspec_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for i in range(32):
+        (pkg / f"m{i}.py").write_text(
+            f"import msgspec\n\nclass Model{i}(msgspec.Struct):\n    x: int\n"
+        )
+    script = textwrap.dedent(
+        f"""\
+        import sys
+        sys.path.insert(0, {str(tmp_path)!r})
+        from erdantic.scan import scan_package
+        results = scan_package("msgspec_pkg", max_workers=16)
+        models = [name for result in results for name in result.model_names]
+        assert len(models) == 32, models
+        """
+    )
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, universal_newlines=True
+        )
+        assert result.returncode == 0, result.stderr
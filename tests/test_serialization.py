@@ -0,0 +1,153 @@
+import gc
+import io
+import threading
+
+import pytest
+from sortedcontainers_pydantic import SortedDict
+
+import erdantic as erd
+from erdantic.core import Cardinality, EntityRelationshipDiagram, Modality, ModelInfo
+from erdantic.examples import dataclasses as dataclasses_examples
+from erdantic.examples import pydantic as pydantic_examples
+import erdantic.serialization
+from erdantic.serialization import (
+    FORMAT_VERSION,
+    _gc_paused,
+    dump,
+    dumps,
+    from_compact,
+    load,
+    loads,
+    to_compact,
+)
+
+
+class DiagramSubclass(EntityRelationshipDiagram):
+    pass
+
+
+class ModelInfoWithExtra(ModelInfo):
+    extra: str = ""
+
+
+class DiagramWithExtra(EntityRelationshipDiagram):
+    models: SortedDict[str, ModelInfoWithExtra] = SortedDict()
+
+
+def test_round_trip():
+    diagram = erd.create(pydantic_examples, dataclasses_examples)
+    # Edge with source cardinality and modality set manually
+    edge = next(iter(diagram.edges.values()))
+    edge.source_cardinality = Cardinality.MANY
+    edge.source_modality = Modality.ZERO
+
+    loaded = loads(dumps(diagram))
+    assert type(loaded) is EntityRelationshipDiagram
+    assert loaded == diagram
+    assert loaded.to_dot() == diagram.to_dot()
+    assert len(dumps(diagram)) < len(diagram.model_dump_json())
+
+    # Fully qualified names are shared
+    party = loaded.models["erdantic.examples.pydantic.Party"]
+    assert party.fields["members"].model_full_name is party.full_name
+    (members_edge,) = [
+        edge for edge in loaded.edges_from(party.key) if edge.source_field_name == "members"
+    ]
+    assert members_edge.source_model_full_name is party.full_name
+
+    # Raw models and types are imported when needed
+    assert party.raw_model is pydantic_examples.Party
+    assert party.fields["members"].raw_type == list[pydantic_examples.Adventurer]
+
+    # Loaded diagram can be modified like a new one
+    loaded.remove_model(pydantic_examples.Party)
+    assert "erdantic.examples.pydantic.Party" in diagram.models
+    loaded.add_model(pydantic_examples.Party)
+    assert loaded == diagram
+
+    # File-like objects
+    fp = io.StringIO()
+    dump(diagram, fp)
+    fp.seek(0)
+    assert load(fp) == diagram
+
+
+def test_diagram_class():
+    diagram = DiagramSubclass()
+    diagram.add_model(pydantic_examples.Party)
+    loaded = from_compact(to_compact(diagram), diagram_cls=DiagramSubclass)
+    assert type(loaded) is DiagramSubclass
+    assert loaded == diagram
+
+    with pytest.raises(ValueError, match="additional fields extra"):
+        to_compact(DiagramWithExtra())
+    with pytest.raises(ValueError, match="additional fields extra"):
+        from_compact(to_compact(diagram), diagram_cls=DiagramWithExtra)
+
+
+def test_invalid_data():
+    data = to_compact(erd.create(pydantic_examples.Party))
+    with pytest.raises(ValueError, match="format"):
+        from_compact({**data, "format": "other"})
+    with pytest.raises(ValueError, match="version"):
+        from_compact({**data, "version": FORMAT_VERSION + 1})
+    with pytest.raises(ValueError, match="format"):
+        loads("[]")
+
+
+def test_pause_gc(monkeypatch):
+    """Garbage collection is only paused when opted in, and is enabled again afterwards."""
+    diagram = erd.create(pydantic_examples.Party)
+    data = dumps(diagram)
+    gc_enabled = []
+
+    original_from_compact = erdantic.serialization._from_compact
+
+    def from_compact_spy(*args):
+        gc_enabled.append(gc.isenabled())
+        return original_from_compact(*args)
+
+    monkeypatch.setattr(erdantic.serialization, "_from_compact", from_compact_spy)
+
+    assert gc.isenabled()
+    assert loads(data) == diagram
+    assert loads(data, pause_gc=True) == diagram
+    assert load(io.StringIO(data), pause_gc=True) == diagram
+    assert from_compact(to_compact(diagram), pause_gc=True) == diagram
+    assert gc_enabled == [True, False, False, False]
+    assert gc.isenabled()
+
+    # Stays disabled if it was disabled before
+    gc.disable()
+    try:
+        assert loads(data, pause_gc=True) == diagram
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_gc_paused_overlapping_threads():
+    """Garbage collection stays paused until the last of overlapping pauses ends, even if the
+    first one to start ends first."""
+    entered = threading.Event()
+    release = threading.Event()
+
+    def pause_in_thread():
+        with _gc_paused():
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=pause_in_thread)
+    try:
+        with _gc_paused():
+            thread.start()
+            entered.wait()
+        # The other thread's pause is still active
+        assert not gc.isenabled()
+    finally:
+        release.set()
+        thread.join()
+    assert gc.isenabled()
+
+    with _gc_paused(False):
+        assert gc.isenabled()
@@ -0,0 +1,291 @@
+import importlib
+import sys
+
+import pytest
+
+import erdantic as erd
+from erdantic.core import Cardinality, Modality
+from erdantic.exceptions import ModelOrModuleNotFoundError
+from erdantic.static import (
+    StaticAnalyzer,
+    create_static,
+    find_models_static,
+    find_module_file,
+    parse_module,
+    parse_modules,
+)
+
+EXAMPLE_MODULES = [
+    "erdantic.examples.attrs",
+    "erdantic.examples.dataclasses",
+    "erdantic.examples.msgspec",
+    "erdantic.examples.pydantic",
+]
+if sys.version_info < (3, 14):
+    EXAMPLE_MODULES.append("erdantic.examples.pydantic_v1")
+
+BASE_SOURCE = """\
+import pydantic
+
+class Base(pydantic.BaseModel):
+    \"\"\"Shared base model.\"\"\"
+
+    id: int
+    _secret: str
+"""
+
+MODELS_SOURCE = """\
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, ClassVar, Optional, Union
+
+import attrs
+
+from . import Base
+
+if TYPE_CHECKING:
+    from static_pkg.other import Tag
+
+raise RuntimeError("static_pkg.models must not be imported")
+
+
+class Item(Base):
+    name: str
+    tags: list[Tag] = []
+    kind: ClassVar[str] = "item"
+
+
+class Inventory(Base):
+    items: "list[Item]"
+    featured: Optional[Item] = None
+    backup: Item | None = None
+    either: Union[Item, Tag]
+
+    class Settings(Base):
+        limit: int
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float
+    _: dataclasses.KW_ONLY
+    label: str = ""
+
+
+@attrs.define
+class Tagged:
+    tag: Tag
+
+
+class NotAModel:
+    item: Item
+"""
+
+OTHER_SOURCE = """\
+import msgspec
+
+class Tag(msgspec.Struct):
+    name: str
+"""
+
+ANNOTATED_SOURCE = """\
+import dataclasses
+from typing import Annotated, Optional, Union
+
+import pydantic
+
+
+class Base(pydantic.BaseModel):
+    \"\"\"Base model.\"\"\"
+
+    id: int
+
+
+class Model(pydantic.BaseModel):
+    \"\"\"Model with Annotated and PEP 604 fields.\"\"\"
+
+    a: Annotated[Union[Base, None], pydantic.Field(description="x")]
+    b: Annotated[Optional[Base], "metadata"] = None
+    c: Base | None = None
+    d: Annotated[list[Base], pydantic.Field(min_length=1)]
+    e: Union[None, Base, int] = None
+
+
+@dataclasses.dataclass
+class Parent:
+    \"\"\"Dataclass.\"\"\"
+
+    x: int
+    base: Annotated[Optional[Base], 1] = None
+
+
+class NotDecorated(Parent):
+    \"\"\"Undecorated subclass of a dataclass.\"\"\"
+
+    y: int
+"""
+
+
+@pytest.fixture()
+def static_pkg(tmp_path, monkeypatch):
+    """Create a package whose models module raises if it is imported."""
+    pkg = tmp_path / "static_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from static_pkg.base import Base\n")
+    (pkg / "base.py").write_text(BASE_SOURCE)
+    (pkg / "models.py").write_text(MODELS_SOURCE)
+    (pkg / "other.py").write_text(OTHER_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    assert not any(module.startswith("static_pkg") for module in sys.modules)
+
+
+@pytest.mark.parametrize("module_name", EXAMPLE_MODULES)
+def test_create_static_matches_create(module_name):
+    """Static analysis of the examples gives the same diagram as analyzing the classes."""
+    static_diagram = create_static(module_name)
+    diagram = erd.create(importlib.import_module(module_name))
+    assert static_diagram.models == diagram.models
+    assert static_diagram.edges == diagram.edges
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="PEP 604 unions require Python 3.10+")
+def test_create_static_matches_create_annotated(tmp_path, monkeypatch):
+    """Annotated fields, unions written with '|', and undecorated subclasses of dataclasses give
+    the same diagram with static analysis as with analyzing the classes."""
+    (tmp_path / "static_annotated.py").write_text(ANNOTATED_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    static_diagram = create_static("static_annotated")
+    try:
+        diagram = erd.create(importlib.import_module("static_annotated"))
+    finally:
+        sys.modules.pop("static_annotated", None)
+    assert static_diagram.models == diagram.models
+    assert static_diagram.edges == diagram.edges
+    assert list(static_diagram.models["static_annotated.NotDecorated"].fields) == ["x", "base"]
+    assert static_diagram.models["static_annotated.Model"].fields["a"].type_name == (
+        "Optional[Base]"
+    )
+
+
+def test_find_module_file(static_pkg):
+    assert find_module_file("static_pkg") == static_pkg / "__init__.py"
+    assert find_module_file("static_pkg.models") == static_pkg / "models.py"
+    assert find_module_file("static_pkg.missing") is None
+    assert find_module_file("sys") is None
+
+
+def test_parse_module(static_pkg):
+    module = parse_module("static_pkg.models")
+    assert module.path == static_pkg / "models.py"
+    assert module.imports["Base"] == "static_pkg.Base"
+    assert module.imports["Tag"] == "static_pkg.other.Tag"
+    assert list(module.classes) == [
+        "Item",
+        "Inventory",
+        "Inventory.Settings",
+        "Point",
+        "Tagged",
+        "NotAModel",
+    ]
+    item = module.classes["Item"]
+    assert item.bases == ["static_pkg.Base"]
+    assert item.plugin is None  # Only known after resolving the base class
+    assert [field.name for field in item.fields] == ["name", "tags"]
+    inventory = module.classes["Inventory"]
+    assert inventory.fields[0].type_name == "list[Item]"
+    assert inventory.fields[0].type_args[0].is_collection
+    assert [field.is_nullable for field in inventory.fields] == [False, True, False, False]
+    assert module.classes["Point"].plugin == "dataclasses"
+    assert [field.name for field in module.classes["Point"].fields] == ["x", "y", "label"]
+    assert module.classes["Tagged"].plugin == "attrs"
+
+    with pytest.raises(ModelOrModuleNotFoundError):
+        parse_module("static_pkg.missing")
+
+
+def test_parse_modules(static_pkg):
+    (static_pkg / "broken.py").write_text("class Broken(:\n")
+    names = ["static_pkg.base", "static_pkg.models", "static_pkg.broken", "static_pkg.missing"]
+    modules = parse_modules(names, max_workers=2)
+    assert list(modules) == names
+    assert modules["static_pkg.base"] == parse_module("static_pkg.base")
+    assert modules["static_pkg.models"] == parse_module("static_pkg.models")
+    assert modules["static_pkg.broken"] is None
+    assert modules["static_pkg.missing"] is None
+
+
+def test_find_models_static(static_pkg):
+    model_infos = find_models_static("static_pkg.models")
+    assert [model_info.name for model_info in model_infos] == [
+        "Item",
+        "Inventory",
+        "Point",
+        "Tagged",
+    ]
+    item = model_infos[0]
+    # Inherited fields come first, and private attributes are excluded for Pydantic
+    assert list(item.fields) == ["id", "name", "tags"]
+    assert item.fields["tags"].type_name == "list[Tag]"
+    assert item.description == "static_pkg.models.Item\n\nShared base model.\n"
+
+    assert [
+        model_info.name
+        for model_info in find_models_static("static_pkg.models", limit_search_models_to=["attrs"])
+    ] == ["Tagged"]
+
+    analyzer = StaticAnalyzer()
+    assert analyzer.get_model("static_pkg.Base").full_name.module == "static_pkg.base"
+    assert analyzer.get_model("static_pkg.models.NotAModel") is None
+
+
+def test_create_static(static_pkg):
+    diagram = create_static("static_pkg.models.Inventory")
+    assert list(diagram.models) == [
+        "static_pkg.models.Inventory",
+        "static_pkg.models.Item",
+        "static_pkg.other.Tag",
+    ]
+    edges = {
+        (edge.source_field_name, str(edge.target_model_full_name)): edge
+        for edge in diagram.edges.values()
+    }
+    assert set(edges) == {
+        ("items", "static_pkg.models.Item"),
+        ("featured", "static_pkg.models.Item"),
+        ("backup", "static_pkg.models.Item"),
+        ("either", "static_pkg.models.Item"),
+        ("either", "static_pkg.other.Tag"),
+        ("tags", "static_pkg.other.Tag"),
+    }
+    assert edges["items", "static_pkg.models.Item"].target_cardinality == Cardinality.MANY
+    assert edges["items", "static_pkg.models.Item"].target_modality == Modality.UNSPECIFIED
+    assert edges["featured", "static_pkg.models.Item"].target_cardinality == Cardinality.ONE
+    assert edges["featured", "static_pkg.models.Item"].target_modality == Modality.ZERO
+    assert edges["either", "static_pkg.other.Tag"].target_modality == Modality.ONE
+
+
+def test_create_static_options(static_pkg):
+    diagram = create_static("static_pkg.models.Inventory", max_depth=1)
+    assert "static_pkg.models.Item" in diagram.models
+    assert "static_pkg.other.Tag" in diagram.models  # Directly referenced by Inventory.either
+    assert not any(edge.source_field_name == "tags" for edge in diagram.edges.values())
+
+    diagram = create_static(
+        "static_pkg.models.Inventory", terminal_models=["static_pkg.models.Item"]
+    )
+    assert not any(
+        str(edge.source_model_full_name) == "static_pkg.models.Item"
+        for edge in diagram.edges.values()
+    )
+
+    diagram = create_static("static_pkg.models", max_workers=2)
+    assert "static_pkg.models.Point" in diagram.models
+    assert "static_pkg.models.Inventory.Settings" not in diagram.models
+
+    with pytest.raises(ModelOrModuleNotFoundError):
+        create_static("static_pkg.models.NotAModel")
+    with pytest.raises(ModelOrModuleNotFoundError):
+        create_static("static_pkg.missing")
@@ -4,6 +4,8 @@ import pytest
 
 from erdantic.exceptions import _UnevaluatedForwardRefError
 from erdantic.typing_utils import (
+    TypeArg,
+    analyze_type_args,
     get_depth1_bases,
     get_recursive_args,
     is_collection_type_of,
@@ -72,6 +74,41 @@ def test_get_recursive_args():
     assert get_recursive_args(resolved_annotations["field"]) == [SomeForwardRef]
 
 
+def test_analyze_type_args():
+    class Target: ...
+
+    assert analyze_type_args(Target) == [TypeArg(Target, False)]
+    assert analyze_type_args(typing.Optional[typing.List[Target]]) == [
+        TypeArg(Target, True),
+        TypeArg(type(None), False),
+    ]
+    assert analyze_type_args(typing.Union[Target, typing.Dict[str, Target]]) == [
+        TypeArg(Target, False),
+        TypeArg(str, True),
+        TypeArg(Target, True),
+    ]
+    # Collections inside other generic types are not counted
+    assert analyze_type_args(typing.Type[typing.List[Target]]) == [TypeArg(Target, False)]
+
+    # Consistent with get_recursive_args and is_collection_type_of
+    for tp in (
+        typing.List[Target],
+        typing.Optional[typing.List[Target]],
+        typing.List[typing.Optional[Target]],
+        typing.Union[Target, typing.List[Target], None],
+        typing.Optional[Target],
+        typing.Union[Target, typing.List[int]],
+        typing.Tuple[typing.Literal["a"], typing.Set[Target]],
+    ):
+        type_args = analyze_type_args(tp)
+        assert [arg.tp for arg in type_args] == get_recursive_args(tp)
+        is_collection = any(arg.is_collection for arg in type_args if arg.tp is Target)
+        assert is_collection == is_collection_type_of(tp, Target)
+
+    with pytest.raises(_UnevaluatedForwardRefError):
+        analyze_type_args(typing.List[typing.ForwardRef("Undefined")])
+
+
 def test_get_depth1_bases():
     class A0:
         pass
@@ -0,0 +1,162 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+from erdantic.caching import model_info_cache
+from erdantic.convenience import create, import_object_from_name
+from erdantic.watch import DiagramWatcher, module_dependencies, reload_order, watch
+
+BASE_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Item:
+    name: str
+"""
+
+MODELS_SOURCE = """\
+import dataclasses
+
+from watch_pkg.base import Item
+
+@dataclasses.dataclass
+class Inventory:
+    items: list[Item]
+"""
+
+
+def write_module(path, source):
+    """Write a module's source and bump its modification time so the change is detected."""
+    stat = path.stat() if path.exists() else None
+    path.write_text(textwrap.dedent(source))
+    if stat is not None:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture()
+def watch_pkg(tmp_path, monkeypatch):
+    """Create a package with a models module that depends on a base module."""
+    pkg = tmp_path / "watch_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    write_module(pkg / "base.py", BASE_SOURCE)
+    write_module(pkg / "models.py", MODELS_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    model_info_cache.enable()
+    yield pkg
+    model_info_cache.disable()
+    for module in list(sys.modules):
+        if module.startswith("watch_pkg"):
+            del sys.modules[module]
+
+
+def test_reload_order():
+    dependencies = {"a": {"b"}, "b": {"c"}, "c": set(), "d": {"c"}, "e": set()}
+    assert reload_order(["c"], dependencies) == ["c", "b", "a", "d"]
+    assert reload_order(["b"], dependencies) == ["b", "a"]
+    assert reload_order(["e"], dependencies) == ["e"]
+    # Cycles
+    assert sorted(reload_order(["x"], {"x": {"y"}, "y": {"x"}})) == ["x", "y"]
+
+
+def test_diagram_watcher(watch_pkg, caplog):
+    rendered = []
+
+    def create_fn():
+        return create(import_object_from_name("watch_pkg.models.Inventory"))
+
+    watcher = DiagramWatcher(create_fn, rendered.append)
+    assert watcher.render()
+    assert len(rendered) == 1
+    assert module_dependencies(watcher.diagram) == {
+        "watch_pkg.models": {"watch_pkg.base"},
+        "watch_pkg.base": set(),
+    }
+
+    # No changes
+    assert not watcher.check()
+    assert len(rendered) == 1
+
+    # Changing the base module also reloads the dependent models module
+    write_module(watch_pkg / "base.py", BASE_SOURCE + "    price: float\n")
+    assert watcher.check()
+    assert len(rendered) == 2
+    item_fields = rendered[-1].models["watch_pkg.base.Item"].fields
+    assert list(item_fields) == ["name", "price"]
+    inventory = import_object_from_name("watch_pkg.models.Inventory")
+    assert (
+        inventory.__annotations__["items"] == list[import_object_from_name("watch_pkg.base.Item")]
+    )
+
+    # Change that does not affect the diagram is not re-rendered
+    write_module(watch_pkg / "models.py", "# A comment\n" + MODELS_SOURCE)
+    assert not watcher.check()
+    assert len(rendered) == 2
+
+    # Errors are logged and watching continues
+    write_module(watch_pkg / "base.py", "class Item(:\n")
+    assert not watcher.check()
+    assert "Failed to update diagram" in caplog.text
+    write_module(watch_pkg / "base.py", BASE_SOURCE)
+    assert watcher.check()
+    assert list(rendered[-1].models["watch_pkg.base.Item"].fields) == ["name"]
+
+
+MIXINS_SOURCE = """\
+import dataclasses
+
+@dataclasses.dataclass
+class Timestamped:
+    created: str
+"""
+
+RECORDS_SOURCE = """\
+import dataclasses
+
+from watch_pkg.mixins import Timestamped
+
+@dataclasses.dataclass
+class Record(Timestamped):
+    name: str
+"""
+
+
+def test_diagram_watcher_base_class(watch_pkg):
+    write_module(watch_pkg / "mixins.py", MIXINS_SOURCE)
+    write_module(watch_pkg / "records.py", RECORDS_SOURCE)
+    rendered = []
+
+    def create_fn():
+        return create(import_object_from_name("watch_pkg.records.Record"))
+
+    watcher = DiagramWatcher(create_fn, rendered.append)
+    assert watcher.render()
+    assert module_dependencies(watcher.diagram) == {
+        "watch_pkg.records": {"watch_pkg.mixins"},
+        "watch_pkg.mixins": set(),
+    }
+
+    # Changing the module of a base class also reloads the module of the subclass
+    write_module(watch_pkg / "mixins.py", MIXINS_SOURCE + "    updated: str\n")
+    assert watcher.check()
+    assert len(rendered) == 2
+    record_fields = rendered[-1].models["watch_pkg.records.Record"].fields
+    assert list(record_fields) == ["created", "updated", "name"]
+
+
+def test_watch_stops_on_keyboard_interrupt(watch_pkg, monkeypatch):
+    def interrupt(interval):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("erdantic.watch.time.sleep", interrupt)
+    model_info_cache.disable()
+    rendered = []
+    watch(
+        lambda: create(import_object_from_name("watch_pkg.models.Inventory")),
+        rendered.append,
+    )
+    assert len(rendered) == 1
+    assert not model_info_cache.enabled